@@ -0,0 +1,10 @@
+import os
+
+# Where the editors keep per-user caches and logs: %LOCALAPPDATA% on Windows,
+# ~/.cache elsewhere, in a leaderboard_editor folder.
+
+
+def app_cache_dir(*parts):
+    """Path under the per-user leaderboard_editor cache folder."""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'leaderboard_editor', *parts)
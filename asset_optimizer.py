@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import tracing
+from app_paths import app_cache_dir
+from pic_validation import imported_names, resolve_import
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # the stage is skipped without Pillow
+    Image = None
+
+# Shrinks the local profile-picture assets imported by leaderboard-data.ts.
+#
+# Each image is resized to fit MAX_SIDE and re-encoded in its own format (the
+# import paths stay valid) on a process pool. A file is only replaced when the
+# result is smaller. The content hash of every file we have finished with is
+# kept in a manifest, so later runs skip them without even opening them.
+#
+# The manifest is per user, so another admin's machine will see the same
+# files again; JPEG and WebP images that already fit MAX_SIDE are therefore
+# left alone rather than re-encoded, or every machine would lose another
+# generation of quality. Photos are turned upright (EXIF Orientation) before
+# resizing, since the re-encoded file carries no EXIF.
+
+MAX_SIDE = 256
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+LOSSY_EXTENSIONS = ('.jpg', '.jpeg', '.webp')
+
+_skip_noted = False
+
+
+def default_manifest_file():
+    return app_cache_dir('asset_manifest.json')
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_assets(import_lines, base_dir):
+    """Image files the import lines point at, relative imports only."""
+    paths = set()
+    for src in imported_names(import_lines).values():
+        path = resolve_import(src, base_dir)
+        if path and path.lower().endswith(IMAGE_EXTENSIONS):
+            paths.add(path)
+    return sorted(paths)
+
+
+def optimize_file(path, max_side=MAX_SIDE):
+    """
+    Resize and recompress one image in place if that makes it smaller.
+    Runs in a worker process. Returns (path, old_size, new_size, final_hash).
+    """
+    old_size = os.path.getsize(path)
+    ext = os.path.splitext(path)[1].lower()
+    with Image.open(path) as src:
+        if ext in LOSSY_EXTENSIONS and max(src.size) <= max_side:
+            # Already done here or elsewhere; re-encoding would only lose quality
+            return path, old_size, old_size, file_hash(path)
+        src.load()
+        fmt = src.format
+        img = ImageOps.exif_transpose(src)
+        if max(img.size) > max_side:
+            img.thumbnail((max_side, max_side), Image.LANCZOS)
+        tmp = path + '.opt.tmp'
+        if ext in ('.jpg', '.jpeg'):
+            img.convert('RGB').save(tmp, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        elif ext == '.webp':
+            img.save(tmp, format='WEBP', quality=WEBP_QUALITY, method=6)
+        else:
+            img.save(tmp, format=fmt or 'PNG', optimize=True)
+    new_size = os.path.getsize(tmp)
+    if new_size < old_size:
+        os.replace(tmp, path)
+    else:
+        os.remove(tmp)
+        new_size = old_size
+    return path, old_size, new_size, file_hash(path)
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        return set()
+
+
+def save_manifest(path, hashes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(sorted(hashes), f)
+    os.replace(tmp, path)
+
+
+def optimize_assets(import_lines, base_dir, manifest_file=None, max_side=MAX_SIDE, workers=None):
+    """
+    Optimize every imported image not already in the manifest.
+
+    Returns a report dict: files, skipped, optimized (list of changed paths),
+    bytes_before, bytes_after, bytes_saved, seconds, errors. Without Pillow
+    nothing is done and the report is empty.
+    """
+    start = time.perf_counter()
+    report = {'files': 0, 'skipped': 0, 'optimized': [], 'bytes_before': 0,
+              'bytes_after': 0, 'bytes_saved': 0, 'seconds': 0.0, 'errors': []}
+    if Image is None:
+        # Optional stage, not a failure: note it in the trace once per process
+        global _skip_noted
+        if not _skip_noted:
+            _skip_noted = True
+            tracing.record("optimize_assets", 0.0, skipped="Pillow is not installed")
+        return report
+    manifest_file = manifest_file or default_manifest_file()
+    done = load_manifest(manifest_file)
+
+    todo = []
+    for path in find_assets(import_lines, base_dir):
+        report['files'] += 1
+        if file_hash(path) in done:
+            report['skipped'] += 1
+        else:
+            todo.append(path)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(optimize_file, path, max_side) for path in todo]
+            for path, future in zip(todo, futures):
+                try:
+                    _path, old_size, new_size, digest = future.result()
+                except Exception as e:
+                    report['errors'].append(f"{path}: {e}")
+                    continue
+                report['bytes_before'] += old_size
+                report['bytes_after'] += new_size
+                if new_size < old_size:
+                    report['optimized'].append(path)
+                done.add(digest)
+        save_manifest(manifest_file, done)
+
+    report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+    report['seconds'] = time.perf_counter() - start
+    return report
@@ -0,0 +1,90 @@
+import csv
+import json
+import os
+
+from contestant_record import Contestant
+
+# Bulk hours updates from a CSV or JSONL export. Used by the headless
+# `contestant_manage.py import ...` mode; nothing here needs Tk.
+
+
+def pic_type_for(pic):
+    """Classify a profilePic value the same way the editor form does."""
+    if pic.startswith("http://") or pic.startswith("https://"):
+        return 'url'
+    elif pic:  # assume import identifier if not blank
+        return 'import'
+    return 'url'
+
+
+def _row(name, hours, pic, where):
+    name = (name or "").strip()
+    if not name:
+        raise ValueError(f"{where}: name is required")
+    try:
+        hours = int(str(hours).strip())
+    except ValueError:
+        raise ValueError(f"{where}: hours must be an integer, got {hours!r}")
+    pic = (pic or "").strip() or None
+    return name, hours, pic
+
+
+def read_updates(path):
+    """
+    Yield (name, hours, profilePic or None) from a CSV or JSONL file.
+
+    CSV rows are `name,hours[,profilePic]`, with or without a header line.
+    JSONL lines are objects with `name`, `hours` and optionally `profilePic`.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if ext in ('.jsonl', '.ndjson', '.json'):
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                obj = json.loads(line)
+                yield _row(obj.get('name'), obj.get('hours'), obj.get('profilePic'), f"line {lineno}")
+            return
+        for lineno, fields in enumerate(csv.reader(f), start=1):
+            if not fields or not any(field.strip() for field in fields):
+                continue
+            if lineno == 1 and fields[0].strip().lower() == 'name':
+                continue  # header
+            if len(fields) < 2:
+                raise ValueError(f"line {lineno}: expected name,hours[,profilePic]")
+            yield _row(fields[0], fields[1], fields[2] if len(fields) > 2 else None, f"line {lineno}")
+
+
+def merge_updates(contestants, updates, calculate_prize):
+    """
+    Apply updates to the contestant list in one pass.
+
+    Existing names get new hours (and profilePic when one is given), new
+    names are appended, and money is recomputed for every touched row. The
+    list is not re-sorted here, so the caller can rank once at the end.
+    Returns a dict of counts: rows, inserted, updated, unchanged.
+    """
+    by_name = {c['name']: c for c in contestants}
+    counts = {'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+    for name, hours, pic in updates:
+        counts['rows'] += 1
+        c = by_name.get(name)
+        if c is None:
+            pic = pic or ""
+            c = Contestant(name=name, hours=hours, money=calculate_prize(hours),
+                           profilePic=pic, picType=pic_type_for(pic))
+            contestants.append(c)
+            by_name[name] = c
+            counts['inserted'] += 1
+            continue
+        new = {'hours': hours, 'money': calculate_prize(hours)}
+        if pic is not None:
+            new['profilePic'] = pic
+            new['picType'] = pic_type_for(pic)
+        if all(c.get(k) == v for k, v in new.items()):
+            counts['unchanged'] += 1
+        else:
+            c.update(new)
+            counts['updated'] += 1
+    return counts
@@ -0,0 +1,223 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import leaderboard_data
+from parse_cache import ParseCache
+import slideshow_data
+from contestant_store import ContestantStore
+from prize_engine import PrizeEngine
+from benchmarks.synthetic import make_leaderboard, make_slideshow
+
+# Headless benchmarks for the editor's data path. Run from the repo root:
+#
+#   python -m benchmarks.run --sizes 1000 10000 100000
+#   python -m benchmarks.run --compare benchmarks/results/<older>.json
+#
+# Each phase is timed (best of --repeat) and, unless --no-memory, run once
+# more under tracemalloc for its peak allocation. Results go to a JSON file
+# named after the current commit so runs can be compared.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, 'results')
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+EDITS = 1000
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def legacy_sort(contestants):
+    # What sort_and_refresh/write_leaderboard did on every edit
+    contestants.sort(key=lambda x: x['hours'], reverse=True)
+    for i, c in enumerate(contestants, start=1):
+        c['rank'] = i
+
+
+def bench_size(n, repeat, memory, workdir):
+    text = make_leaderboard(n)
+    slides_text = make_slideshow(n)
+    lb_path = os.path.join(workdir, f'leaderboard-{n}.ts')
+    slides_path = os.path.join(workdir, f'slides-{n}.tsx')
+    engine = PrizeEngine()
+    _imports, parsed = leaderboard_data.parse_leaderboard(text)
+    hours = [c['hours'] for c in parsed]
+    # The old code kept plain dicts
+    legacy_rows = [dict(c) for c in parsed]
+    rng = random.Random(n)
+    edits = [(rng.randrange(n), rng.randrange(0, 600)) for _ in range(min(EDITS, n))]
+    objects = [leaderboard_data.format_contestant(c) for c in parsed[:10000]]
+
+    def parse():
+        leaderboard_data.parse_leaderboard(text)
+
+    def parse_objects():
+        for obj in objects:
+            leaderboard_data.parse_contestant(obj)
+
+    def rank_store():
+        ContestantStore([c.copy() for c in parsed])
+
+    def rank_legacy():
+        legacy_sort([d.copy() for d in legacy_rows])
+
+    def edit_store():
+        store = ContestantStore([c.copy() for c in parsed])
+        for index, new_hours in edits:
+            store.update(index, hours=new_hours, money=engine.prize(new_hours))
+
+    def prize_scalar():
+        prize = engine.prize
+        for h in hours:
+            prize(h)
+
+    def prize_column():
+        engine.prize_column(hours)
+
+    def write_full():
+        with open(lb_path, 'w', encoding='utf-8', newline='') as f:
+            f.write('')
+        f = leaderboard_data.LeaderboardFile(lb_path)
+        f.read()
+        f.write(_imports, parsed)
+
+    def write_incremental():
+        with open(lb_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        lb = leaderboard_data.LeaderboardFile(lb_path)
+        imports, rows = lb.read()
+        store = ContestantStore(rows)
+        for index, new_hours in edits[:10]:
+            store.update(index, hours=new_hours, money=engine.prize(new_hours))
+        lb.write(imports, store.records)
+
+    cache_dir = os.path.join(workdir, f'cache-{n}')
+
+    def startup_cold():
+        with open(lb_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        cache = ParseCache(cache_dir)
+        cache.invalidate(lb_path)
+        leaderboard_data.LeaderboardFile(lb_path, cache=cache).read()
+
+    def startup_warm():
+        # The previous phase left a cache entry for exactly this file
+        lb = leaderboard_data.LeaderboardFile(lb_path, cache=ParseCache(cache_dir))
+        lb.read()
+        assert lb.from_cache
+
+    def slides_parse_write():
+        with open(slides_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(slides_text)
+        sf = slideshow_data.SlideshowFile(slides_path)
+        slides = sf.read()
+        slides[len(slides) // 2]['title'] = "Edited"
+        sf.write(slides)
+
+    phases = {
+        'parse': (parse, n),
+        'parse_contestant': (parse_objects, len(objects)),
+        'rank_store': (rank_store, n),
+        'rank_legacy_sort': (rank_legacy, n),
+        'edit_store': (edit_store, len(edits)),
+        'prize_scalar': (prize_scalar, n),
+        'prize_column': (prize_column, n),
+        'write_full': (write_full, n),
+        'write_incremental': (write_incremental, n),
+        'startup_cold': (startup_cold, n),
+        'startup_warm': (startup_warm, n),
+        'slideshow_parse_write': (slides_parse_write, n),
+    }
+    results = {}
+    for name, (fn, rows) in phases.items():
+        seconds = timed(fn, repeat)
+        entry = {'seconds': round(seconds, 6), 'rows': rows,
+                 'rows_per_sec': round(rows / seconds) if seconds > 0 else None}
+        if memory:
+            entry['peak_bytes'] = peak(fn)
+        results[name] = entry
+        print(f"  {name:<24} {seconds * 1000:10.1f} ms  {entry['rows_per_sec'] or 0:>12,} rows/s"
+              + (f"  peak {entry['peak_bytes'] / 1e6:8.1f} MB" if memory else ""))
+    return results
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('commit')} ({baseline_path}):")
+    for size, phases in results['results'].items():
+        old_phases = baseline.get('results', {}).get(size, {})
+        for name, entry in phases.items():
+            old = old_phases.get(name)
+            if not old:
+                continue
+            ratio = entry['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+            flag = "  <-- slower" if ratio > 1.10 else ""
+            print(f"  {size:>8} {name:<24} {ratio:6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard editor's data path")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc peak measurement")
+    parser.add_argument('--out', help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    results = {'commit': commit, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+               'python': sys.version.split()[0], 'platform': platform.platform(), 'results': {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            print(f"{n:,} rows")
+            results['results'][str(n)] = bench_size(n, args.repeat, not args.no_memory, workdir)
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json")
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {out}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import random
+
+from leaderboard_data import quote, format_contestant
+from prize_engine import PrizeEngine
+
+# Synthetic but realistic-looking input files for the benchmarks: a
+# leaderboard-data.ts with a mix of URL and imported profile pictures, and an
+# ImageSlideshow.tsx with n slides. Same seed, same file.
+
+FIRST = ["Amal", "Nimal", "Kasun", "Dilani", "Ishara", "Chamod", "Sachini", "Tharindu", "Nadeesha",
+         "Ravindu", "Hiruni", "Pasan", "Sanduni", "Yasiru", "Malsha", "Dinuka", "Oshadi", "Kavindu"]
+LAST = ["Perera", "Fernando", "Silva", "Jayasinghe", "Bandara", "Wickramasinghe", "Gunawardena",
+        "Rathnayake", "Herath", "Dissanayake", "Senanayake", "Karunaratne", "Weerasinghe"]
+MAX_IMPORTS = 500
+
+
+def make_contestants(n, seed=1, url_ratio=0.7, quote_ratio=0.01):
+    rng = random.Random(seed)
+    engine = PrizeEngine()
+    contestants = []
+    for i in range(n):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}"
+        if rng.random() < quote_ratio:
+            name = f'{name} "The Grinder"'
+        hours = int(rng.expovariate(1 / 120))
+        if rng.random() < url_ratio:
+            pic = f"https://cdn.example.com/avatars/{i % 5000}/{rng.getrandbits(32):08x}.png"
+            pic_type = 'url'
+        else:
+            pic = f"avatar{i % MAX_IMPORTS}"
+            pic_type = 'import'
+        contestants.append({'name': name, 'hours': hours, 'money': engine.prize(hours),
+                            'profilePic': pic, 'picType': pic_type})
+    contestants.sort(key=lambda x: x['hours'], reverse=True)
+    for i, c in enumerate(contestants, start=1):
+        c['rank'] = i
+    return contestants
+
+
+def make_leaderboard(n, seed=1):
+    """Text of a leaderboard-data.ts with n rows."""
+    contestants = make_contestants(n, seed)
+    imports = [f'import avatar{i} from "../assets/avatars/avatar{i}.png";' for i in range(min(n, MAX_IMPORTS))]
+    parts = [line + "\n" for line in imports]
+    parts.append("\nexport const leaderboardData = [\n")
+    parts.extend(f"  {format_contestant(c)},\n" for c in contestants)
+    parts.append("];\n")
+    return "".join(parts)
+
+
+def make_slideshow(n, seed=1):
+    """Text of an ImageSlideshow.tsx with n slides."""
+    rng = random.Random(seed)
+    parts = ['import React, { useState, useEffect } from "react";\n\n',
+             "interface SlideshowImage {\n  id: number;\n  url: string;\n  title: string;\n  description: string;\n}\n\n",
+             "const slideshowImages: SlideshowImage[] = [\n"]
+    for i in range(n):
+        parts.append(
+            "  {\n"
+            f"    id: {i + 1},\n"
+            f"    url: {quote(f'https://cdn.example.com/slides/{rng.getrandbits(48):012x}.jpg')},\n"
+            f"    title: {quote(f'Event {i}: {rng.choice(FIRST)} wins the week')},\n"
+            f"    description: {quote('Congratulations to everyone who took part this session.')}\n"
+            "  },\n"
+        )
+    parts.append("];\n\nexport default function ImageSlideshow() {\n  return null;\n}\n")
+    return "".join(parts)
@@ -0,0 +1,64 @@
+import re
+
+# Board-wide numbers for constants.ts. PRICE_CONFIG used to be typed in by
+# hand after summing the board; BoardTotals keeps the sums current instead.
+# ContestantStore reports every add, update and delete to it, so each edit
+# costs O(1) and nothing is re-summed.
+#
+# Payouts are what calculate_prize gives for each contestant's hours (the
+# money column is always set from it), so a tier change shows up here even
+# before the board is re-saved.
+
+PRICE_CONFIG_RE = re.compile(r"\b(POOL_PRICE|PRICE_PER_HOUR|TOTAL_HOURS)\s*:\s*(\d+)")
+
+
+class BoardTotals:
+    """Contestant count, total hours, total payout and contestants per prize tier."""
+
+    def __init__(self, engine, contestants=()):
+        self.engine = engine
+        self.count = 0
+        self.hours = 0
+        self.payout = 0
+        self.tier_counts = [0] * len(engine.rates)
+        for c in contestants:
+            self.add(c)
+
+    def _apply(self, c, sign):
+        hours = c.hours
+        self.count += sign
+        self.hours += sign * hours
+        self.payout += sign * self.engine.prize(hours)
+        self.tier_counts[self.engine.tier(hours)] += sign
+
+    def add(self, c):
+        self._apply(c, 1)
+
+    def remove(self, c):
+        self._apply(c, -1)
+
+    @property
+    def price_per_hour(self):
+        """Average payout per hour across the board, rounded."""
+        return round(self.payout / self.hours) if self.hours else 0
+
+    def utilization(self, pool):
+        """Share of the pool the payouts use (above 1 means over budget), or None without a pool."""
+        return self.payout / pool if pool else None
+
+    def price_config(self, pool):
+        return {'POOL_PRICE': pool, 'PRICE_PER_HOUR': self.price_per_hour, 'TOTAL_HOURS': self.hours}
+
+
+def parse_price_config(text):
+    """The integer fields of a constants.ts PRICE_CONFIG, as a dict."""
+    return {key: int(value) for key, value in PRICE_CONFIG_RE.findall(text)}
+
+
+def render_price_config(config):
+    return f"""export const PRICE_CONFIG = {{
+            POOL_PRICE: {config['POOL_PRICE']},
+            PRICE_PER_HOUR: {config['PRICE_PER_HOUR']},
+            TOTAL_HOURS: {config['TOTAL_HOURS']},
+            }} as const; 
+            """
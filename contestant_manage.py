@@ -1,13 +1,34 @@
 import os
-import re
 import subprocess
 import tkinter as tk
 from tkinter import ttk, messagebox
-from git import Repo, GitCommandError
 import json
 import sys
+import time
+import argparse
+import threading
+import multiprocessing
+from operator import attrgetter
 from datetime import datetime
 
+import git_sync
+import tracing
+import leaderboard_data
+import leaderboard_merge
+from contestant_store import ContestantStore
+from parse_cache import ParseCache
+from leaderboard_chunks import ChunkWriter, DEFAULT_CHUNK_SIZE
+from name_index import NameIndex, build_entries
+from history_store import HistoryStore
+from generated_files import GeneratedFiles
+from batch_import import pic_type_for, read_updates, merge_updates
+from virtual_list import VirtualListbox
+from file_watch import FileWatcher
+from prize_engine import PrizeEngine, load_tiers
+from board_totals import BoardTotals, parse_price_config, render_price_config
+from asset_optimizer import optimize_assets
+from pic_validation import UrlChecker, validate_pics, default_cache_file as default_url_cache_file
+
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(SCRIPT_DIR, 'config_form.json')
@@ -23,188 +44,333 @@ def get_base_path():
     return base_path
 
 def read_config():
+    """
+    config_form.json as a dict. Problems are raised as ValueError with a
+    readable message rather than shown, so the headless modes can use it.
+    """
+    base_path = get_base_path()
+    config_path = os.path.join(base_path, 'config_form.json')
     try:
-        base_path = get_base_path()
-        config_path = os.path.join(base_path, 'config_form.json')
-        
         with open(config_path, 'r') as file:
             config = json.load(file)
-            
-            # Validate required fields
-            if not all(key in config for key in ['LEADERBOARD_FILE', 'CONSTANTS_FILE', 'GIT_REPO_PATH', 'DATE_CONFIG']):
-                raise ValueError("Missing required fields in config.json")
-                
-            return config
     except FileNotFoundError:
-        messagebox.showerror("Error", "config_form.json file not found")
-        raise
+        raise ValueError("config_form.json file not found") from None
     except json.JSONDecodeError:
-        messagebox.showerror("Error", "Invalid JSON in config file")
-        raise
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to read config: {str(e)}")
-        raise
-
-# Read configuration
-try:
-    config = read_config()
-    LEADERBOARD_FILE = config['LEADERBOARD_FILE']
-    CONSTANTS_FILE = config['CONSTANTS_FILE']
-    GIT_REPO_PATH = config['GIT_REPO_PATH']
-    DATE_CONFIG = config['DATE_CONFIG']
-    
-except Exception as e:
-    messagebox.showerror("Error", str(e))
-    exit()
-
+        raise ValueError("Invalid JSON in config file") from None
+    except OSError as e:
+        raise ValueError(f"Failed to read config: {e}") from None
+
+    # Validate required fields
+    if not all(key in config for key in ['LEADERBOARD_FILE', 'CONSTANTS_FILE', 'GIT_REPO_PATH', 'DATE_CONFIG']):
+        raise ValueError("Missing required fields in config.json")
+    return config
+
+# Merge for generated files where our fresh copy is the one to keep
+def keep_ours(base, ours, theirs):
+    return ours, []
+
+# Merge for constants.ts: POOL_PRICE is the only value typed in, so take
+# whichever side changed it. The derived values are rebuilt from the merged
+# board afterwards (regenerate_constants), so neither side's are kept.
+def merge_price_config(base, ours, theirs):
+    pools = [parse_price_config(text).get('POOL_PRICE') for text in (base, ours, theirs)]
+    if None in pools[1:]:
+        raise ValueError("PRICE_CONFIG has no POOL_PRICE")
+    config = parse_price_config(ours)
+    if pools[1] == pools[0]:
+        config['POOL_PRICE'] = pools[2]
+    return render_price_config(config), []
+
+# What a bad config_form.json can raise from load_config()
+CONFIG_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+config = None
+
+def load_config():
+    """
+    Read the configuration and set up the files and services below, once.
+    Raises one of CONFIG_ERRORS; the window shows it in a dialog, the
+    headless modes print it.
+    """
+    global config, LEADERBOARD_FILE, CONSTANTS_FILE, GIT_REPO_PATH, DATE_CONFIG, chunk_writer
+    global leaderboard_file, prize_engine, git_session, generated, history, url_checker
+    if config is not None:
+        return
+    settings = read_config()
+    LEADERBOARD_FILE = settings['LEADERBOARD_FILE']
+    CONSTANTS_FILE = settings['CONSTANTS_FILE']
+    GIT_REPO_PATH = settings['GIT_REPO_PATH']
+    DATE_CONFIG = settings['DATE_CONFIG']
+    # Optional paged copy of the board for the site (see leaderboard_chunks.py)
+    chunk_writer = None
+    if settings.get('CHUNK_DIR'):
+        chunk_writer = ChunkWriter(settings['CHUNK_DIR'], os.path.dirname(LEADERBOARD_FILE),
+                                   settings.get('CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
+    # Parsed rows are cached per file fingerprint, so an untouched file isn't re-parsed on launch
+    leaderboard_file = leaderboard_data.LeaderboardFile(LEADERBOARD_FILE, cache=ParseCache())
+    prize_engine = PrizeEngine(load_tiers(settings))
+    # Shared with every other tool in this process; one commit per push
+    git_session = git_sync.session_for(GIT_REPO_PATH)
+    # Content hashes of constants.ts and date_up.ts, so unchanged ones aren't rewritten
+    generated = GeneratedFiles()
+    register_merges()
+    # Hours history, one delta per Submit (see history_store.py)
+    history = HistoryStore(settings.get('HISTORY_FILE'))
+    # Profile picture URL checks, cached across submits and sessions
+    url_checker = UrlChecker(cache_file=default_url_cache_file())
+    config = settings
+
+# Concurrent edits from another admin are merged by contestant name on pull;
+# the files derived from the board are rebuilt from the merged one
+def register_merges():
+    git_session.register_merge(LEADERBOARD_FILE, leaderboard_merge.merge_texts)
+    git_session.register_merge(DATE_CONFIG, keep_ours)
+    git_session.register_merge(CONSTANTS_FILE, merge_price_config)
+    git_session.after_merge(regenerate_constants)
+    if chunk_writer is not None:
+        # Chunks follow the merged board rather than either side
+        git_session.after_merge(lambda: chunk_writer.write(*leaderboard_data.read_leaderboard(LEADERBOARD_FILE)))
+
+# Only called when board data actually changed, so LATEST_UPDATE means something
 def update_date():
-    try:
-        
-        # Get today's date in YYYY/MM/DD format
-        today_date = datetime.now().strftime("%Y/%m/%d")
+    # Get today's date in YYYY/MM/DD format
+    today_date = datetime.now().strftime("%Y/%m/%d")
 
-        new_content = f"""export const DATE_CONFIG = {{
+    new_content = f"""export const DATE_CONFIG = {{
             
             LATEST_UPDATE: '{today_date}'
             }} as const; 
             """
 
-        with open(DATE_CONFIG, 'w') as file:
-            file.write(new_content)
-
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
+    with tracing.span("update_date", bytes=len(new_content)) as fields:
+        written = fields['written'] = generated.write(DATE_CONFIG, new_content)
+    if written:
+        git_session.mark_changed(DATE_CONFIG)
 
 # --- New function to calculate prize based on hours ---
 def calculate_prize(hours):
     """
     Calculates the prize based on the given hours using a tiered system.
+    The tiers come from PRIZE_TIERS in config_form.json (see prize_engine.py).
     """
-    if hours <= 150:
-        prize = hours * 20
-    elif hours <= 300:
-        prize = 150 * 20 + (hours - 150) * 40
-    else:
-        prize = 150 * 20 + 150 * 40 + (hours - 300) * 60
-    return prize
+    return prize_engine.prize(hours)
 
 # Helper: read and parse the TypeScript data file
 def read_leaderboard():
-    imports = []
-    data_text = ""
-    contestants = []
-    with open(LEADERBOARD_FILE, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    # Collect import lines and separate array content
-    in_array = False
-    brace_level = 0
-    obj_buffer = ""
-    for line in lines:
-        stripped = line.strip()
-        # Keep import lines
-        if stripped.startswith("import "):
-            imports.append(line.rstrip())
-            continue
-        # Find start of array
-        if stripped.startswith("export const leaderboardData"):
-            in_array = True
-            continue
-        if not in_array:
-            continue
-        # Process lines inside array
-        # End of array
-        if '];' in stripped:
-            in_array = False
-            # If buffer has content, close it
-            if obj_buffer.strip():
-                contestants.append(parse_contestant(obj_buffer))
-            break
-        # Accumulate object text by tracking braces
-        for ch in line:
-            if ch == '{':
-                brace_level += 1
-                if brace_level == 1:
-                    obj_buffer = "{"
-                elif brace_level > 1:
-                    obj_buffer += "{"
-            elif ch == '}':
-                brace_level -= 1
-                obj_buffer += "}"
-                if brace_level == 0:
-                    # Finished one object
-                    contestants.append(parse_contestant(obj_buffer))
-                    obj_buffer = ""
-            else:
-                if brace_level >= 1:
-                    obj_buffer += ch
-
+    # Single-pass tokenizer, see leaderboard_data.py. The file object also
+    # remembers where each record sits so writes can patch just those rows.
+    with tracing.span("read_leaderboard") as fields:
+        imports, contestants = leaderboard_file.read()
+        fields.update(rows=len(contestants), bytes=leaderboard_file.stat[1] if leaderboard_file.stat else 0,
+                      cached=leaderboard_file.from_cache)
     return imports, contestants
 
 # Parse a single "{...}" object text into a dict
 def parse_contestant(obj_str):
-    c = {}
-    # Extract fields with regex
-    rank_match = re.search(r"rank\s*:\s*(\d+)", obj_str)
-    name_match = re.search(r"name\s*:\s*\"([^\"]+)\"", obj_str)
-    hours_match = re.search(r"hours\s*:\s*(\d+)", obj_str)
-    money_match = re.search(r"money\s*:\s*(\d+)", obj_str)
-    pic_match = re.search(r"profilePic\s*:\s*([^,\}]+)", obj_str)
-
-    if rank_match:
-        c['rank'] = int(rank_match.group(1))
-    if name_match:
-        c['name'] = name_match.group(1)
-    if hours_match:
-        c['hours'] = int(hours_match.group(1))
-    if money_match:
-        c['money'] = int(money_match.group(1))
-    if pic_match:
-        pic_val = pic_match.group(1).strip()
-        # Remove quotes if they exist
-        if pic_val.startswith('"') or pic_val.startswith("'"):
-            pic_val = pic_val.strip('"\'')
-            c['profilePic'] = pic_val
-            c['picType'] = 'url'
-        else:
-            c['profilePic'] = pic_val
-            c['picType'] = 'import'
-    return c
+    return leaderboard_data.parse_contestant(obj_str)
 
-# Write the updated contestants back to the TS file
+# Write the updated contestants back to the TS file; True if the file changed
 def write_leaderboard(imports, contestants):
-    # Sort by hours desc and update ranks
-    contestants.sort(key=lambda x: x['hours'], reverse=True)
-    for i, c in enumerate(contestants, start=1):
-        c['rank'] = i
-
-    with open(LEADERBOARD_FILE, 'w', encoding='utf-8') as f:
-        # Write import lines
-        for imp_line in imports:
-            f.write(imp_line + '\n')
-        f.write("\nexport const leaderboardData = [\n")
-        # Write each contestant
-        for c in contestants:
-            name = c['name']
-            hours = c['hours']
-            money = c['money']
-            rank = c['rank']
-            if c.get('picType') == 'url':
-                pic_str = f"\"{c['profilePic']}\""
-            else:
-                pic_str = c['profilePic']
-            line = f"  {{ rank: {rank}, name: \"{name}\", hours: {hours}, money: {money}, profilePic: {pic_str} }},\n"
-            f.write(line)
-        f.write("];\n")
-
-# Sort contestants and refresh the Listbox display
+    with tracing.span("write_leaderboard", rows=len(contestants)) as fields:
+        # Sort by hours desc and update ranks (records are Contestants, see contestant_record.py)
+        contestants.sort(key=attrgetter('hours'), reverse=True)
+        for i, c in enumerate(contestants, start=1):
+            c.rank = i
+
+        # Only rows whose rank or fields changed are rewritten, via temp file + rename
+        written = leaderboard_file.write(imports, contestants)
+        fields['bytes'] = leaderboard_file.stat[1] if written and leaderboard_file.stat else 0
+        if chunk_writer is not None:
+            chunks = chunk_writer.write(imports, contestants)
+            fields['chunks'] = len(chunks)
+            for path in chunks:
+                git_session.register_merge(path, keep_ours)
+            git_session.mark_changed(*chunks)
+    if written:
+        git_session.mark_changed(LEADERBOARD_FILE)
+        record_history(contestants)
+    # The file now holds our version of everything
+    local_edits.clear()
+    conflicts.clear()
+    return written
+
+# Local only: a failed history append never blocks a save
+def record_history(contestants):
+    try:
+        with tracing.span("record_history") as fields:
+            fields['rows'] = history.append([(c.name, c.hours, c.money or 0, c.rank) for c in contestants])
+    except OSError as e:
+        print(f"Could not record history: {e}", file=sys.stderr)
+
+# Names added, changed or deleted in the editor since the last write. An
+# outside change to one of these is a conflict: ours is kept and flagged.
+local_edits = set()
+conflicts = set()
+
+# Re-read only the part of the file a git pull or outside edit changed
+def reload_leaderboard():
+    with tracing.span("reload_leaderboard") as fields:
+        result = leaderboard_file.reload()
+        if result is not None:
+            changes = result[1]
+            fields.update(added=len(changes['added']), changed=len(changes['changed']),
+                          removed=len(changes['removed']))
+    return result
+
+def on_leaderboard_changed(path):
+    global import_lines
+    try:
+        result = reload_leaderboard()
+    except (OSError, ValueError) as e:
+        # Probably caught mid-save; the next change notification retries
+        print(f"Could not reload {path}: {e}")
+        return
+    if result is None:
+        return  # our own write
+    import_lines, changes = result
+    apply_external_changes(changes)
+
+def apply_external_changes(changes):
+    """Merge a record-level diff from disk into the store, keeping unsaved local edits."""
+    selected = selected_record()
+    clashes = []
+    lo, hi = len(contestants), 0
+
+    for name in changes['removed']:
+        if name in local_edits:
+            clashes.append(name)
+            continue
+        record = contestants.get(name)
+        if record is None:
+            continue
+        _removed, (start, stop) = contestants.delete(contestants.index_of(record))
+        lo, hi = min(lo, start), max(hi, stop)
+
+    for incoming in changes['added'] + changes['changed']:
+        name = incoming.get('name')
+        if name in local_edits:
+            clashes.append(name)
+            continue
+        fields = {k: v for k, v in incoming.items() if k != 'rank'}
+        record = contestants.get(name)
+        if record is None:
+            _pos, (start, stop) = contestants.add(fields)
+        else:
+            _pos, (start, stop) = contestants.update(contestants.index_of(record), **fields)
+        lo, hi = min(lo, start), max(hi, stop)
+
+    # Keep the same contestant selected even if it moved
+    if selected is not None:
+        select_record(selected)
+    if clashes:
+        conflicts.update(clashes)
+        lo, hi = 0, len(contestants)
+    if lo < hi:
+        refresh_rows(lo, hi)
+        refresh_totals()
+    if clashes:
+        listing = "\n".join(clashes[:15])
+        if len(clashes) > 15:
+            listing += f"\n... and {len(clashes) - 15} more"
+        messagebox.showwarning("Leaderboard changed on disk",
+                               f"leaderboard-data.ts was changed outside the editor, including "
+                               f"{len(clashes)} contestant(s) you have unsaved edits for:\n\n{listing}\n\n"
+                               "Your versions are kept (marked with !) and will overwrite the outside "
+                               "change on Submit.")
+
+# The Listbox shows either the whole board or, while the search box has
+# text, the matching records in rank order. Rows are looked up through the
+# view, and the selection is always turned back into a record.
+view = None
+
+def view_count():
+    return len(contestants) if view is None else len(view)
+
+def view_record(index):
+    return contestants[index] if view is None else view[index]
+
+def selected_record():
+    sel = listbox.curselection()
+    if not sel or sel[0] >= view_count():
+        return None
+    return view_record(sel[0])
+
+def select_record(record):
+    """Select record's row if it is still on the board and in the view, else clear."""
+    if contestants.get(record.name) is not record:
+        listbox.selection_clear()
+    elif view is None:
+        listbox.selected = contestants.index_of(record)
+    else:
+        # By identity: Contestants compare equal by value
+        position = next((i for i, r in enumerate(view) if r is record), None)
+        if position is None:
+            listbox.selection_clear()
+        else:
+            listbox.selected = position
+
+# Text shown for one row of the contestant list
+def row_text(index):
+    c = view_record(index)
+    if c['name'] in conflicts:
+        return f"{c['rank']} - {c['name']} !"
+    return f"{c['rank']} - {c['name']}"
+
+# Refresh the Listbox display (only the visible rows are drawn)
 def sort_and_refresh():
-    contestants.sort(key=lambda x: x['hours'], reverse=True)
-    for i, c in enumerate(contestants, start=1):
-        c['rank'] = i
-    listbox.delete(0, tk.END)
-    for c in contestants:
-        listbox.insert(tk.END, f"{c['rank']} - {c['name']}")
+    listbox.refresh()
+
+# Redraw only the Listbox rows an edit touched
+def refresh_rows(start, stop):
+    if view is None:
+        listbox.refresh_rows(start, stop)
+    else:
+        # Store positions don't map onto the filtered rows; search again
+        apply_filter(keep_scroll=True)
+
+# Search box: filtering waits until typing pauses for SEARCH_DELAY_MS
+SEARCH_DELAY_MS = 150
+search_after = None
+
+def on_search_key(event=None):
+    global search_after
+    if search_after is not None:
+        root.after_cancel(search_after)
+    search_after = root.after(SEARCH_DELAY_MS, apply_filter)
+
+def apply_filter(keep_scroll=False):
+    global view, search_after
+    search_after = None
+    query = entry_search.get().strip()
+    selected = selected_record()
+    if not query:
+        view = None
+        label_matches.config(text="")
+    elif not name_index.built:
+        # Runs again once the index is ready
+        label_matches.config(text="Indexing names...")
+        return
+    else:
+        with tracing.span("search", query_length=len(query)) as fields:
+            names, complete = name_index.search(query)
+            records = [contestants.get(name) for name in names]
+            view = sorted((c for c in records if c is not None), key=attrgetter('rank'))
+            fields['matches'] = len(view)
+        label_matches.config(text=f"{len(view)}{'' if complete else '+'} found")
+    if selected is not None:
+        select_record(selected)
+    if not keep_scroll:
+        listbox.top = 0
+    listbox.refresh()
+
+def on_names_indexed(entries, error=None):
+    if error is not None:
+        label_matches.config(text="Search unavailable")
+        print(f"Could not index names: {error}")
+        return
+    name_index.load(entries)
+    if entry_search.get().strip():
+        apply_filter()
 
 # Button callbacks
 def add_contestant():
@@ -223,24 +389,25 @@ def add_contestant():
         messagebox.showerror("Input Error", "Hours must be an integer")
         return
     
-    # Determine pic type
-    if pic.startswith("http://") or pic.startswith("https://"):
-        pic_type = 'url'
-    elif pic:  # assume import identifier if not blank
-        pic_type = 'import'
-    else:
-        pic_type = 'url' # Default to URL if blank, or you can make it empty string
+    # Determine pic type (blank defaults to URL)
+    pic_type = pic_type_for(pic)
 
     new_contestant = {'name': name, 'hours': hours, 'money': money, 'profilePic': pic, 'picType': pic_type}
-    contestants.append(new_contestant)
-    sort_and_refresh()
+    try:
+        pos, (start, stop) = contestants.add(new_contestant)
+    except ValueError as e:
+        messagebox.showerror("Input Error", str(e))
+        return
+    local_edits.add(name)
+    refresh_rows(start, stop)
+    refresh_totals()
     clear_form()
 
 def update_contestant():
-    sel = listbox.curselection()
-    if not sel:
+    record = selected_record()
+    if record is None:
         return
-    index = sel[0]
+    index = contestants.index_of(record)
     name = entry_name.get().strip()
     hours_str = entry_hours.get().strip()
     pic = entry_pic.get().strip()
@@ -256,37 +423,37 @@ def update_contestant():
         messagebox.showerror("Input Error", "Hours must be an integer")
         return
 
-    if pic.startswith("http://") or pic.startswith("https://"):
-        pic_type = 'url'
-    elif pic:
-        pic_type = 'import'
-    else:
-        pic_type = 'url'
+    pic_type = pic_type_for(pic)
     
     # Update the selected contestant's data
-    contestants[index]['name'] = name
-    contestants[index]['hours'] = hours
-    contestants[index]['money'] = money # Money is now calculated
-    contestants[index]['profilePic'] = pic
-    contestants[index]['picType'] = pic_type
-    sort_and_refresh()
+    old_name = record.name
+    try:
+        pos, (start, stop) = contestants.update(
+            index, name=name, hours=hours,
+            money=money, # Money is now calculated
+            profilePic=pic, picType=pic_type)
+    except ValueError as e:
+        messagebox.showerror("Input Error", str(e))
+        return
+    local_edits.update((old_name, name))
+    refresh_rows(start, stop)
+    refresh_totals()
     clear_form()
 
 def delete_contestant():
-    sel = listbox.curselection()
-    if not sel:
+    record = selected_record()
+    if record is None:
         return
-    index = sel[0]
-    del contestants[index]
-    sort_and_refresh()
+    removed, (start, stop) = contestants.delete(contestants.index_of(record))
+    local_edits.add(removed['name'])
+    refresh_rows(start, stop)
+    refresh_totals()
     clear_form()
 
 def on_select(evt):
-    sel = listbox.curselection()
-    if not sel:
+    c = selected_record()
+    if c is None:
         return
-    index = sel[0]
-    c = contestants[index]
     entry_name.delete(0, tk.END)
     entry_name.insert(0, c['name'])
     entry_hours.delete(0, tk.END)
@@ -335,144 +502,462 @@ def update_calculated_money(*args):
         entry_money.config(state='readonly')
 
 
-def update_constants():
-    update_date()
+# POOL_PRICE is the one PRICE_CONFIG value not derived from the board; start
+# from what constants.ts already has
+def read_pool_price():
     try:
-        pool_price = entry_pool_price.get()
-        price_per_hour = entry_price_per_hour.get()
-        total_hour = entry_total_hour.get()
+        with open(CONSTANTS_FILE, 'r', encoding='utf-8') as file:
+            return parse_price_config(file.read()).get('POOL_PRICE')
+    except OSError:
+        return None
+
+def pool_value():
+    pool = entry_pool_price.get().strip()
+    return int(pool) if pool.isdigit() else None
+
+# Live totals under Session Update; each edit already updated them in O(1)
+def refresh_totals(*args):
+    totals = contestants.totals
+    pool = pool_value()
+    label_price_per_hour.config(text=f"{totals.price_per_hour:,}")
+    label_total_hour.config(text=f"{totals.hours:,}")
+    payout = f"{totals.payout:,}"
+    if pool:
+        payout += f" ({totals.utilization(pool):.0%} of pool)"
+    label_payout.config(text=payout, fg='#FF0000' if pool is not None and totals.payout > pool else 'black')
+    label_tiers.config(text=" / ".join(str(n) for n in totals.tier_counts))
+
+# Ask before saving payouts the pool can't cover
+def confirm_payouts(pool):
+    payout = contestants.totals.payout
+    if pool is None or payout <= pool:
+        return True
+    return messagebox.askyesno("Prize Pool", f"Prizes add up to {payout:,}, more than the {pool:,} pool.\n\n"
+                               "Save anyway?")
+
+# PRICE_CONFIG from the running totals; only the pool is typed in. True if the file changed
+def write_constants(totals, pool):
+    new_content = render_price_config(totals.price_config(pool))
+    with tracing.span("update_constants", bytes=len(new_content)) as fields:
+        written = fields['written'] = generated.write(CONSTANTS_FILE, new_content)
+    if written:
+        git_session.mark_changed(CONSTANTS_FILE)
+    return written
+
+# After a pull merged the board, PRICE_CONFIG is recomputed from the merged
+# rows; runs on the sync worker and returns the files it rewrote
+def regenerate_constants():
+    pool = read_pool_price()
+    if pool is None:
+        return []
+    _imports, rows = leaderboard_data.read_leaderboard(LEADERBOARD_FILE)
+    new_content = render_price_config(BoardTotals(prize_engine, rows).price_config(pool))
+    return [CONSTANTS_FILE] if generated.write(CONSTANTS_FILE, new_content) else []
 
-        if not pool_price.isdigit() or not price_per_hour.isdigit() or not total_hour.isdigit(): # Added total_hour validation
-            messagebox.showerror("Invalid Input", "Please enter valid numbers for Pool Prize, Prize Per Hour, and Total Hour.")
+def update_constants():
+    try:
+        pool = pool_value()
+        if pool is None:
+            messagebox.showerror("Invalid Input", "Please enter a valid number for Pool Prize.")
             return
-        
-        # Get today's date in YYYY/MM/DD format
-        today_date = datetime.now().strftime("%Y/%m/%d")
-
-        new_content = f"""export const PRICE_CONFIG = {{
-            POOL_PRICE: {pool_price},
-            PRICE_PER_HOUR: {price_per_hour},
-            TOTAL_HOURS: {total_hour},
-            }} as const; 
-            """
-
-        with open(CONSTANTS_FILE, 'w') as file:
-            file.write(new_content)
-
+        if not confirm_payouts(pool):
+            return
+        if not write_constants(contestants.totals, pool):
+            messagebox.showinfo("Success", "Constants are already up to date.")
+            return
+        update_date()
         messagebox.showinfo("Success", "Constants updated successfully.")
     except Exception as e:
         messagebox.showerror("Error", str(e))
 
-def submit_changes():
-    update_date()
-    write_leaderboard(import_lines, contestants)
-    messagebox.showinfo("Saved", "leaderboard-data.ts has been updated.")
+# Run func() on a worker thread and call on_done(result, error) back on the Tk thread
+def run_in_background(func, on_done, name="worker"):
+    result = {}
 
-def open_constants():
-    subprocess.Popen(['C:\\Windows\\notepad.exe', CONSTANTS_FILE])
+    def work():
+        try:
+            result['value'] = func()
+        except Exception as e:
+            result['error'] = e
 
-def commit_and_push():
+    worker = threading.Thread(target=work, name=name, daemon=True)
+    worker.start()
+
+    def wait():
+        if worker.is_alive():
+            root.after(100, wait)
+            return
+        on_done(result.get('value'), result.get('error'))
+
+    root.after(100, wait)
+
+def submit_changes(recheck=()):
+    # Check profile pictures off the Tk thread first; finish_submit saves.
+    # URLs in recheck skip the check cache.
+    btn_submit.config(state='disabled', text="Checking pictures...")
+    board = list(contestants.records)
+    run_in_background(
+        lambda: validate_pics(board, import_lines, url_checker, os.path.dirname(LEADERBOARD_FILE), recheck),
+        finish_submit, name="pic-check")
+
+def finish_submit(problems, error=None):
+    btn_submit.config(state='normal', text="Submit")
+    if error is not None:
+        if not messagebox.askyesno("Profile Pictures", f"Could not check profile pictures:\n{error}\n\nSubmit anyway?"):
+            return
+    elif problems:
+        listing = "\n".join(f"{name}: {pic} ({problem})" for name, pic, problem in problems[:15])
+        if len(problems) > 15:
+            listing += f"\n... and {len(problems) - 15} more"
+        answer = messagebox.askyesnocancel(
+            "Profile Pictures",
+            f"{len(problems)} profile picture(s) look broken:\n\n{listing}\n\n"
+            "Submit anyway?\n(No checks them again, Cancel goes back.)")
+        if answer is None:
+            return
+        if not answer:
+            submit_changes(recheck={pic for _name, pic, _problem in problems})
+            return
+    if leaderboard_file.changed_on_disk():
+        # Merge an outside change the watcher hasn't delivered yet, so it isn't lost
+        on_leaderboard_changed(LEADERBOARD_FILE)
+    pool = pool_value()
+    if not confirm_payouts(pool):
+        return
     try:
-        repo = Repo(GIT_REPO_PATH)
-        origin = repo.remote(name='origin')
+        changed = write_leaderboard(import_lines, contestants.records)
+        if pool is not None:
+            changed = write_constants(contestants.totals, pool) or changed
+        if changed:
+            update_date()
+    except OSError as e:
+        messagebox.showerror("Error", str(e))
+        return
 
-        # Stash local changes if any
-        if repo.is_dirty(untracked_files=True):
-            repo.git.stash('save', 'Auto-stash before pull')
+    # Shrink newly added local profile pictures on a process pool
+    btn_submit.config(state='disabled', text="Optimizing images...")
+    run_in_background(
+        lambda: optimize_assets(import_lines, os.path.dirname(LEADERBOARD_FILE)),
+        lambda report, error=None: finish_optimize(report, error, changed), name="asset-optimize")
+
+def finish_optimize(report, error=None, changed=True):
+    btn_submit.config(state='normal', text="Submit")
+    optimized = report['optimized'] if error is None and report is not None else []
+    if changed:
+        message = "leaderboard-data.ts has been updated."
+    elif optimized:
+        message = "leaderboard-data.ts is unchanged, but some of its images were optimized."
+    else:
+        message = "No changes to save."
+    if error is not None:
+        message += f"\n\nImage optimization failed:\n{error}"
+    elif report is not None:
+        if report['optimized']:
+            git_session.mark_changed(*report['optimized'])
+            message += (f"\n\nOptimized {len(report['optimized'])} image(s), saved "
+                        f"{report['bytes_saved'] / 1024:.0f} KB in {report['seconds']:.1f}s.")
+        if report['errors']:
+            message += "\n\n" + "\n".join(report['errors'][:5])
+    messagebox.showinfo("Saved", message)
 
-        # Pull with rebase
-        origin.pull(rebase=True)
+def open_constants():
+    subprocess.Popen(['C:\\Windows\\notepad.exe', CONSTANTS_FILE])
 
-        # Apply stashed changes back (if any)
-        stashes = repo.git.stash('list')
-        if stashes:
-            repo.git.stash('pop')
+def git_commit_and_push():
+    """Pull, commit and push the leaderboard repo. Raises GitSyncError on failure."""
+    return git_sync.sync_and_push(GIT_REPO_PATH, "Update leaderboard data")
 
-        # Stage, commit, and push
-        repo.git.add(update=True)
-        repo.index.commit("Update leaderboard data")
-        origin.push()
+def commit_and_push():
+    # Runs on the background sync worker; repeated clicks while a push is
+    # waiting are merged into it.
+    worker = git_sync.default_worker_for(GIT_REPO_PATH, root)
+    worker.request_push("Update leaderboard data", on_git_progress, on_git_done)
+    btn_cancel_git.config(state='normal')
+
+def on_git_progress(label):
+    btn_git.config(text=f"{label}...")
+
+def on_git_done(error, timings):
+    btn_git.config(text="Commit & Push")
+    if not git_sync.default_worker_for(GIT_REPO_PATH, root).busy:
+        btn_cancel_git.config(state='disabled')
+    if error is None and not git_session.last_pushed:
+        messagebox.showinfo("Git", git_sync.format_nothing_pushed(git_session))
+    elif error is None:
+        messagebox.showinfo("Git", "Changes pulled, committed, and pushed to GitHub.\n\n"
+                            + merge_report() + git_sync.format_timings(timings))
+    elif isinstance(error, git_sync.GitSyncCancelled):
+        messagebox.showinfo("Git", "Push cancelled.")
+    elif isinstance(error, git_sync.GitSyncError):
+        messagebox.showerror("Git Error", f"Git command failed:\n{error}")
+    else:
+        messagebox.showerror("Git Error", str(error))
+
+# Contestants both we and the pulled commits changed; ours were kept
+def merge_report():
+    names = [name for conflicts in git_session.last_conflicts.values() for name in conflicts]
+    if not names:
+        return ""
+    listing = "\n".join(names[:15])
+    if len(names) > 15:
+        listing += f"\n... and {len(names) - 15} more"
+    return f"Also changed by someone else (your version was kept):\n{listing}\n\n"
+
+def cancel_git():
+    git_sync.default_worker_for(GIT_REPO_PATH, root).cancel()
+
+# Headless modes report a bad config on stderr instead of in a dialog
+def load_config_headless():
+    try:
+        load_config()
+    except CONFIG_ERRORS as e:
+        print(f"Could not load config_form.json: {e}", file=sys.stderr)
+        return False
+    return True
+
+# Headless mode: merge a CSV/JSONL hours export without opening the window
+def run_import(argv):
+    parser = argparse.ArgumentParser(
+        prog="contestant_manage import",
+        description="Merge name,hours[,profilePic] updates into leaderboard-data.ts")
+    parser.add_argument("file", help="CSV or JSONL file of updates")
+    parser.add_argument("--commit", action="store_true", help="commit and push after writing")
+    parser.add_argument("--dry-run", action="store_true", help="report counts without writing")
+    args = parser.parse_args(argv)
+    if not load_config_headless():
+        return 1
+
+    start = time.perf_counter()
+    try:
+        imports, rows = read_leaderboard()
+        counts = merge_updates(rows, read_updates(args.file), calculate_prize)
+        # Rank once, write once
+        store = ContestantStore(rows, BoardTotals(prize_engine))
+        pool = read_pool_price()
+        if not args.dry_run and (counts['inserted'] or counts['updated']):
+            changed = write_leaderboard(imports, store.records)
+            if pool is not None:
+                changed = write_constants(store.totals, pool) or changed
+            if changed:
+                update_date()
+    except (OSError, ValueError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    rate = counts['rows'] / elapsed if elapsed > 0 else 0.0
+    print(f"{counts['rows']} rows in {elapsed:.3f}s ({rate:,.0f} rows/sec): "
+          f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged")
+    if pool is not None and store.totals.payout > pool:
+        print(f"Warning: prizes add up to {store.totals.payout:,}, more than the {pool:,} pool", file=sys.stderr)
+
+    if args.commit and not args.dry_run:
+        try:
+            git_commit_and_push()
+        except git_sync.GitSyncCancelled:
+            print("Push cancelled.", file=sys.stderr)
+            return 1
+        except (git_sync.GitSyncError, OSError) as git_err:
+            print(f"Git command failed:\n{git_err}", file=sys.stderr)
+            return 1
+        if git_session.last_pushed:
+            print(merge_report() + "Changes pulled, committed, and pushed to GitHub.")
+        else:
+            print(git_sync.format_nothing_pushed(git_session))
+    return 0
+
+# Headless history: seed it from git, or print a contestant's or the top ranks' history
+def run_history(argv):
+    parser = argparse.ArgumentParser(
+        prog="contestant_manage history",
+        description="Query or backfill the local hours history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill = commands.add_parser("backfill", help="add every earlier commit of leaderboard-data.ts")
+    backfill.add_argument("--workers", type=int, help="git processes to run at once")
+    show = commands.add_parser("show", help="one contestant's hours over time")
+    show.add_argument("name")
+    top = commands.add_parser("top", help="the top ranks after each Submit")
+    top.add_argument("count", type=int, nargs="?", default=10)
+    args = parser.parse_args(argv)
+    if not load_config_headless():
+        return 1
+
+    start = time.perf_counter()
+    if args.command == "backfill":
+        try:
+            added = history.backfill(GIT_REPO_PATH, LEADERBOARD_FILE, args.workers)
+        except (OSError, git_sync.GitSyncError) as e:
+            print(f"Backfill failed: {e}", file=sys.stderr)
+            return 1
+        print(f"{added} commits added in {time.perf_counter() - start:.1f}s; {len(history)} snapshots in all")
+    elif args.command == "show":
+        rows = history.series(args.name)
+        if not rows:
+            print(f"No history for {args.name}", file=sys.stderr)
+            return 1
+        for timestamp, hours, money, rank in rows:
+            print(f"{format_time(timestamp)}  {hours:>6}h  {money:>8,}  {rank or 'removed'}")
+    else:
+        for timestamp, names in history.top(args.count):
+            print(format_time(timestamp) + "  " + ", ".join(f"{name} ({hours}h)" for name, hours in names))
+    return 0
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y/%m/%d %H:%M")
+
+# The selected contestant's recorded hours, newest first
+def show_history():
+    record = selected_record()
+    if record is None:
+        messagebox.showinfo("History", "Select a contestant first.")
+        return
+    window = tk.Toplevel(root)
+    window.title(f"History: {record.name}")
+    tree = ttk.Treeview(window, columns=("when", "hours", "money", "rank"), show="headings")
+    for column, heading in (("when", "Date"), ("hours", "Hours"), ("money", "Money"), ("rank", "Rank")):
+        tree.heading(column, text=heading)
+        tree.column(column, width=130 if column == "when" else 70)
+    for timestamp, hours, money, rank in reversed(history.series(record.name)):
+        tree.insert("", tk.END, values=(format_time(timestamp), hours, money, rank or "removed"))
+    tree.pack(fill=tk.BOTH, expand=True)
+
+def open_window(master):
+    """Load the board and build the editor inside master (a Tk or Toplevel)."""
+    global import_lines, contestants, root, listbox, entry_name, entry_hours, entry_money, entry_pic
+    global entry_pool_price, label_price_per_hour, label_total_hour, label_payout, label_tiers
+    global btn_git, btn_cancel_git, btn_submit, entry_search, label_matches, name_index, view
+
+    load_config()
+    # Initialize data
+    import_lines, loaded = read_leaderboard()
+    # Indexed, always-sorted store; edits only re-rank the rows they move across
+    name_index = NameIndex()
+    contestants = ContestantStore(loaded, BoardTotals(prize_engine), name_index)
+    view = None
+
+    # Build GUI
+    root = master
+    root.title("Leaderboard Editor")
+    root.geometry("600x500")
+
+    # Listbox of contestants
+    frame_list = tk.Frame(root)
+    frame_list.pack(side=tk.LEFT, fill=tk.BOTH, padx=5, pady=5)
+    frame_search = tk.Frame(frame_list)
+    frame_search.pack(fill=tk.X)
+    tk.Label(frame_search, text="Search:").pack(side=tk.LEFT)
+    entry_search = tk.Entry(frame_search)
+    entry_search.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    entry_search.bind('<KeyRelease>', on_search_key)
+    entry_search.bind('<Escape>', lambda e: (entry_search.delete(0, tk.END), apply_filter()))
+    label_matches = tk.Label(frame_list, anchor=tk.W)
+    label_matches.pack(fill=tk.X)
+    # Virtualized: rows are pulled from the store (or search results) as they scroll into view
+    listbox = VirtualListbox(frame_list, row_count=view_count, row_text=row_text, width=30)
+    listbox.pack(fill=tk.BOTH, expand=True)
+    listbox.bind('<<ListboxSelect>>', on_select)
+
+    # Form entries and buttons
+    frame_form = tk.Frame(root)
+    frame_form.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    tk.Label(frame_form, text="Contestant Update").grid(row=0, column=0, columnspan=2, pady=5)
+    tk.Label(frame_form, text="Session Update").grid(row=7, column=0, columnspan=2, pady=(15, 5))
+
+    tk.Label(frame_form, text="Name:").grid(row=1, column=0, sticky=tk.W)
+    entry_name = tk.Entry(frame_form)
+    entry_name.grid(row=1, column=1, pady=2, sticky="ew")
+
+    tk.Label(frame_form, text="Hours:").grid(row=2, column=0, sticky=tk.W)
+    entry_hours = tk.Entry(frame_form)
+    entry_hours.grid(row=2, column=1, pady=2, sticky="ew")
+    # Bind the entry_hours to update the calculated money
+    entry_hours.bind('<KeyRelease>', update_calculated_money)
+
+
+    tk.Label(frame_form, text="Money:").grid(row=3, column=0, sticky=tk.W)
+    entry_money = tk.Entry(frame_form, state='readonly') # Make this field read-only
+    entry_money.grid(row=3, column=1, pady=2, sticky="ew")
+
+
+    tk.Label(frame_form, text="ProfilePic:").grid(row=4, column=0, sticky=tk.W)
+    entry_pic = tk.Entry(frame_form)
+    entry_pic.grid(row=4, column=1, pady=2, sticky="ew")
+
+    tk.Label(frame_form, text="Pool Prize:").grid(row=8, column=0, sticky=tk.W)
+    entry_pool_price = tk.Entry(frame_form)
+    entry_pool_price.grid(row=8, column=1, pady=2, sticky="ew")
+    pool = read_pool_price()
+    if pool is not None:
+        entry_pool_price.insert(0, str(pool))
+    entry_pool_price.bind('<KeyRelease>', refresh_totals)
+
+    # Derived from the board and kept current as it is edited
+    tk.Label(frame_form, text="Prize Per Hour:").grid(row=9, column=0, sticky=tk.W)
+    label_price_per_hour = tk.Label(frame_form, anchor=tk.W)
+    label_price_per_hour.grid(row=9, column=1, pady=2, sticky="ew")
+
+    tk.Label(frame_form, text="Total Hour:").grid(row=10, column=0, sticky=tk.W)
+    label_total_hour = tk.Label(frame_form, anchor=tk.W)
+    label_total_hour.grid(row=10, column=1, pady=2, sticky="ew")
+
+    tk.Label(frame_form, text="Total Prizes:").grid(row=11, column=0, sticky=tk.W)
+    label_payout = tk.Label(frame_form, anchor=tk.W)
+    label_payout.grid(row=11, column=1, pady=2, sticky="ew")
+
+    tk.Label(frame_form, text="Per Tier:").grid(row=12, column=0, sticky=tk.W)
+    label_tiers = tk.Label(frame_form, anchor=tk.W)
+    label_tiers.grid(row=12, column=1, pady=2, sticky="ew")
+
+    # Buttons
+    btn_add = tk.Button(frame_form, text="Add", command=add_contestant)
+    btn_add.grid(row=5, column=0, pady=5, sticky="ew")
+    btn_update = tk.Button(frame_form, text="Update", command=update_contestant)
+    btn_update.grid(row=5, column=1, pady=5, sticky="ew")
+    btn_delete = tk.Button(frame_form, text="Delete", command=delete_contestant)
+    btn_delete.grid(row=6, column=0, pady=5, sticky="ew")
+    btn_submit = tk.Button(frame_form, text="Submit", command=submit_changes)
+    btn_submit.grid(row=6, column=1, pady=5, sticky="ew")
+    btn_open = tk.Button(frame_form, text="Submit Constants", command=update_constants) # Renamed for clarity
+    btn_open.grid(row=13, column=0, columnspan=2, pady=5, sticky="ew")
+    btn_git = tk.Button(frame_form, text="Commit & Push", command=commit_and_push, fg='#FF0000')
+    btn_git.grid(row=14, column=0, columnspan=2, pady=(20, 0), sticky="ew")
+    btn_cancel_git = tk.Button(frame_form, text="Cancel Push", command=cancel_git, state='disabled')
+    btn_cancel_git.grid(row=15, column=0, columnspan=2, pady=(5, 0), sticky="ew")
+    btn_history = tk.Button(frame_form, text="History", command=show_history)
+    btn_history.grid(row=16, column=0, columnspan=2, pady=(5, 0), sticky="ew")
+
+    # Make form columns expand
+    frame_form.columnconfigure(1, weight=1)
+
+    # Populate initial listbox
+    sort_and_refresh()
+    refresh_totals()
+
+    # Index names for the search box off the Tk thread; edits made meanwhile
+    # are replayed when it is ready
+    names = [c.name for c in contestants]
+    run_in_background(lambda: build_entries(names), on_names_indexed, name="name-index")
+
+    # Pick up git pulls and outside edits while the window is open
+    watcher = FileWatcher(root)
+    watcher.watch(LEADERBOARD_FILE, on_leaderboard_changed)
+    root.bind('<Destroy>', lambda e: watcher.close() if e.widget is root else None, add='+')
+
+if __name__ == "__main__":
+    # Needed for the image optimizer's process pool in a PyInstaller build
+    multiprocessing.freeze_support()
+    if tracing.profiling_requested():
+        tracing.start_profiling()
+        sys.argv = [arg for arg in sys.argv if arg != '--profile']
+    if len(sys.argv) > 1 and sys.argv[1] == "import":
+        sys.exit(run_import(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "history":
+        sys.exit(run_history(sys.argv[2:]))
 
-        messagebox.showinfo("Git", "Changes pulled, committed, and pushed to GitHub.")
-    except GitCommandError as git_err:
-        messagebox.showerror("Git Error", f"Git command failed:\n{git_err}")
-    except Exception as e:
-        messagebox.showerror("Git Error", str(e))
-
-# Initialize data
-import_lines, contestants = read_leaderboard()
-contestants.sort(key=lambda x: x['hours'], reverse=True)
-
-# Build GUI
-root = tk.Tk()
-root.title("Leaderboard Editor")
-root.geometry("600x400")
-
-# Listbox of contestants
-frame_list = tk.Frame(root)
-frame_list.pack(side=tk.LEFT, fill=tk.BOTH, padx=5, pady=5)
-listbox = tk.Listbox(frame_list, width=30)
-listbox.pack(fill=tk.BOTH, expand=True)
-listbox.bind('<<ListboxSelect>>', on_select)
-
-# Form entries and buttons
-frame_form = tk.Frame(root)
-frame_form.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-tk.Label(frame_form, text="Contestant Update").grid(row=0, column=0, columnspan=2, pady=5)
-tk.Label(frame_form, text="Session Update").grid(row=7, column=0, columnspan=2, pady=(15, 5))
-
-tk.Label(frame_form, text="Name:").grid(row=1, column=0, sticky=tk.W)
-entry_name = tk.Entry(frame_form)
-entry_name.grid(row=1, column=1, pady=2, sticky="ew")
-
-tk.Label(frame_form, text="Hours:").grid(row=2, column=0, sticky=tk.W)
-entry_hours = tk.Entry(frame_form)
-entry_hours.grid(row=2, column=1, pady=2, sticky="ew")
-# Bind the entry_hours to update the calculated money
-entry_hours.bind('<KeyRelease>', update_calculated_money)
-
-
-tk.Label(frame_form, text="Money:").grid(row=3, column=0, sticky=tk.W)
-entry_money = tk.Entry(frame_form, state='readonly') # Make this field read-only
-entry_money.grid(row=3, column=1, pady=2, sticky="ew")
-
-
-tk.Label(frame_form, text="ProfilePic:").grid(row=4, column=0, sticky=tk.W)
-entry_pic = tk.Entry(frame_form)
-entry_pic.grid(row=4, column=1, pady=2, sticky="ew")
-
-tk.Label(frame_form, text="Pool Prize:").grid(row=8, column=0, sticky=tk.W)
-entry_pool_price = tk.Entry(frame_form)
-entry_pool_price.grid(row=8, column=1, pady=2, sticky="ew")
-
-tk.Label(frame_form, text="Prize Per Hour:").grid(row=9, column=0, sticky=tk.W)
-entry_price_per_hour = tk.Entry(frame_form)
-entry_price_per_hour.grid(row=9, column=1, pady=2, sticky="ew")
-
-tk.Label(frame_form, text="Total Hour:").grid(row=10, column=0, sticky=tk.W)
-entry_total_hour = tk.Entry(frame_form)
-entry_total_hour.grid(row=10, column=1, pady=2, sticky="ew")
-
-# Buttons
-btn_add = tk.Button(frame_form, text="Add", command=add_contestant)
-btn_add.grid(row=5, column=0, pady=5, sticky="ew")
-btn_update = tk.Button(frame_form, text="Update", command=update_contestant)
-btn_update.grid(row=5, column=1, pady=5, sticky="ew")
-btn_delete = tk.Button(frame_form, text="Delete", command=delete_contestant)
-btn_delete.grid(row=6, column=0, pady=5, sticky="ew")
-btn_submit = tk.Button(frame_form, text="Submit", command=submit_changes)
-btn_submit.grid(row=6, column=1, pady=5, sticky="ew")
-btn_open = tk.Button(frame_form, text="Submit Constants", command=update_constants) # Renamed for clarity
-btn_open.grid(row=11, column=0, columnspan=2, pady=5, sticky="ew")
-btn_git = tk.Button(frame_form, text="Commit & Push", command=commit_and_push, fg='#FF0000')
-btn_git.grid(row=12, column=0, columnspan=2, pady=(20, 0), sticky="ew")
-
-# Make form columns expand
-frame_form.columnconfigure(1, weight=1)
-
-# Populate initial listbox
-for c in contestants:
-    listbox.insert(tk.END, f"{c['rank']} - {c['name']}")
-
-root.mainloop()
\ No newline at end of file
+    try:
+        load_config()
+    except CONFIG_ERRORS as e:
+        messagebox.showerror("Error", str(e))
+        sys.exit(1)
+    open_window(tk.Tk())
+    root.mainloop()
@@ -0,0 +1,106 @@
+from collections.abc import MutableMapping
+
+# Compact in-memory form of one leaderboard row.
+#
+# A dict per contestant costs a hash table with six string keys; a board of
+# a million rows spends most of its memory on those. Contestant keeps the six
+# standard fields in __slots__ instead, plus an optional dict for any other
+# field a hand-edited file might carry. It is still a MutableMapping, so code
+# written against the old dicts (c['hours'], c.get('money', 0), c.update(...),
+# dict(c)) keeps working; hot paths (parser, writer, store) use the attributes.
+#
+# A standard field set to None counts as absent, the way a dict without that
+# key behaved. The parser never produces None values.
+
+FIELDS = ('rank', 'name', 'hours', 'money', 'profilePic', 'picType')
+_FIELD_SET = frozenset(FIELDS)
+
+
+class Contestant(MutableMapping):
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, rank=None, name=None, hours=None, money=None, profilePic=None, picType=None):
+        self.rank = rank
+        self.name = name
+        self.hours = hours
+        self.money = money
+        self.profilePic = profilePic
+        self.picType = picType
+        self.extra = None
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Build a Contestant from a dict (or return it unchanged if it already is one)."""
+        if type(mapping) is cls:
+            return mapping
+        c = cls()
+        for key, value in mapping.items():
+            c[key] = value
+        return c
+
+    # --- Mapping protocol ---
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(getattr(self, key) is not None for key in FIELDS) + len(self.extra or ())
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None
+        return self.extra is not None and key in self.extra
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def update(self, other=(), **fields):
+        if hasattr(other, 'keys'):
+            other = [(k, other[k]) for k in other.keys()]
+        for key, value in other:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def copy(self):
+        c = Contestant(self.rank, self.name, self.hours, self.money, self.profilePic, self.picType)
+        if self.extra:
+            c.extra = dict(self.extra)
+        return c
+
+    def __repr__(self):
+        return f"Contestant({dict(self)!r})"
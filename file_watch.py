@@ -0,0 +1,125 @@
+import os
+import threading
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # stat polling only
+    Observer = None
+    FileSystemEventHandler = object
+
+# Notices when the files the editors hold in memory change on disk (a git
+# pull, someone editing them in VS Code) and tells the editor on the Tk
+# thread.
+#
+# With watchdog installed (inotify on Linux, ReadDirectoryChangesW on
+# Windows) events mark a file as worth checking and the Tk loop looks at it
+# on its next tick. Without it every file is stat()ed each POLL_MS. Either
+# way a change is only reported once the file's (mtime, size) has stayed the
+# same for one more tick, so a git checkout or a save in progress is seen
+# once, finished. The callback decides whether the change is foreign; our
+# own writes show up here too.
+
+POLL_MS = 1000
+EVENT_POLL_MS = 250
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _DirHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher._touched(os.path.abspath(path))
+
+
+class FileWatcher:
+    def __init__(self, root, poll_ms=None):
+        self.root = root
+        self._files = {}      # abs path -> [callback, last reported stat, pending stat]
+        self._hints = set()   # paths watchdog saw events for
+        self._lock = threading.Lock()
+        self._observer = None
+        self._dirs = set()
+        self._after_id = None
+        if Observer is not None:
+            try:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            except Exception:
+                self._observer = None
+        self.poll_ms = poll_ms or (EVENT_POLL_MS if self._observer is not None else POLL_MS)
+
+    def watch(self, path, callback):
+        """Call callback(path) on the Tk thread after path changes on disk."""
+        path = os.path.abspath(path)
+        self._files[path] = [callback, _stat(path), None]
+        directory = os.path.dirname(path)
+        if self._observer is not None and directory not in self._dirs:
+            try:
+                self._observer.schedule(_DirHandler(self), directory, recursive=False)
+                self._dirs.add(directory)
+            except Exception:
+                pass
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._tick)
+
+    def unwatch(self, path):
+        self._files.pop(os.path.abspath(path), None)
+
+    def _touched(self, path):
+        # Called from the watchdog thread
+        with self._lock:
+            self._hints.add(path)
+
+    def _tick(self):
+        self._after_id = None
+        if self._observer is not None:
+            with self._lock:
+                hints, self._hints = self._hints, set()
+            # Files with no new event may still be settling from the last
+            # tick; ones whose folder couldn't be watched are polled
+            paths = [p for p, entry in self._files.items()
+                     if p in hints or entry[2] is not None or os.path.dirname(p) not in self._dirs]
+        else:
+            paths = list(self._files)
+        for path in paths:
+            entry = self._files.get(path)
+            if entry is None:
+                continue
+            callback, reported, pending = entry
+            current = _stat(path)
+            if current == reported:
+                entry[2] = None
+            elif current != pending:
+                entry[2] = current   # still changing, or first sight: wait a tick
+            else:
+                entry[1], entry[2] = current, None
+                try:
+                    callback(path)
+                except Exception as e:
+                    print(f"File watcher callback for {path} failed: {e}")
+        if self._files:
+            self._after_id = self.root.after(self.poll_ms, self._tick)
+
+    def close(self):
+        self._files.clear()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
@@ -0,0 +1,60 @@
+import hashlib
+import os
+import threading
+
+from leaderboard_data import atomic_write
+
+# Skips writes that would leave a generated file as it already is, so a
+# Submit with no real edits changes nothing on disk and git has nothing to
+# commit. Each file's content hash is remembered with its mtime and size;
+# while those still match, a write is decided from the hash alone, otherwise
+# the file is read and hashed once more. Line endings are ignored, as git
+# normalizes them anyway.
+#
+# leaderboard-data.ts and ImageSlideshow.tsx don't go through here: their
+# writers already compare the spliced text with the file they parsed.
+
+
+def _digest(text):
+    return hashlib.blake2b(text.replace('\r\n', '\n').encode('utf-8'), digest_size=16).digest()
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class GeneratedFiles:
+    """Content hashes of the files a tool writes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._known = {}   # abs path -> (stat, digest)
+
+    def _disk_digest(self, path):
+        stat = _stat(path)
+        with self._lock:
+            known = self._known.get(path)
+        if known is not None and known[0] == stat:
+            return known[1]
+        if stat is None:
+            return None
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            digest = _digest(f.read())
+        with self._lock:
+            self._known[path] = (stat, digest)
+        return digest
+
+    def write(self, path, text):
+        """Write text to path unless it is already there. Returns True when written."""
+        path = os.path.abspath(path)
+        digest = _digest(text)
+        if self._disk_digest(path) == digest:
+            return False
+        atomic_write(path, text)
+        with self._lock:
+            self._known[path] = (_stat(path), digest)
+        return True
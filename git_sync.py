@@ -0,0 +1,537 @@
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+
+import tracing
+from leaderboard_data import atomic_write
+
+# Shared git handling for the editors. Every tool in the process goes through
+# one GitSession per repo, and the Tk callbacks only enqueue a push request; a
+# worker thread runs fetch -> (rebase) -> add -> commit -> push and reports
+# back through the UI thread's after() loop. Files that would collide in the
+# rebase (leaderboard-data.ts, see leaderboard_merge.py) can register a
+# three-way merge that runs in its place.
+#
+# git is run as a child process rather than through GitPython so a step can
+# be killed on cancel or timeout; GitPython's kill_after_timeout does not
+# work on Windows.
+
+POLL_MS = 100
+
+
+class GitSyncError(Exception):
+    pass
+
+
+class GitSyncCancelled(GitSyncError):
+    pass
+
+
+def _kill(proc):
+    # Remote helpers (git-remote-https) are children of git and hold its
+    # pipes open: kill the whole tree, or communicate() waits for them
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    else:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    proc.kill()
+    try:
+        proc.communicate(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def _popen_git(repo_path, args, cancel_event, timeout, binary=False):
+    # binary: return stdout as bytes (file contents from `git show`)
+    flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    # Never wait on an editor (rebase --continue)
+    env = dict(os.environ, GIT_EDITOR='true')
+    proc = subprocess.Popen(
+        ['git', *args], cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL, text=not binary, creationflags=flags, env=env,
+        start_new_session=os.name != 'nt',   # its own process group, for _kill
+    )
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        try:
+            out, err = proc.communicate(timeout=0.1)
+            if binary:
+                err = err.decode('utf-8', 'replace')
+            return proc.returncode, out, err
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                _kill(proc)
+                raise GitSyncCancelled(f"git {args[0]} cancelled")
+            if deadline is not None and time.monotonic() > deadline:
+                _kill(proc)
+                raise GitSyncError(f"git {args[0]} timed out after {timeout}s")
+
+
+def run_git(repo_path, args, cancel_event=None, timeout=None):
+    """Run one git command, returning its stdout. Raises GitSyncError on failure."""
+    code, out, err = _popen_git(repo_path, args, cancel_event, timeout)
+    if code != 0:
+        raise GitSyncError(f"git {' '.join(args)} failed:\n{err.strip() or out.strip()}")
+    return out
+
+
+class GitSession:
+    """
+    Process-wide handle on the leaderboard repo, shared by every tool.
+
+    Tools call mark_changed() for each file they generate; sync() then stages
+    exactly those files, makes one commit for all of them and pushes once.
+    The pull is skipped when a fetch shows origin has nothing we don't have.
+    With nothing to commit or push, the sync only fetches and, if origin
+    moved, fast-forwards to it.
+    """
+
+    def __init__(self, repo_path):
+        self.repo_path = os.path.abspath(repo_path)
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._mergers = {}
+        self._after_merge = []
+        self.last_conflicts = {}
+        self.last_pushed = False
+        self.last_pulled = False
+
+    def mark_changed(self, *paths):
+        with self._lock:
+            for path in paths:
+                self._changed.add(os.path.abspath(path))
+
+    @property
+    def changed_files(self):
+        with self._lock:
+            return sorted(self._changed)
+
+    def register_merge(self, path, merge):
+        """
+        Merge path ourselves when origin moved and it has local edits,
+        instead of stash/rebase/pop. merge(base, ours, theirs) gets the three
+        texts and returns (text, conflicts); on ValueError git handles the
+        file as before.
+        """
+        with self._lock:
+            self._mergers[os.path.abspath(path)] = merge
+
+    def after_merge(self, callback):
+        """
+        Run callback() once merged files are written, e.g. to regenerate
+        files derived from them. It returns the paths it changed.
+        """
+        with self._lock:
+            self._after_merge.append(callback)
+
+    def _rebase_in_progress(self):
+        code, out, _err = _popen_git(self.repo_path, ['rev-parse', '--git-path', 'rebase-merge'], None, None)
+        if code != 0:
+            return False
+        merge_dir = os.path.join(self.repo_path, out.strip())
+        return os.path.exists(merge_dir) or os.path.exists(os.path.join(os.path.dirname(merge_dir), 'rebase-apply'))
+
+    def sync(self, message, progress=None, cancel_event=None, timeout=None):
+        """
+        Fetch, rebase onto origin only if it moved, stage the generated files,
+        commit once and push once.
+
+        Files with a registered merge are merged from base/ours/theirs
+        instead of by git, whether our side is committed (not yet pushed) or
+        only in the working tree; if the rebase fails it is aborted and local
+        edits are put back. While files are left unmerged (a failed stash pop)
+        it refuses to run. What each merge reported ends up in
+        last_conflicts (relative path -> conflicts); last_pushed and
+        last_pulled say whether anything was pushed or brought in from
+        origin. progress(label) is called before each step.
+        Returns a list of (label, seconds) timings.
+        """
+        timings = []
+        self.last_conflicts = {}
+        self.last_pushed = False
+        self.last_pulled = False
+        # While set, steps that change the repo are running: a cancel waits
+        # for the next step outside them instead of killing git mid-rebase
+        # with local edits set aside or stashed
+        protected = False
+
+        def step(label, *args, check=True, binary=False):
+            cancellable = cancel_event if not protected else None
+            if cancellable is not None and cancellable.is_set():
+                raise GitSyncCancelled("Cancelled")
+            if progress:
+                progress(label)
+            with tracing.span(f"git {args[0]}", label=label) as fields:
+                start = time.perf_counter()
+                code, out, err = _popen_git(self.repo_path, args, cancellable, timeout, binary)
+                timings.append((label, time.perf_counter() - start))
+                fields['exit_code'] = code
+            if check and code != 0:
+                raise GitSyncError(f"git {' '.join(args)} failed:\n{err.strip() or out.strip()}")
+            return code, out
+
+        def merge_local(base_rev, merged):
+            # Fill merged with path -> (our bytes, merged text) for registered
+            # files that both we (committed but unpushed, or not yet
+            # committed) and origin changed since base_rev
+            with self._lock:
+                mergers = dict(self._mergers)
+            for path, merge in mergers.items():
+                rel = os.path.relpath(path, self.repo_path).replace(os.sep, '/')
+                try:
+                    with open(path, 'rb') as f:
+                        ours = f.read()
+                except FileNotFoundError:
+                    continue
+                code, base = step(f"Reading {rel} as last pulled", 'show', f'{base_rev}:{rel}', check=False, binary=True)
+                if code != 0:
+                    base = b''
+                if ours == base:
+                    continue
+                code, theirs = step(f"Reading {rel} from origin", 'show', f'@{{u}}:{rel}', check=False, binary=True)
+                if code != 0 or theirs == base or theirs == ours:
+                    continue
+                if progress:
+                    progress(f"Merging {rel}")
+                with tracing.span("merge", file=rel) as fields:
+                    start = time.perf_counter()
+                    try:
+                        text, conflicts = merge(base.decode('utf-8'), ours.decode('utf-8'), theirs.decode('utf-8'))
+                    except (ValueError, UnicodeDecodeError) as e:
+                        # Leave it to git
+                        fields['fallback'] = str(e)
+                        continue
+                    timings.append((f"Merging {rel}", time.perf_counter() - start))
+                    fields['conflicts'] = len(conflicts)
+                self.last_conflicts[rel] = conflicts
+                merged[path] = (ours, text)
+            for path in merged:
+                rel = os.path.relpath(path, self.repo_path).replace(os.sep, '/')
+                _code, head = step(f"Reading {rel}", 'show', f'HEAD:{rel}', check=False, binary=True)
+                if merged[path][0] != head:
+                    step(f"Setting aside {rel}", 'checkout', 'HEAD', '--', rel)
+
+        def rebase(merged):
+            # Local commits that touch a merged file conflict on it when
+            # replayed; take the replayed side there (the merged text is
+            # written over it afterwards) and carry on. Other conflicts fail.
+            rels = {os.path.relpath(path, self.repo_path).replace(os.sep, '/') for path in merged}
+            code, _out = step("Rebasing onto origin", 'rebase', '@{u}', check=False)
+            while code != 0:
+                _code, out = step("Listing conflicts", 'diff', '--name-only', '--diff-filter=U')
+                conflicted = set(out.splitlines())
+                if not conflicted or not conflicted <= rels:
+                    raise GitSyncError("git rebase failed with conflicts in:\n" + "\n".join(sorted(conflicted - rels)))
+                for rel in sorted(conflicted):
+                    step(f"Keeping ours for {rel}", 'checkout', '--theirs', '--', rel)
+                    step(f"Resolving {rel}", 'add', '--', rel)
+                code, _out = step("Continuing rebase", 'rebase', '--continue', check=False)
+
+        def restore(merged, stashed, rebasing, rebased):
+            # Undo a failed pull, in order: abort the rebase, pop the stash,
+            # put back the merged files' local edits (or, if the rebase got
+            # through, their merged text). Returns what couldn't be undone,
+            # for the error message.
+            problems = []
+            try:
+                if rebasing:
+                    code, _out, err = _popen_git(self.repo_path, ['rebase', '--abort'], None, timeout)
+                    if code != 0 and self._rebase_in_progress():
+                        problems.append(f"git rebase --abort failed: {err.strip()}")
+            finally:
+                try:
+                    if stashed and problems:
+                        problems.append("Your other local changes are kept in `git stash list`.")
+                    elif stashed:
+                        code, _out, err = _popen_git(self.repo_path, ['stash', 'pop'], None, timeout)
+                        if code != 0:
+                            problems.append("Could not restore your other local changes; they are kept in "
+                                            f"`git stash list`:\n{err.strip()}")
+                finally:
+                    for path, (ours, text) in merged.items():
+                        if rebased:
+                            atomic_write(path, text)
+                            self.mark_changed(path)
+                        else:
+                            with open(path, 'wb') as f:
+                                f.write(ours)
+            return problems
+
+        def ahead():
+            code, out = step("Checking for unpushed commits", 'rev-list', '--count', '@{u}..HEAD', check=False)
+            return code != 0 or out.strip() != '0'
+
+        with tracing.span("git sync", files=len(self.changed_files)) as run:
+            # A failed stash pop leaves conflict markers in the working tree;
+            # staging those would push them
+            _code, out = step("Checking for conflicts", 'diff', '--name-only', '--diff-filter=U')
+            if out.strip():
+                raise GitSyncError("These files still have conflicts from an earlier pull:\n" + out.strip()
+                                   + "\n\nFix them and `git add` them, then push again; nothing was committed.")
+            files = self.changed_files
+            scope = ['--', *[os.path.relpath(f, self.repo_path) for f in files]] if files else ['--untracked-files=no']
+            _code, status = step("Checking for changes", 'status', '--porcelain', *scope)
+            nothing_local = not status.strip() and not ahead()
+
+            step("Fetching from origin", 'fetch', 'origin')
+            behind, _out = step("Comparing with origin", 'merge-base', '--is-ancestor', '@{u}', 'HEAD', check=False)
+            if nothing_local:
+                # Nothing written differs from HEAD and nothing is unpushed:
+                # no commit or push, and catching up with origin is a plain
+                # fast-forward
+                run['skipped'] = True
+                with self._lock:
+                    self._changed.difference_update(files)
+                if behind:
+                    protected = True
+                    step("Pulling from origin", 'merge', '--ff-only', '@{u}')
+                    protected = False
+                    self.last_pulled = True
+                run['pulled'] = self.last_pulled
+                return timings
+
+            if behind:
+                # Origin moved: merge files that know how, stash other local
+                # changes if any, rebase onto origin, restore
+                run['rebased'] = True
+                _code, base_rev = step("Finding last pull", 'merge-base', 'HEAD', '@{u}')
+                protected = True
+                merged = {}
+                stashed = rebasing = rebased = False
+                try:
+                    merge_local(base_rev.strip(), merged)
+                    run['merged'] = len(merged)
+                    _code, status = step("Checking for changes", 'status', '--porcelain', '--untracked-files=no')
+                    if status.strip():
+                        step("Stashing local changes", 'stash', 'push', '-m', 'Auto-stash before pull')
+                        stashed = True
+                    rebasing = True
+                    rebase(merged)
+                    rebasing = False
+                    rebased = True
+                    self.last_pulled = True
+                    if stashed:
+                        stashed = False
+                        code, _out = step("Restoring local changes", 'stash', 'pop', check=False)
+                        if code != 0:
+                            raise GitSyncError("git stash pop failed after the pull; your local changes "
+                                               "are kept in `git stash list`")
+                except BaseException as e:
+                    # Don't lose the edits we set aside
+                    problems = restore(merged, stashed, rebasing, rebased)
+                    if problems:
+                        raise GitSyncError(f"{e}\n\n" + "\n".join(problems)) from e
+                    raise
+                for path, (_ours, text) in merged.items():
+                    atomic_write(path, text)
+                    self.mark_changed(path)
+                if merged:
+                    with self._lock:
+                        callbacks = list(self._after_merge)
+                    for callback in callbacks:
+                        self.mark_changed(*callback())
+                protected = False
+
+            files = self.changed_files
+            # Killing add or commit can leave index.lock behind
+            protected = True
+            if files:
+                step("Staging", 'add', '--', *[os.path.relpath(f, self.repo_path) for f in files])
+            else:
+                # Nothing generated in this process (e.g. files written by an
+                # earlier session): fall back to all tracked changes
+                step("Staging", 'add', '--update')
+
+            staged, _out = step("Checking staged changes", 'diff', '--cached', '--quiet', check=False)
+            run['committed'] = bool(staged)
+            if staged:
+                step("Committing", 'commit', '-m', message)
+            protected = False
+            with self._lock:
+                self._changed.difference_update(files)
+            if staged or ahead():
+                step("Pushing", 'push')
+                self.last_pushed = True
+            run['pushed'] = self.last_pushed
+        return timings
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def session_for(repo_path):
+    """The shared GitSession for repo_path in this process."""
+    key = os.path.abspath(repo_path)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = GitSession(key)
+        return session
+
+
+def sync_and_push(repo_path, message, progress=None, cancel_event=None, timeout=None):
+    """Synchronous sync of the shared session; see GitSession.sync."""
+    return session_for(repo_path).sync(message, progress, cancel_event, timeout)
+
+
+class _PushJob:
+    def __init__(self, message):
+        self.message = message
+        self.callbacks = []
+        self.cancel_event = threading.Event()
+
+
+class GitSyncWorker:
+    """
+    One background thread per repo, fed by a queue of push requests.
+
+    Requests made while another push is still waiting are folded into it, so
+    double-clicks cost one sync. Callbacks run on the Tk thread when root is
+    given, otherwise from drain().
+    """
+
+    def __init__(self, repo_path, root=None, timeout=120):
+        self.repo_path = repo_path
+        self.root = root
+        self.timeout = timeout
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = None
+        self._active = 0
+        self._polling = False
+        self._thread = threading.Thread(target=self._run, name="git-sync", daemon=True)
+        self._thread.start()
+
+    def request_push(self, message, on_progress=None, on_done=None):
+        """
+        Queue a sync. on_progress(label) and on_done(error, timings) are
+        called on the UI thread; error is None on success. Returns True if
+        a new job was queued, False if merged into one already waiting.
+        """
+        with self._lock:
+            job = self._pending
+            created = job is None
+            if created:
+                job = self._pending = _PushJob(message)
+                self._active += 1
+            job.callbacks.append((on_progress, on_done))
+        if created:
+            self._jobs.put(job)
+        self._start_polling()
+        return created
+
+    def cancel(self):
+        """
+        Stop the running sync (and any waiting one) at the next chance. A
+        stash/rebase/restore or add/commit already under way finishes first.
+        """
+        with self._lock:
+            for job in (self._running, self._pending):
+                if job is not None:
+                    job.cancel_event.set()
+
+    @property
+    def busy(self):
+        return self._active > 0
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            with self._lock:
+                # From here on new requests start a fresh job, since files
+                # may change after this one stages them.
+                if self._pending is job:
+                    self._pending = None
+                self._running = job
+            error = None
+            timings = []
+            try:
+                timings = sync_and_push(
+                    self.repo_path, job.message,
+                    progress=lambda label: self._events.put(('progress', job, label)),
+                    cancel_event=job.cancel_event, timeout=self.timeout,
+                )
+            except Exception as e:
+                error = e
+            with self._lock:
+                self._running = None
+            self._events.put(('done', job, (error, timings)))
+
+    def drain(self):
+        """Deliver queued progress/done callbacks. Called on the UI thread."""
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                return
+            for on_progress, on_done in job.callbacks:
+                if kind == 'progress' and on_progress:
+                    on_progress(payload)
+                elif kind == 'done' and on_done:
+                    on_done(*payload)
+            if kind == 'done':
+                with self._lock:
+                    self._active -= 1
+
+    def wait(self, timeout=None):
+        """Block until all queued syncs finished and their callbacks ran (headless use)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            self.drain()
+            time.sleep(0.01)
+        return True
+
+    def _start_polling(self):
+        if self.root is None or self._polling:
+            return
+        self._polling = True
+        self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self.drain()
+        if self.busy:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def close(self):
+        self._jobs.put(None)
+
+
+def format_timings(timings):
+    return "\n".join(f"{label}: {seconds:.2f}s" for label, seconds in timings)
+
+
+def format_nothing_pushed(session):
+    """What to tell the user when a sync had nothing to commit or push."""
+    if session.last_pulled:
+        return "Nothing to push: no files changed since the last commit.\nPulled the latest changes from origin."
+    return "Nothing to push: no files changed since the last commit.\nOrigin has nothing new either."
+
+
+_workers = {}
+
+
+def default_worker_for(repo_path, root):
+    """One shared worker per repo path in this process."""
+    key = os.path.abspath(repo_path)
+    worker = _workers.get(key)
+    if worker is None:
+        # Poll from the application's Tk root, which outlives any tool window
+        app_root = root.nametowidget('.') if root is not None else None
+        worker = _workers[key] = GitSyncWorker(repo_path, app_root)
+    return worker
@@ -0,0 +1,454 @@
+import marshal
+import os
+import struct
+import subprocess
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+from app_paths import app_cache_dir
+from git_sync import run_git
+from leaderboard_data import parse_leaderboard
+
+# Hours history, so "how did X move this season" doesn't mean re-parsing
+# every commit of leaderboard-data.ts.
+#
+# The history file is append-only: one block per Submit that changed
+# anything. A block holds the timestamp, any names seen for the first time,
+# and only the contestants whose (hours, money, rank) differ from the
+# previous block, stored column by column (name id, hours, money, rank;
+# rank 0 marks a removal). It also keeps the top TOP_KEEP ranks of that
+# board so top-N-over-time needs no replay. Every block starts with its
+# length, so a block cut short by a crash is ignored and overwritten by the
+# next append.
+#
+# Several editors (and a backfill) may share the file. Appends and the
+# backfill's final swap hold an OS lock on a .lock file next to it; before
+# appending, the store reads any blocks others added since it last looked
+# (or reloads if the file was replaced), so only a genuinely torn tail is
+# ever truncated.
+#
+# Loading is a handful of array.frombytes() calls per block. Per-contestant
+# queries use an index of the rows for each name, kept next to the file
+# (.idx); it is only a cache and is rebuilt from the file when missing.
+#
+# backfill() seeds the history from git, parsing the commits of
+# leaderboard-data.ts on a process pool.
+
+MAGIC = b'LBHB'
+BLOCK = struct.Struct('<4sIdII')   # magic, payload bytes, timestamp, new names, rows
+_U32 = struct.Struct('<I')
+TOP_KEEP = 100
+REMOVED = 0
+INDEX_VERSION = 2
+_SWAP = sys.byteorder == 'big'     # the file is little-endian
+_COLUMNS = (('I', 4), ('q', 8), ('q', 8), ('i', 4))
+LOCK_TIMEOUT = 10
+
+
+def default_history_file():
+    return app_cache_dir('history.lbh')
+
+
+def _pack(arr):
+    if _SWAP:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpack(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+
+def encode_block(timestamp, new_names, ids, hours, money, ranks, top_ids, top_hours):
+    names = "\0".join(new_names).encode('utf-8')
+    payload = b"".join([
+        _U32.pack(len(names)), names,
+        _pack(ids), _pack(hours), _pack(money), _pack(ranks),
+        _U32.pack(len(top_ids)), _pack(top_ids), _pack(top_hours),
+    ])
+    return BLOCK.pack(MAGIC, len(payload), timestamp, len(new_names), len(ids)) + payload
+
+
+class _FileLock:
+    """Exclusive OS lock on path for a with block; released if the process dies."""
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._file = None
+
+    def _try_lock(self):
+        if msvcrt is not None:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._try_lock()
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    self._file.close()
+                    raise OSError(f"{self.path} is held by another process") from None
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            if msvcrt is not None:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+
+
+def _file_id(st):
+    return (st.st_dev, st.st_ino)
+
+
+class HistoryStore:
+    def __init__(self, path=None):
+        self.path = path or default_history_file()
+        self.index_path = self.path + '.idx'
+        self.lock_path = self.path + '.lock'
+        self._loaded = False
+
+    def _reset(self):
+        self.names = []                 # name id -> name
+        self.name_ids = {}
+        self.times = array('d')         # per block
+        self.block_rows = array('q')    # per block, its first row
+        self.top_starts = array('q')    # per block, its first top entry
+        self.ids = array('I')           # per row: name id, hours, money, rank
+        self.hours = array('q')
+        self.money = array('q')
+        self.ranks = array('i')
+        self.top_ids = array('I')       # per top entry, ranks 1.. in order
+        self.top_hours = array('q')
+        self._size = 0                  # bytes of complete blocks in the file
+        self._file_id = None            # (device, inode) of the file those came from
+        self._state = None
+        self._rows_by_name = None
+
+    def _ensure_loaded(self):
+        """Load the file, or pick up blocks other processes appended since."""
+        if not self._loaded:
+            self._reset()
+            self._loaded = True
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            if self._file_id is not None:
+                self._reset()
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if self._file_id is not None and (_file_id(st) != self._file_id or st.st_size < self._size):
+                # Replaced (a backfill) or cut back: start over
+                self._reset()
+            self._file_id = _file_id(st)
+            if st.st_size <= self._size:
+                return
+            f.seek(self._size)
+            data = f.read()
+        first_row = len(self.ids)
+        view = memoryview(data)
+        pos = 0
+        while pos + BLOCK.size <= len(data):
+            magic, length, timestamp, new_names, rows = BLOCK.unpack_from(data, pos)
+            end = pos + BLOCK.size + length
+            if magic != MAGIC or end > len(data):
+                break
+            try:
+                self._add_block(view[pos + BLOCK.size:end], timestamp, new_names, rows)
+            except (ValueError, UnicodeDecodeError, struct.error):
+                break
+            pos = end
+        self._size += pos
+        if pos:
+            self._state = None
+            if self._rows_by_name is not None:
+                self._index_rows(self._rows_by_name, first_row)
+
+    def _add_block(self, payload, timestamp, new_names, rows):
+        # Decode everything first so a bad block leaves no partial state
+        (names_len,) = _U32.unpack_from(payload, 0)
+        p = 4 + names_len
+        names = bytes(payload[4:p]).decode('utf-8').split("\0") if new_names else []
+        if len(names) != new_names:
+            raise ValueError("name count mismatch")
+        columns = []
+        for typecode, size in _COLUMNS:
+            columns.append(_unpack(typecode, payload[p:p + rows * size]))
+            p += rows * size
+        (top,) = _U32.unpack_from(payload, p)
+        p += 4
+        top_ids = _unpack('I', payload[p:p + top * 4])
+        top_hours = _unpack('q', payload[p + top * 4:p + top * 12])
+        if p + top * 12 != len(payload) or len(columns[-1]) != rows:
+            raise ValueError("block length mismatch")
+
+        for name in names:
+            self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        self.times.append(timestamp)
+        self.block_rows.append(len(self.ids))
+        self.top_starts.append(len(self.top_ids))
+        for target, column in zip((self.ids, self.hours, self.money, self.ranks), columns):
+            target.extend(column)
+        self.top_ids.extend(top_ids)
+        self.top_hours.extend(top_hours)
+
+    def __len__(self):
+        """Number of Submits recorded."""
+        self._ensure_loaded()
+        return len(self.times)
+
+    def _current(self):
+        # name -> (hours, money, rank) as of the last block; later rows win
+        if self._state is None:
+            last = dict(zip(self.ids, zip(self.hours, self.money, self.ranks)))
+            names = self.names
+            self._state = {names[i]: v for i, v in last.items() if v[2] != REMOVED}
+        return self._state
+
+    def append(self, rows, timestamp=None, sync=True):
+        """
+        Record the board as of a Submit. rows are (name, hours, money, rank)
+        for every contestant; only the ones that differ from the last Submit
+        are stored. Returns how many were, 0 meaning nothing was written.
+        """
+        with _FileLock(self.lock_path):
+            self._ensure_loaded()
+            return self._append(rows, timestamp, sync)
+
+    def _append(self, rows, timestamp, sync):
+        # Caller holds the lock (or owns the file outright) and has loaded it
+        timestamp = time.time() if timestamp is None else timestamp
+        state = self._current()
+        board = {}
+        top = []
+        for name, hours, money, rank in rows:
+            board[name] = (hours, money, rank)
+            if 0 < rank <= TOP_KEEP:
+                top.append((rank, name, hours))
+        changed = [(name, value) for name, value in board.items() if state.get(name) != value]
+        changed += [(name, (0, 0, REMOVED)) for name in state if name not in board]
+        if not changed:
+            return 0
+
+        new_names = []
+        pending = {}
+
+        def name_id(name):
+            nid = self.name_ids.get(name)
+            if nid is None:
+                nid = pending.get(name)
+                if nid is None:
+                    nid = pending[name] = len(self.names) + len(new_names)
+                    new_names.append(name)
+            return nid
+
+        ids, hours, money, ranks = (array(typecode) for typecode, _size in _COLUMNS)
+        for name, (h, m, r) in changed:
+            ids.append(name_id(name))
+            hours.append(h)
+            money.append(m)
+            ranks.append(r)
+        top.sort()
+        top_ids = array('I', [name_id(name) for _rank, name, _hours in top])
+        top_hours = array('q', [h for _rank, _name, h in top])
+        block = encode_block(timestamp, new_names, ids, hours, money, ranks, top_ids, top_hours)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'ab') as f:
+            # Every complete block is loaded by now, so anything past _size
+            # is the remains of one a crash cut short
+            if os.fstat(f.fileno()).st_size != self._size:
+                f.truncate(self._size)
+            f.write(block)
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+            self._file_id = _file_id(os.fstat(f.fileno()))
+        first_row = len(self.ids)
+        self._add_block(memoryview(block)[BLOCK.size:], timestamp, len(new_names), len(ids))
+        self._size += len(block)
+        self._state = board
+        if self._rows_by_name is not None:
+            self._index_rows(self._rows_by_name, first_row)
+        return len(changed)
+
+    # --- Queries ---
+
+    def _index_rows(self, rows_by_name, start):
+        ids = self.ids
+        for row in range(start, len(ids)):
+            rows = rows_by_name.get(ids[row])
+            if rows is None:
+                rows = rows_by_name[ids[row]] = array('I')
+            rows.append(row)
+
+    def _first_time(self):
+        # Tells the index of this file from one of a file since rewritten
+        return self.times[0] if len(self.times) else None
+
+    def _index(self):
+        if self._rows_by_name is not None:
+            return self._rows_by_name
+        rows_by_name, covered = {}, 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                version, python, first, size, covered, blobs = marshal.load(f)
+            if (version != INDEX_VERSION or python != tuple(sys.version_info[:2]) or first != self._first_time()
+                    or size > self._size or covered > len(self.ids)):
+                raise ValueError("stale index")
+            for nid, blob in blobs.items():
+                rows = rows_by_name[nid] = array('I')
+                rows.frombytes(blob)
+        except (OSError, ValueError, EOFError, TypeError):
+            rows_by_name, covered = {}, 0
+        if covered < len(self.ids):
+            self._index_rows(rows_by_name, covered)
+            try:
+                with open(self.index_path, 'wb') as f:
+                    marshal.dump((INDEX_VERSION, tuple(sys.version_info[:2]), self._first_time(), self._size, len(self.ids),
+                                  {nid: rows.tobytes() for nid, rows in rows_by_name.items()}), f)
+            except OSError:
+                pass
+        self._rows_by_name = rows_by_name
+        return rows_by_name
+
+    def series(self, name):
+        """
+        (timestamp, hours, money, rank) for each Submit that changed name's
+        entry, oldest first. Rank 0 means the contestant was removed.
+        """
+        self._ensure_loaded()
+        nid = self.name_ids.get(name)
+        if nid is None:
+            return []
+        block_rows, times = self.block_rows, self.times
+        return [(times[bisect_right(block_rows, row) - 1], self.hours[row], self.money[row], self.ranks[row])
+                for row in self._index().get(nid, ())]
+
+    def top(self, n=10):
+        """(timestamp, [(name, hours), ...]) for each Submit: its first n ranks (n up to TOP_KEEP)."""
+        self._ensure_loaded()
+        names, top_ids, top_hours = self.names, self.top_ids, self.top_hours
+        result = []
+        for b, timestamp in enumerate(self.times):
+            start = self.top_starts[b]
+            end = self.top_starts[b + 1] if b + 1 < len(self.top_starts) else len(top_ids)
+            result.append((timestamp, [(names[top_ids[i]], top_hours[i]) for i in range(start, min(end, start + n))]))
+        return result
+
+    def boards(self):
+        """Yield (timestamp, rows) with the whole board after each Submit, oldest first."""
+        self._ensure_loaded()
+        state = {}
+        for b, timestamp in enumerate(self.times):
+            end = self.block_rows[b + 1] if b + 1 < len(self.block_rows) else len(self.ids)
+            for row in range(self.block_rows[b], end):
+                name = self.names[self.ids[row]]
+                if self.ranks[row] == REMOVED:
+                    state.pop(name, None)
+                else:
+                    state[name] = (self.hours[row], self.money[row], self.ranks[row])
+            yield timestamp, [(name, h, m, r) for name, (h, m, r) in state.items()]
+
+    # --- Backfill ---
+
+    def backfill(self, repo_path, file_path, workers=None, progress=None):
+        """
+        Add the board from every commit of file_path older than the first
+        recorded Submit. The older boards are written to a temporary file
+        first; then, holding the lock, the current history is copied after
+        them and the file swapped in with a rename. Returns the number of
+        commits added.
+        """
+        self._ensure_loaded()
+        first = self._first_time()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        fresh = HistoryStore(tmp_path)
+        fresh._ensure_loaded()
+        added = 0
+        try:
+            for timestamp, board in git_boards(repo_path, file_path, workers):
+                if first is None or timestamp < first:
+                    fresh._append(board, timestamp, sync=False)
+                    added += 1
+                    if progress:
+                        progress(added)
+            if not added:
+                return 0
+            with _FileLock(self.lock_path):
+                self._ensure_loaded()
+                if self._first_time() != first:
+                    raise OSError("The history was rewritten during the backfill; run it again")
+                for timestamp, board in self.boards():
+                    fresh._append(board, timestamp, sync=False)
+                with open(tmp_path, 'rb+') as f:
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                try:
+                    os.remove(self.index_path)
+                except FileNotFoundError:
+                    pass
+                self._loaded = False
+                self._ensure_loaded()
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return added
+
+
+def _commit_board(job):
+    # Runs in a pool process: one commit's board as plain tuples
+    repo_path, sha, rel = job
+    flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    proc = subprocess.run(['git', 'show', f'{sha}:{rel}'], cwd=repo_path, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL, creationflags=flags)
+    if proc.returncode != 0:
+        return None
+    try:
+        _imports, contestants = parse_leaderboard(proc.stdout.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return [(c.name, c.hours, c.money or 0, c.rank or i)
+            for i, c in enumerate(contestants, start=1) if c.name is not None and c.hours is not None]
+
+
+def git_boards(repo_path, file_path, workers=None):
+    """Yield (commit time, rows) for each commit that touched file_path, oldest first."""
+    rel = os.path.relpath(os.path.abspath(file_path), os.path.abspath(repo_path)).replace(os.sep, '/')
+    log = run_git(repo_path, ['log', '--reverse', '--format=%H %ct', '--', rel])
+    commits = [line.split() for line in log.splitlines() if line.strip()]
+    jobs = [(repo_path, sha, rel) for sha, _ts in commits]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (_sha, ts), board in zip(commits, pool.map(_commit_board, jobs, chunksize=4)):
+            if board is not None:
+                yield float(ts), board
@@ -0,0 +1,109 @@
+import http.client
+import threading
+from urllib.parse import urlsplit, urljoin
+
+# Small keep-alive connection pool for the editors' HTTP checks and
+# downloads. Connections are reused per (scheme, host, port) and at most
+# max_per_host requests run against one host at a time.
+
+MAX_REDIRECTS = 5
+
+
+class HTTPError(Exception):
+    pass
+
+
+class HTTPPool:
+    def __init__(self, max_per_host=4, timeout=10, user_agent="leaderboard-editor"):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._idle = {}    # host key -> [connection, ...]
+        self._slots = {}   # host key -> BoundedSemaphore
+
+    def _key(self, parts):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        return (parts.scheme, parts.hostname, port)
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _connect(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _once(self, method, url, headers):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise HTTPError(f"Not an http(s) URL: {url}")
+        key = self._key(parts)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        all_headers = {'User-Agent': self.user_agent}
+        all_headers.update(headers or {})
+        with self._slot(key):
+            for attempt in (1, 2):
+                conn = self._connect(key)
+                try:
+                    conn.request(method, path, headers=all_headers)
+                    resp = conn.getresponse()
+                    body = resp.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # A kept-alive connection the server already closed: retry once fresh
+                    conn.close()
+                    if attempt == 2:
+                        raise
+                    continue
+                except Exception:
+                    conn.close()
+                    raise
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._release(key, conn)
+                return resp.status, dict(resp.getheaders()), body
+
+    def request(self, method, url, headers=None):
+        """Make a request, following redirects. Returns (status, headers, body, final_url)."""
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                status, resp_headers, body = self._once(method, url, headers)
+            except (OSError, http.client.HTTPException) as e:
+                raise HTTPError(f"{url}: {e}") from e
+            location = resp_headers.get('Location') or resp_headers.get('location')
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if status == 303:
+                    method = 'GET'
+                continue
+            return status, resp_headers, body, url
+        raise HTTPError(f"{url}: too many redirects")
+
+    def get(self, url, headers=None):
+        return self.request('GET', url, headers)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
@@ -1,13 +1,18 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, filedialog
 import subprocess
-import re
 import os
-from git import Repo, GitCommandError
+
+import git_sync
+import tracing
+from slideshow_data import SlideshowFile
+from thumbnails import ThumbnailLoader
+from file_watch import FileWatcher
 
 # Path to the .tsx file
 FILE_PATH = r"D:\Leaderboard\page\leader_board\src\components\ImageSlideshow.tsx"
 GIT_REPO_PATH = r"D:\Leaderboard\page\leader_board"
+PREFETCH_THUMBNAILS = 30
 
 class SlideEditorApp:
     def __init__(self, root):
@@ -16,6 +21,11 @@ class SlideEditorApp:
 
         self.slides = []
         self.selected_index = None
+        self.slide_file = SlideshowFile(FILE_PATH)
+        # Unsaved edits in self.slides that a reload from disk would lose
+        self.dirty = False
+        # Set when the file changed on disk while we had unsaved edits
+        self.conflict = False
 
         # Layout: Left Listbox | Right Form
         self.left_frame = tk.Frame(root)
@@ -49,6 +59,12 @@ class SlideEditorApp:
             entry.pack()
             self.form_entries[label] = entry
 
+        # Thumbnail of the selected slide, loaded in the background
+        self.thumbs = ThumbnailLoader(root)
+        self.preview_url = None
+        self.preview = tk.Label(self.right_frame, text="No preview", relief=tk.SUNKEN)
+        self.preview.pack(pady=5)
+
         self.add_update_button = tk.Button(self.right_frame, text="Add / Update Slide", command=self.add_or_update)
         self.add_update_button.pack(pady=5)
 
@@ -58,53 +74,112 @@ class SlideEditorApp:
         self.push_button = tk.Button(self.right_frame, text="Push to GitHub", command=self.push_to_git)
         self.push_button.pack(pady=5)
 
+        self.cancel_push_button = tk.Button(self.right_frame, text="Cancel Push", command=self.cancel_push)
+        self.cancel_push_button.pack(pady=5)
+
+        # Follow changes made outside the editor (git pull, hand edits)
+        self.watcher = FileWatcher(root)
+        self.watcher.watch(FILE_PATH, self.on_file_changed)
+        root.bind('<Destroy>', self.on_destroy, add='+')
+
+    def on_destroy(self, event):
+        if event.widget is self.root:
+            self.watcher.close()
+
     def load_slides(self):
         try:
-            with open(FILE_PATH, 'r', encoding='utf-8') as f:
-                content = f.read()
             self.slides = []
             self.listbox.delete(0, tk.END)
+            self.set_dirty(False)
 
-            pattern = re.compile(r'\{[\s\n]*id:\s*(\d+),\s*url:\s*"([^"]+)",\s*title:\s*"([^"]+)",\s*description:\s*"([^"]+)"[\s\n]*\}')
-            for match in pattern.finditer(content):
-                slide = {
-                    "Index": len(self.slides),
-                    "id": int(match.group(1)),
-                    "url": match.group(2),
-                    "title": match.group(3),
-                    "description": match.group(4)
-                }
-                self.slides.append(slide)
+            # Offset-aware parser; remembers where each slide sits for saving
+            for slide in self.slide_file.read():
+                self.slides.append(self.with_defaults(slide, len(self.slides)))
                 self.listbox.insert(tk.END, f'{slide["Index"]}: {slide["title"]}')
+
+            # Warm the thumbnail cache for the first slides in the list
+            for slide in self.slides[:PREFETCH_THUMBNAILS]:
+                if slide["url"].startswith(("http://", "https://")):
+                    self.thumbs.request(slide["url"], lambda image: None)
         except Exception as e:
             messagebox.showerror("Error", str(e))
-    def push_to_git(self):
+    def with_defaults(self, slide, index):
+        for field in ("url", "title", "description"):
+            slide.setdefault(field, "")
+        slide.setdefault("id", index + 1)
+        slide["Index"] = index
+        return slide
+
+    def set_dirty(self, dirty, conflict=False):
+        self.dirty = dirty
+        self.conflict = conflict
+        title = "Slideshow Editor"
+        if conflict:
+            title += " (ImageSlideshow.tsx changed on disk)"
+        self.root.title(title)
+
+    def on_file_changed(self, path):
+        if self.slide_file.text is None:
+            return  # nothing loaded yet; Load Slides will read the new file
+        if not self.slide_file.changed_on_disk():
+            return  # our own save
+        if self.dirty:
+            if messagebox.askyesno("Slides changed on disk",
+                                   "ImageSlideshow.tsx was changed outside the editor (for example by a git pull).\n\n"
+                                   "Discard your unsaved slide edits and load the new version?"):
+                self.load_slides()
+            else:
+                # Keep ours; saving will overwrite the outside change
+                self.set_dirty(True, conflict=True)
+            return
         try:
-            repo = Repo(GIT_REPO_PATH)
-            origin = repo.remote(name='origin')
-
-            # Stash local changes if any
-            if repo.is_dirty(untracked_files=True):
-                repo.git.stash('save', 'Auto-stash before pull')
-
-            # Pull with rebase
-            origin.pull(rebase=True)
-
-            # Apply stashed changes back (if any)
-            stashes = repo.git.stash('list')
-            if stashes:
-                repo.git.stash('pop')
-
-            # Stage, commit, and push
-            repo.git.add(update=True)
-            repo.index.commit("Update leaderboard data")
-            origin.push()
-
-            messagebox.showinfo("Git", "Changes pulled, committed, and pushed to GitHub.")
-        except GitCommandError as git_err:
-            messagebox.showerror("Git Error", f"Git command failed:\n{git_err}")
+            with tracing.span("reload_slideshow") as fields:
+                result = self.slide_file.reload()
+                fields['rows'] = 0 if result is None else len(result[2])
         except Exception as e:
-            messagebox.showerror("Git Error", str(e))
+            print(f"Could not reload {path}: {e}")
+            return
+        if result is None:
+            return
+        first, stop, changed = result
+        self.slides[first:stop] = changed
+        if len(changed) == stop - first:
+            # Same number of slides: only the changed rows need redrawing
+            last = stop
+            if stop > first:
+                self.listbox.delete(first, stop - 1)
+        else:
+            # Later slides moved, so their "i: title" labels change too
+            last = len(self.slides)
+            self.listbox.delete(first, tk.END)
+        for i in range(first, last):
+            slide = self.with_defaults(self.slides[i], i)
+            self.listbox.insert(i, f'{i}: {slide["title"]}')
+
+    def push_to_git(self):
+        # Runs on the background sync worker so the window stays responsive
+        worker = git_sync.default_worker_for(GIT_REPO_PATH, self.root)
+        worker.request_push("Update leaderboard data", self.on_push_progress, self.on_push_done)
+
+    def cancel_push(self):
+        git_sync.default_worker_for(GIT_REPO_PATH, self.root).cancel()
+
+    def on_push_progress(self, label):
+        self.push_button.config(text=f"{label}...")
+
+    def on_push_done(self, error, timings):
+        self.push_button.config(text="Push to GitHub")
+        if error is None and not git_sync.session_for(GIT_REPO_PATH).last_pushed:
+            messagebox.showinfo("Git", git_sync.format_nothing_pushed(git_sync.session_for(GIT_REPO_PATH)))
+        elif error is None:
+            messagebox.showinfo("Git", "Changes pulled, committed, and pushed to GitHub.\n\n"
+                                + git_sync.format_timings(timings))
+        elif isinstance(error, git_sync.GitSyncCancelled):
+            messagebox.showinfo("Git", "Push cancelled.")
+        elif isinstance(error, git_sync.GitSyncError):
+            messagebox.showerror("Git Error", f"Git command failed:\n{error}")
+        else:
+            messagebox.showerror("Git Error", str(error))
 
     def on_select(self, event):
         try:
@@ -119,9 +194,27 @@ class SlideEditorApp:
             self.form_entries["Title"].insert(0, slide["title"])
             self.form_entries["Description"].delete(0, tk.END)
             self.form_entries["Description"].insert(0, slide["description"])
+            self.show_preview(slide["url"])
         except IndexError:
             pass
 
+    def show_preview(self, url):
+        self.preview_url = url
+        self.preview.config(image="", text="Loading preview...")
+        if url.startswith("http://") or url.startswith("https://"):
+            self.thumbs.request(url, lambda image: self.on_preview(url, image))
+        else:
+            self.preview.config(text="No preview")
+
+    def on_preview(self, url, image):
+        if url != self.preview_url:
+            return  # selection moved on while this one loaded
+        if image is None:
+            self.preview.config(image="", text="Preview unavailable")
+        else:
+            self.preview.config(image=image, text="")
+            self.preview.image = image
+
     def add_or_update(self):
         try:
             idx = int(self.form_entries["Index"].get())
@@ -134,6 +227,7 @@ class SlideEditorApp:
             else:
                 self.slides.append({"Index": idx, "id": idx + 1, "url": url, "title": title, "description": desc})
             self.refresh_list()
+            self.set_dirty(True, self.conflict)
         except ValueError:
             messagebox.showerror("Invalid Input", "Index must be a number.")
 
@@ -142,18 +236,21 @@ class SlideEditorApp:
         if i is not None and i > 0:
             self.slides[i], self.slides[i - 1] = self.slides[i - 1], self.slides[i]
             self.refresh_list()
+            self.set_dirty(True, self.conflict)
 
     def move_down(self):
         i = self.selected_index
         if i is not None and i < len(self.slides) - 1:
             self.slides[i], self.slides[i + 1] = self.slides[i + 1], self.slides[i]
             self.refresh_list()
+            self.set_dirty(True, self.conflict)
 
     def remove_slide(self):
         i = self.selected_index
         if i is not None:
             del self.slides[i]
             self.refresh_list()
+            self.set_dirty(True, self.conflict)
 
     def refresh_list(self):
         self.slides.sort(key=lambda s: s["Index"])
@@ -165,36 +262,23 @@ class SlideEditorApp:
 
     def update_tsx(self):
         try:
-            with open(FILE_PATH, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            new_array = "const slideshowImages: SlideshowImage[] = [\n"
-            for slide in self.slides:
-                new_array += f'''  {{
-    id: {slide["id"]},
-    url: "{slide["url"]}",
-    title: "{slide["title"]}",
-    description: "{slide["description"]}"
-  }},\n'''
-            new_array += "];"
-
-            updated_content = re.sub(
-                r'const slideshowImages: SlideshowImage\[\] = \[[\s\S]*?\];',
-                new_array,
-                content
-            )
-
-            with open(FILE_PATH, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+            # Only slides that changed are rewritten in the file
+            with tracing.span("write_slideshow", rows=len(self.slides)) as fields:
+                written = fields['written'] = self.slide_file.write(self.slides)
+            if written:
+                git_sync.session_for(GIT_REPO_PATH).mark_changed(FILE_PATH)
+            self.set_dirty(False)
 
             messagebox.showinfo("Success", ".tsx file updated successfully.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    
+
+def open_window(master):
+    return SlideEditorApp(master)
 
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = SlideEditorApp(root)
+    app = open_window(root)
     root.mainloop()
@@ -1,35 +1,107 @@
+import time
+START = time.perf_counter()
+
+import multiprocessing
 import tkinter as tk
-import subprocess
-import os
+from tkinter import messagebox
+
+import tracing
+
+# All tools run inside this one process as Toplevel windows. Each tool module
+# is imported only the first time its window is opened, so starting the
+# launcher costs one interpreter and one Tk, not three. The imports stay
+# inside the loader functions (rather than importlib strings) so PyInstaller
+# still bundles the modules.
+
+def load_contestant_manager():
+    import contestant_manage
+    return contestant_manage
+
+def load_image_form():
+    import image_form
+    return image_form
+
+def load_repository_restore():
+    import repository_restore
+    return repository_restore
+
+def load_timings():
+    return tracing
+
+open_windows = {}
 
-# Paths to your .exe files
-contestant_exe = os.path.abspath("dist/contestant_manage.exe")
-image_form_exe = os.path.abspath("dist/image_form.exe")
-repository_restore_exe = os.path.abspath("dist/repository_restore.exe")
+def open_tool(title, loader):
+    win = open_windows.get(title)
+    if win is not None and win.winfo_exists():
+        win.deiconify()
+        win.lift()
+        return
+
+    start = time.perf_counter()
+    try:
+        module = loader()
+    except (Exception, SystemExit) as e:
+        # A tool that fails to import (or exits) must not take the launcher down
+        messagebox.showerror("Error", f"Could not load {title}:\n{e}")
+        return
+    win = tk.Toplevel(root)
+    try:
+        module.open_window(win)
+    except Exception as e:
+        win.destroy()
+        messagebox.showerror("Error", f"Could not open {title}:\n{e}")
+        return
+    open_windows[title] = win
+    status.config(text=f"{title} opened in {(time.perf_counter() - start) * 1000:.0f} ms")
 
 def open_contestant_manager():
-    subprocess.Popen(contestant_exe)
+    open_tool("Contestant Management", load_contestant_manager)
 
 def open_image_form():
-    subprocess.Popen(image_form_exe)
+    open_tool("Event & News Update", load_image_form)
 
 def repository_restore_form():
-    subprocess.Popen(repository_restore_exe)
+    open_tool("Restore Repository", load_repository_restore)
+
+def timings_form():
+    open_tool("Timings", load_timings)
+
+def report_cold_start():
+    elapsed = (time.perf_counter() - START) * 1000
+    print(f"Cold start to first window: {elapsed:.0f} ms")
+    tracing.record("cold_start", elapsed / 1000)
+    status.config(text=f"Started in {elapsed:.0f} ms")
+
+if __name__ == "__main__":
+    # Tools use process pools; needed once frozen by PyInstaller
+    multiprocessing.freeze_support()
+    if tracing.profiling_requested():
+        # cProfile for the whole session, dumped on exit (see tracing.py)
+        print(f"Profiling to {tracing.start_profiling()}")
+
+    # Create the main window
+    root = tk.Tk()
+    root.title("Admin Control Panel")
+    root.geometry("300x290")
+
+    # Buttons
+    btn1 = tk.Button(root, text="Contestant Management", command=open_contestant_manager, width=25, height=2)
+    btn1.pack(pady=10)
+
+    btn2 = tk.Button(root, text="Event & News Update", command=open_image_form, width=25, height=2)
+    btn2.pack(pady=10)
 
-# Create the main window
-root = tk.Tk()
-root.title("Admin Control Panel")
-root.geometry("300x200")
+    btn3 = tk.Button(root, text="Restore Repository", command=repository_restore_form, width=25, height=2)
+    btn3.pack(pady=10)
 
-# Buttons
-btn1 = tk.Button(root, text="Contestant Management", command=open_contestant_manager, width=25, height=2)
-btn1.pack(pady=10)
+    btn4 = tk.Button(root, text="Timings", command=timings_form, width=25)
+    btn4.pack(pady=(0, 10))
 
-btn2 = tk.Button(root, text="Event & News Update", command=open_image_form, width=25, height=2)
-btn2.pack(pady=10)
+    status = tk.Label(root, text="", fg="gray")
+    status.pack()
 
-btn3 = tk.Button(root, text="Restore Repository", command=repository_restore_form, width=25, height=2)
-btn3.pack(pady=10)
+    # Runs once the window has been drawn and the event loop is idle
+    root.after_idle(report_cold_start)
 
-# Run the GUI
-root.mainloop()
+    # Run the GUI
+    root.mainloop()
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import re
+import threading
+
+from leaderboard_data import atomic_write, format_contestant, row_key
+from pic_validation import IMPORT_RE, imported_names
+
+# Optional second output for the site: the board split into fixed-size page
+# modules plus a small index, so the frontend can load the top rows first and
+# the rest on demand (each chunk is a dynamic import() and gets its own
+# bundle). Enabled with CHUNK_DIR (and optionally CHUNK_SIZE) in
+# config_form.json; leaderboard-data.ts is still written and stays the file
+# the editor reads.
+#
+#   index.ts        TOTAL_COUNT, CHUNK_SIZE, CHUNKS (start/end/hash/load) and
+#                   loadRows(count)
+#   chunk-0000.ts   `export default` rows 1..CHUNK_SIZE, with the image
+#                   imports those rows use
+#
+# Only chunks whose text changed are written. A chunk is re-rendered only
+# when its rows differ from the last write; each chunk's hash is kept in the
+# index, so a fresh session doesn't rewrite unchanged ones either. Chunks are
+# by position, so an edit that moves a contestant touches the chunks between
+# its old and new place (and every chunk after an insert or delete).
+#
+# Chunks are TS rather than JSON because import-type profile pictures are
+# module bindings, which JSON can't carry.
+
+DEFAULT_CHUNK_SIZE = 100
+INDEX_NAME = 'index.ts'
+CHUNK_NAME = 'chunk-{:04d}'
+CHUNK_FILE_RE = re.compile(r"chunk-(\d{4,})\.ts$")
+INDEX_ENTRY_RE = re.compile(r"hash:\s*'([0-9a-f]+)'")
+HEADER = "// Generated by the leaderboard editor from leaderboard-data.ts. Do not edit.\n"
+
+
+def _hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def relocate_import(line, source_dir, out_dir):
+    """Rewrite a relative import specifier written for source_dir so it works from out_dir."""
+    m = IMPORT_RE.match(line)
+    if not m or not m.group('src').startswith('.'):
+        return line
+    target = os.path.normpath(os.path.join(source_dir, m.group('src')))
+    src = os.path.relpath(target, out_dir).replace(os.sep, '/')
+    if not src.startswith('.'):
+        src = './' + src
+    return line[:m.start('src')] + src + line[m.end('src'):]
+
+
+def render_chunk(rows, import_lines):
+    """One chunk module. import_lines is a list of (line, names it binds)."""
+    used = {c.profilePic for c in rows if c.picType == 'import'}
+    parts = [HEADER]
+    parts += [line + "\n" for line, names in import_lines if names & used]
+    parts.append("\nconst rows = [\n")
+    parts += [f"  {format_contestant(c)},\n" for c in rows]
+    parts.append("];\n\nexport default rows;\n")
+    return "".join(parts)
+
+
+def render_index(total, chunk_size, hashes):
+    parts = [HEADER,
+             f"export const TOTAL_COUNT = {total};\n",
+             f"export const CHUNK_SIZE = {chunk_size};\n\n",
+             "export const CHUNKS = [\n"]
+    for i, chunk_hash in enumerate(hashes):
+        start = i * chunk_size
+        end = min(start + chunk_size, total)
+        parts.append(f"  {{ start: {start}, end: {end}, hash: '{chunk_hash}', "
+                     f"load: () => import('./{CHUNK_NAME.format(i)}') }},\n")
+    parts.append("];\n\n"
+                 "// The first `count` rows, loading only the chunks they fall in\n"
+                 "export async function loadRows(count = TOTAL_COUNT) {\n"
+                 "  const chunks = CHUNKS.filter((chunk) => chunk.start < count);\n"
+                 "  const parts = await Promise.all(chunks.map((chunk) => chunk.load()));\n"
+                 "  return parts.flatMap((part) => part.default).slice(0, count);\n"
+                 "}\n")
+    return "".join(parts)
+
+
+class ChunkWriter:
+    """Writes the board into out_dir as page chunks; source_dir is where leaderboard-data.ts lives."""
+
+    def __init__(self, out_dir, source_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+        if chunk_size <= 0:
+            raise ValueError("CHUNK_SIZE must be positive")
+        self.out_dir = out_dir
+        self.source_dir = source_dir
+        self.chunk_size = chunk_size
+        self._index_text = None
+        self._hashes = None
+        self._keys = []        # per chunk, the row keys of the last write
+        self._imports = None
+        # write() runs on the Tk thread and, after a merged pull, on the git worker
+        self._lock = threading.Lock()
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.out_dir, INDEX_NAME), 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return '', []
+        return text, INDEX_ENTRY_RE.findall(text)
+
+    def _stale_chunks(self, count):
+        try:
+            names = os.listdir(self.out_dir)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.out_dir, name) for name in names
+                if (m := CHUNK_FILE_RE.match(name)) and int(m.group(1)) >= count]
+
+    def write(self, imports, contestants):
+        """
+        Bring out_dir in line with the ranked contestants. Returns the paths
+        written or removed, for staging.
+        """
+        with self._lock:
+            return self._write(imports, contestants)
+
+    def _write(self, imports, contestants):
+        if self._hashes is None:
+            self._index_text, self._hashes = self._read_index()
+        os.makedirs(self.out_dir, exist_ok=True)
+        imports = list(imports)
+        if imports != self._imports:
+            # Different imports can change any chunk
+            self._keys = []
+        import_lines = [(relocate_import(line, self.source_dir, self.out_dir), set(imported_names([line])))
+                        for line in imports]
+
+        size = self.chunk_size
+        count = (len(contestants) + size - 1) // size
+        changed = []
+        hashes = []
+        keys = []
+        for i in range(count):
+            rows = contestants[i * size:(i + 1) * size]
+            row_keys = [row_key(c) for c in rows]
+            keys.append(row_keys)
+            if i < len(self._keys) and self._keys[i] == row_keys and i < len(self._hashes):
+                hashes.append(self._hashes[i])
+                continue
+            text = render_chunk(rows, import_lines)
+            chunk_hash = _hash(text)
+            path = os.path.join(self.out_dir, CHUNK_NAME.format(i) + '.ts')
+            if i >= len(self._hashes) or self._hashes[i] != chunk_hash or not os.path.exists(path):
+                atomic_write(path, text)
+                changed.append(path)
+            hashes.append(chunk_hash)
+
+        for path in self._stale_chunks(count):
+            os.remove(path)
+            changed.append(path)
+
+        index_text = render_index(len(contestants), size, hashes)
+        if index_text != self._index_text:
+            path = os.path.join(self.out_dir, INDEX_NAME)
+            atomic_write(path, index_text)
+            changed.append(path)
+
+        self._index_text = index_text
+        self._hashes = hashes
+        self._keys = keys
+        self._imports = imports
+        return changed
@@ -0,0 +1,644 @@
+import json
+import marshal
+import os
+import re
+import stat
+import sys
+import tempfile
+from array import array
+from itertools import starmap
+
+from contestant_record import Contestant
+
+# Headless reader for leaderboard-data.ts. Nothing in here touches Tk so it can
+# be imported from scripts and benchmarks as well as from the editor.
+#
+# The array is read in one forward pass: one regex match per record in the
+# normal case, no per-character Python loop and no string concatenation.
+# Target throughput is at least 100k rows/second.
+
+# Start of the array literal, with or without a type annotation
+ARRAY_START_RE = re.compile(r"export\s+const\s+leaderboardData\b[^=\n]*=\s*\[")
+
+_STRING = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"|\'[^\'\\\n]*(?:\\.[^\'\\\n]*)*\''
+
+_KEY = r"[A-Za-z_$][\w$]*|" + _STRING
+_SKIP = r"(?:\s+|//[^\n]*|/\*.*?\*/)*"
+
+# One token per array element: a whole `{ ... }` object literal (plus its
+# trailing comma) or the closing `]`. Strings are matched as units so braces
+# and escaped quotes inside them don't end the object early.
+RECORD_RE = re.compile(
+    _SKIP + r"(?:(?P<open>\{)(?P<body>[^{}\"'/]*(?:(?:" + _STRING + r"|//[^\n]*|/\*.*?\*/|/)[^{}\"'/]*)*)"
+    r"\}\s*,?|(?P<end>\]))",
+    re.S,
+)
+
+# The layout write_leaderboard emits. Records in this shape are decoded with a
+# single match; anything else goes through RECORD_RE + PAIR_RE.
+CANONICAL_RE = re.compile(
+    r'\s*\{\s*rank:\s*(\d+),\s*name:\s*"([^"\\\n]*)",\s*hours:\s*(\d+),\s*money:\s*(\d+),'
+    r'\s*profilePic:\s*(?:"([^"\\\n]*)"|([A-Za-z_$][\w$]*))\s*,?\s*\}\s*,?'
+)
+
+# `key: value` pairs inside an object body
+PAIR_RE = re.compile(r"(" + _KEY + r")\s*:\s*(" + _STRING + r"|[^\s,}]+)")
+
+_ESCAPE_RE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.S)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+INT_FIELDS = ('rank', 'hours', 'money')
+
+
+def _unescape_match(m):
+    esc = m.group(1)
+    if esc[0] in 'ux' and len(esc) > 1:
+        return chr(int(esc[1:], 16))
+    return _ESCAPES.get(esc, esc)
+
+
+def unquote(literal):
+    """Turn a JS string literal into its Python value."""
+    body = literal[1:-1]
+    if '\\' not in body:
+        return body
+    return _ESCAPE_RE.sub(_unescape_match, body)
+
+
+def quote(value):
+    """Render a Python string as a double-quoted JS string literal."""
+    value = value.replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + value.replace('\n', '\\n').replace('\r', '\\r') + '"'
+
+
+def _field(contestant, key, raw):
+    """Store one parsed `key: raw` pair on the contestant dict."""
+    if key[0] in '"\'':
+        key = unquote(key)
+    if key == 'profilePic':
+        if raw[0] in '"\'':
+            contestant['profilePic'] = unquote(raw)
+            contestant['picType'] = 'url'
+        else:
+            contestant['profilePic'] = raw
+            contestant['picType'] = 'import'
+    elif key in INT_FIELDS:
+        try:
+            contestant[key] = int(raw)
+        except ValueError:
+            contestant[key] = int(float(raw))
+    elif key == 'name' and raw[0] in '"\'':
+        contestant[key] = unquote(raw)
+    else:
+        # Other fields keep their source text, so a re-rendered row writes
+        # them back exactly
+        contestant[key] = raw
+
+
+_COMMENT_RE = re.compile(r"(" + _STRING + r")|//[^\n]*|/\*.*?\*/", re.S)
+
+
+def strip_comments(body):
+    """Drop // and /* */ comments from an object body, leaving strings alone."""
+    if '/' in body and ('//' in body or '/*' in body):
+        return _COMMENT_RE.sub(lambda m: m.group(1) or "", body)
+    return body
+
+
+def parse_body(body):
+    """Turn the text between `{` and `}` into a Contestant."""
+    body = strip_comments(body)
+    pairs = PAIR_RE.findall(body)
+    fields = dict(pairs)
+    contestant = {}
+    if len(fields) != len(pairs) or any(k[0] in '"\'' for k in fields):
+        for key, raw in pairs:
+            _field(contestant, key, raw)
+        return Contestant.from_mapping(contestant)
+    # Fast path for the plain `{ rank: 1, name: "...", ... }` layout
+    for key, raw in fields.items():
+        if key in INT_FIELDS and raw.isdigit():
+            contestant[key] = int(raw)
+        elif key == 'name' and raw[0] == '"' and '\\' not in raw:
+            contestant[key] = raw[1:-1]
+        else:
+            _field(contestant, key, raw)
+    return Contestant.from_mapping(contestant)
+
+
+# Records with a nested object or array value (`socials: { ... }`) don't fit
+# RECORD_RE. They are matched by counting brackets instead, and each nested
+# value is kept as opaque text.
+_BRACKET_RE = re.compile(_STRING + r"|//[^\n]*|/\*.*?\*/|[{}\[\]]", re.S)
+_NESTED_KEY_RE = re.compile(_SKIP + r"(" + _KEY + r")\s*:\s*", re.S)
+_NESTED_VALUE_RE = re.compile(_STRING + r"|[^\s,}]+")
+_NESTED_SEP_RE = re.compile(_SKIP + r",?", re.S)
+
+
+def _bracket_end(text, pos):
+    """Offset just past the bracket closing the one at text[pos]."""
+    depth = 0
+    for m in _BRACKET_RE.finditer(text, pos):
+        token = m.group()
+        if token in '{[':
+            depth += 1
+        elif token in '}]':
+            depth -= 1
+            if depth == 0:
+                return m.end()
+    raise ValueError(f"Unclosed bracket in leaderboardData at offset {pos}")
+
+
+def parse_nested_body(body):
+    """Like parse_body, for a body with nested object or array values."""
+    body = strip_comments(body)
+    contestant = {}
+    pos = 0
+    while True:
+        m = _NESTED_KEY_RE.match(body, pos)
+        if m is None:
+            break
+        start = m.end()
+        if start < len(body) and body[start] in '{[':
+            end = _bracket_end(body, start)
+        else:
+            value = _NESTED_VALUE_RE.match(body, start)
+            if value is None:
+                break
+            end = value.end()
+        _field(contestant, m.group(1), body[start:end])
+        pos = _NESTED_SEP_RE.match(body, end).end()
+    return Contestant.from_mapping(contestant)
+
+
+def find_array(text):
+    """Return the offset just past the opening `[` of leaderboardData, or -1."""
+    m = ARRAY_START_RE.search(text)
+    return m.end() if m else -1
+
+
+def iter_records(text, pos):
+    """
+    Yield (start, end, contestant) for every object in the array starting at pos.
+
+    start/end are character offsets of the `{ ... }` literal in text. Parsing
+    stops at the closing `]` of the array.
+    """
+    canonical = CANONICAL_RE.match
+    match = RECORD_RE.match
+    while True:
+        m = canonical(text, pos)
+        if m is not None:
+            rank, name, hours, money, url, ident = m.groups()
+            if url is None:
+                # Import identifiers repeat across rows; keep one copy of each
+                contestant = Contestant(int(rank), name, int(hours), int(money), sys.intern(ident), 'import')
+            else:
+                contestant = Contestant(int(rank), name, int(hours), int(money), url, 'url')
+            yield text.index('{', pos), text.rindex('}', pos, m.end()) + 1, contestant
+            pos = m.end()
+            continue
+        m = match(text, pos)
+        if m is None:
+            start = _NESTED_SEP_RE.match(text, pos).end()
+            if not text.startswith('{', start):
+                raise ValueError(f"Unexpected text in leaderboardData at offset {pos}")
+            end = _bracket_end(text, start)
+            yield start, end, parse_nested_body(text[start + 1:end - 1])
+            pos = _NESTED_SEP_RE.match(text, end).end()
+            continue
+        if m.group('end'):
+            return
+        yield m.start('open'), m.end('body') + 1, parse_body(m.group('body'))
+        pos = m.end()
+
+
+def iter_contestants(text):
+    """Yield the Contestants in the text of leaderboard-data.ts in one pass."""
+    pos = find_array(text)
+    if pos < 0:
+        return
+    for _start, _end, contestant in iter_records(text, pos):
+        yield contestant
+
+
+def parse_imports(text):
+    """Collect the `import ...` lines that precede the array."""
+    pos = find_array(text)
+    header = text if pos < 0 else text[:pos]
+    return [line.rstrip() for line in header.splitlines() if line.lstrip().startswith("import ")]
+
+
+def parse_leaderboard(text):
+    """Parse file contents into the (imports, contestants) pair used by the editor."""
+    return parse_imports(text), list(iter_contestants(text))
+
+
+def read_leaderboard(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return parse_leaderboard(text)
+
+
+def parse_contestant(obj_str):
+    """Parse a single "{...}" object literal into a Contestant."""
+    obj_str = obj_str.strip()
+    for _start, _end, contestant in iter_records(obj_str + "]", 0):
+        return contestant
+    return Contestant()
+
+
+# --- Writing ---
+
+def row_key(c):
+    """The fields write_leaderboard emits, used to tell whether a row changed."""
+    if type(c) is Contestant:
+        return (c.rank, c.name, c.hours, c.money, c.profilePic, c.picType)
+    return (c.get('rank'), c.get('name'), c.get('hours'), c.get('money'), c.get('profilePic'), c.get('picType'))
+
+
+_IDENT_RE = re.compile(r"[A-Za-z_$][\w$]*\Z")
+
+
+def format_contestant(c):
+    """
+    Render one contestant as the `{ ... }` object literal (no indent or
+    comma). profilePic is left out when there is none; other fields follow
+    the standard ones, as the source text they were read as.
+    """
+    c = Contestant.from_mapping(c)
+    text = f"{{ rank: {c.rank}, name: {quote(c.name)}, hours: {c.hours}, money: {c.money}"
+    if c.profilePic is not None:
+        text += f", profilePic: {quote(c.profilePic) if c.picType == 'url' else c.profilePic}"
+    for key, value in (c.extra or {}).items():
+        key = key if _IDENT_RE.match(key) else quote(key)
+        text += f", {key}: {value if isinstance(value, str) else json.dumps(value)}"
+    return text + " }"
+
+
+def render_leaderboard(imports, contestants, newline='\n'):
+    """Render a whole leaderboard-data.ts from scratch."""
+    parts = [imp_line + newline for imp_line in imports]
+    parts.append(f"{newline}export const leaderboardData = [{newline}")
+    for c in contestants:
+        parts.append(f"  {format_contestant(c)},{newline}")
+    parts.append(f"];{newline}")
+    return "".join(parts)
+
+
+# Read once: os.umask() can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(path, text):
+    """Write text to path via a temp file in the same folder and an atomic rename."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the target's mode (or the usual default)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def splice_records(old, old_spans, old_keys, items, key, render, default_sep):
+    """
+    Rebuild an array literal in old text around new items.
+
+    Item i keeps the original text of old record i when key(item) equals
+    old_keys[i]; otherwise it is rendered. Separators between records and
+    the text before the first and after the last record are copied. Needs at
+    least one old record and one item. Returns (text, spans).
+    """
+    first_start = old_spans[0][0]
+    parts = [old[:first_start]]
+    length = first_start
+    spans = []
+    for i, item in enumerate(items):
+        if i:
+            if i < len(old_spans):
+                sep = old[old_spans[i - 1][1]:old_spans[i][0]]
+            else:
+                sep = default_sep
+            parts.append(sep)
+            length += len(sep)
+        if i < len(old_spans) and key(item) == old_keys[i]:
+            start, end = old_spans[i]
+            row = old[start:end]
+        else:
+            row = render(item)
+        parts.append(row)
+        spans.append((length, length + len(row)))
+        length += len(row)
+    parts.append(old[old_spans[-1][1]:])
+    return "".join(parts), spans
+
+
+def _common_prefix(a, b, limit, block=1 << 16):
+    # Compare whole blocks first (C speed), then narrow down inside the block
+    i = 0
+    while i < limit:
+        j = min(i + block, limit)
+        if a[i:j] != b[i:j]:
+            while j - i > 1:
+                mid = (i + j) // 2
+                if a[i:mid] == b[i:mid]:
+                    i = mid
+                else:
+                    j = mid
+            return i
+        i = j
+    return limit
+
+
+def _common_suffix(a, b, limit, block=1 << 16):
+    la, lb = len(a), len(b)
+    i = 0
+    while i < limit:
+        j = min(i + block, limit)
+        if a[la - j:la - i] != b[lb - j:lb - i]:
+            while j - i > 1:
+                mid = (i + j) // 2
+                if a[la - mid:la - i] == b[lb - mid:lb - i]:
+                    i = mid
+                else:
+                    j = mid
+            return i
+        i = j
+    return limit
+
+
+def reparse_changed(old, new, old_spans, old_open, new_open, iter_from):
+    """
+    Parse only the part of new that differs from old.
+
+    old_spans are the record spans of old, old_open/new_open the offsets
+    just past each array's `[`, and iter_from(text, pos) yields (start, end,
+    item) for the records from pos to the closing `]`. Records lying wholly
+    inside the common prefix or suffix of the two texts are kept.
+
+    Returns (first, stop, records, delta): old records first..stop-1 are
+    replaced by records (new (start, end, item) triples), and the old
+    records from stop on are unchanged but sit delta characters later.
+    """
+    limit = min(len(old), len(new))
+    prefix = _common_prefix(old, new, limit)
+    suffix = _common_suffix(old, new, limit - prefix)
+    delta = len(new) - len(old)
+
+    # The last record in the prefix is parsed again: iteration has to start
+    # at a record's `{`, and its trailing comma may be what changed.
+    first = 0
+    if old_open == new_open and old_open <= prefix:
+        while first < len(old_spans) and old_spans[first][1] < prefix:
+            first += 1
+        first = max(0, first - 1)
+    start_pos = old_spans[first][0] if first < len(old_spans) and first else new_open
+
+    # Old records that survive untouched at the end
+    stop = len(old_spans)
+    tail_start = len(old) - suffix
+    while stop > first and old_spans[stop - 1][0] >= tail_start:
+        stop -= 1
+
+    records = []
+    resume = stop
+    if new_open >= 0:
+        for start, end, item in iter_from(new, start_pos):
+            # Back in step with an unchanged record: the rest is known
+            while resume < len(old_spans) and old_spans[resume][0] + delta < start:
+                resume += 1
+            if resume < len(old_spans) and old_spans[resume][0] + delta == start:
+                break
+            records.append((start, end, item))
+        else:
+            resume = len(old_spans)
+    else:
+        resume = len(old_spans)
+    return first, resume, records, delta
+
+
+class LeaderboardFile:
+    """
+    leaderboard-data.ts plus what we learned about it on the last parse.
+
+    The text and the span of every record are kept so write() can splice in
+    only the rows whose rank or fields changed. Everything else, including
+    formatting we would not have produced ourselves, is copied through as is.
+
+    With a ParseCache (see parse_cache.py) an unchanged file is loaded from
+    the cache instead of parsed. The cache holds each row's key tuple once;
+    the Contestants are rebuilt from it. Record spans are only needed to
+    write, so on a cache hit they are decoded on the first render().
+    """
+
+    def __init__(self, path, cache=None):
+        self.path = path
+        self.cache = cache
+        self.text = None
+        self.imports = None
+        self.array_open = -1
+        self.spans = []
+        self.keys = []
+        self.stat = None
+        self.from_cache = False
+        self._index_blob = None
+
+    def _load_text(self, text, stat):
+        self.text = text
+        self.stat = stat
+        self.from_cache = False
+        self._index_blob = None
+        self.imports = parse_imports(text)
+        self.array_open = find_array(text)
+        self.spans = []
+        self.keys = []
+        contestants = []
+        if self.array_open >= 0:
+            for start, end, contestant in iter_records(text, self.array_open):
+                self.spans.append((start, end))
+                self.keys.append(row_key(contestant))
+                contestants.append(contestant)
+        return contestants
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self):
+        """Parse the file (or load it from the cache) and return (imports, contestants)."""
+        stat = self._stat()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        text = data.decode('utf-8')
+        if self.cache is None:
+            contestants = self._load_text(text, stat)
+            return list(self.imports), contestants
+        fingerprint = self.cache.fingerprint(self.path, stat, data)
+        contestants = self._load_cached(text, stat, fingerprint)
+        if contestants is None:
+            contestants = self._load_text(text, stat)
+            self._save_cache(fingerprint, contestants)
+        return list(self.imports), contestants
+
+    def load(self, text):
+        """Use text (e.g. a version from git) as the file's contents; returns (imports, contestants)."""
+        contestants = self._load_text(text, None)
+        return list(self.imports), contestants
+
+    def _load_cached(self, text, stat, fingerprint):
+        sections = self.cache.load(self.path, fingerprint)
+        if sections is None:
+            return None
+        try:
+            imports, array_open, keys, extras = marshal.loads(sections[0])
+        except (ValueError, EOFError, TypeError):
+            return None
+        contestants = list(starmap(Contestant, keys))
+        for i, extra in extras.items():
+            contestants[i].extra = extra
+        self.text = text
+        self.stat = stat
+        self.imports = imports
+        self.array_open = array_open
+        self.keys = keys
+        self.spans = None
+        self._index_blob = bytes(sections[1])
+        self.from_cache = True
+        return contestants
+
+    def _save_cache(self, fingerprint, contestants):
+        offsets = array('q')
+        for start, end in self.spans:
+            offsets.append(start)
+            offsets.append(end)
+        # Fields beyond the standard six only come from hand-edited rows
+        extras = {i: dict(c.extra) for i, c in enumerate(contestants) if getattr(c, 'extra', None)}
+        self.cache.save(self.path, fingerprint, [
+            marshal.dumps((self.imports, self.array_open, self.keys, extras)),
+            offsets.tobytes(),
+        ])
+
+    def _ensure_index(self):
+        if self._index_blob is None:
+            return
+        offsets = array('q')
+        offsets.frombytes(self._index_blob)
+        it = iter(offsets)
+        self.spans = list(zip(it, it))
+        self._index_blob = None
+
+    def changed_on_disk(self):
+        return self.text is not None and self._stat() != self.stat
+
+    def reload(self):
+        """
+        Pick up a change made outside the editor (git pull, another editor).
+
+        Only the records between the unchanged start and end of the file are
+        parsed again. Returns None when the file is as we last read or wrote
+        it, otherwise (imports, changes) where changes has 'added' and
+        'changed' (contestant dicts) and 'removed' (names), compared by name.
+        Rank-only differences are not reported.
+        """
+        if self.text is None:
+            raise ValueError("reload() before read()")
+        stat = self._stat()
+        if stat == self.stat:
+            return None
+        self._ensure_index()
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        new_open = find_array(text)
+        first, stop, records, delta = reparse_changed(
+            self.text, text, self.spans, self.array_open, new_open, iter_records)
+
+        old_rows = {key[1]: key for key in self.keys[first:stop]}
+        changes = {'added': [], 'changed': [], 'removed': []}
+        for _start, _end, contestant in records:
+            old = old_rows.pop(contestant.get('name'), None)
+            if old is None:
+                changes['added'].append(contestant)
+            elif old[2:] != row_key(contestant)[2:]:
+                changes['changed'].append(contestant)
+        changes['removed'] = list(old_rows)
+
+        self.spans = (self.spans[:first] + [(s, e) for s, e, _c in records]
+                      + [(s + delta, e + delta) for s, e in self.spans[stop:]])
+        self.keys = self.keys[:first] + [row_key(c) for _s, _e, c in records] + self.keys[stop:]
+        self.text = text
+        self.stat = stat
+        self.imports = parse_imports(text)
+        self.array_open = new_open
+        self.from_cache = False
+        return list(self.imports), changes
+
+    def _newline(self):
+        if self.text is not None and '\r\n' in self.text:
+            return '\r\n'
+        if self.text is not None:
+            return '\n'
+        return os.linesep
+
+    def render(self, imports, contestants):
+        """
+        Build the new file text. Rows that match what is on disk at the same
+        position keep their original text; returns (text, spans).
+        """
+        self._ensure_index()
+        newline = self._newline()
+        if (self.text is None or self.array_open < 0 or not self.spans or not contestants
+                or list(imports) != self.imports):
+            text = render_leaderboard(imports, contestants, newline)
+            pos = find_array(text)
+            return text, [(start, end) for start, end, _c in iter_records(text, pos)]
+
+        return splice_records(self.text, self.spans, self.keys, contestants,
+                              row_key, format_contestant, f",{newline}  ")
+
+    def write(self, imports, contestants):
+        """
+        Write imports and the already ranked contestants back to disk.
+
+        Only changed rows are re-rendered, and the file is replaced by an
+        atomic rename so a crash can't leave it truncated. Returns False when
+        the file already had exactly this content.
+        """
+        if self.text is not None and self._stat() != self.stat:
+            # Changed behind our back since the last parse: splice against
+            # what is on disk now, not what we remember.
+            self.read()
+        text, spans = self.render(imports, contestants)
+        if text == self.text:
+            return False
+        atomic_write(self.path, text)
+        self.text = text
+        self.stat = self._stat()
+        self.imports = list(imports)
+        self.array_open = find_array(text)
+        self.spans = spans
+        self.keys = [row_key(c) for c in contestants]
+        self._index_blob = None
+        if self.cache is not None:
+            # Our own write shouldn't cost the next launch a full parse
+            self._save_cache(self.cache.fingerprint(self.path, self.stat, text.encode('utf-8')), contestants)
+        return True
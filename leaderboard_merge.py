@@ -0,0 +1,136 @@
+import sys
+
+from leaderboard_data import LeaderboardFile, parse_leaderboard, row_key
+from contestant_store import ContestantStore
+
+# Three-way merge of leaderboard-data.ts by contestant name, used by
+# git_sync when origin moved while we had local edits (see
+# GitSession.register_merge). git merges the file line by line, and since
+# every edit re-ranks the board, two admins touching different contestants
+# still collide on the rank lines. Here each version is parsed and merged
+# record by record instead:
+#
+#   - a contestant changed (or added, or deleted) on one side only takes
+#     that side's version
+#   - changed on both sides the same way: that version
+#   - changed on both sides differently: ours (the editor doing the push),
+#     reported as a conflict
+#   - deleted on one side, changed on the other: the changed version is
+#     kept, reported as a conflict
+#
+# Ranks are ignored when comparing and recomputed on the merged board.
+
+
+def _fields(c):
+    # Everything but name and rank (every re-sort rewrites ranks), plus
+    # hand-added fields
+    return row_key(c)[2:] + (c.extra or None,)
+
+
+def _by_name(contestants, label):
+    rows = {}
+    for c in contestants:
+        if c.name in rows:
+            raise ValueError(f"{label} has contestant {c.name!r} more than once; can't merge by name")
+        rows[c.name] = c
+    return rows
+
+
+def merge_imports(base, ours, theirs):
+    """Keep our import lines, minus ones they removed, plus ones they added."""
+    base, theirs_set = set(base), set(theirs)
+    merged = [line for line in ours if line in theirs_set or line not in base]
+    seen = set(merged)
+    merged += [line for line in theirs if line not in base and line not in seen]
+    return merged
+
+
+def merge_contestants(base, ours, theirs):
+    """
+    Merge three contestant lists by name. Returns (merged, conflicts): the
+    merged records, re-ranked by hours, and the names both sides changed.
+    """
+    base_rows = _by_name(base, "The common version")
+    our_rows = _by_name(ours, "Our version")
+    their_rows = _by_name(theirs, "Their version")
+
+    merged = []
+    conflicts = []
+
+    def pick(name):
+        b, o, t = base_rows.get(name), our_rows.get(name), their_rows.get(name)
+        b_key = None if b is None else _fields(b)
+        o_key = None if o is None else _fields(o)
+        t_key = None if t is None else _fields(t)
+        if o_key == t_key or t_key == b_key:
+            return o
+        if o_key == b_key:
+            return t
+        conflicts.append(name)
+        # Both changed it: ours wins, but an edit beats a delete
+        return o if o is not None else t
+
+    # Upstream order first, then our additions, so ties keep a stable order
+    for name in their_rows:
+        c = pick(name)
+        if c is not None:
+            merged.append(c)
+    for name in our_rows:
+        if name not in their_rows:
+            c = pick(name)
+            if c is not None:
+                merged.append(c)
+
+    return ContestantStore(merged).records, conflicts
+
+
+def merge_texts(base, ours, theirs):
+    """
+    Merge three versions of leaderboard-data.ts. Returns (text, conflicts).
+
+    The result is our text with only the rows that differ re-rendered, so
+    formatting outside the array is kept. Raises ValueError if a version
+    can't be parsed or has duplicate names.
+    """
+    base_imports, base_rows = parse_leaderboard(base) if base else ([], [])
+    ours_file = LeaderboardFile(None)
+    our_imports, our_rows = ours_file.load(ours)
+    if ours_file.array_open < 0:
+        raise ValueError("Our version has no leaderboardData array")
+    their_imports, their_rows = parse_leaderboard(theirs)
+
+    contestants, conflicts = merge_contestants(base_rows, our_rows, their_rows)
+    imports = merge_imports(base_imports, our_imports, their_imports)
+    text, _spans = ours_file.render(imports, contestants)
+    return text, conflicts
+
+
+def main(argv):
+    """
+    Usage: python leaderboard_merge.py BASE OURS THEIRS [OUT]
+
+    Writes the merge to OUT, or over OURS, so it also works as a git merge
+    driver (`driver = python leaderboard_merge.py %O %A %B`).
+    """
+    if len(argv) not in (3, 4):
+        print(main.__doc__, file=sys.stderr)
+        return 2
+    texts = []
+    for path in argv[:3]:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            texts.append(f.read())
+    try:
+        text, conflicts = merge_texts(*texts)
+    except ValueError as e:
+        print(f"Can't merge: {e}", file=sys.stderr)
+        return 1
+    out = argv[3] if len(argv) == 4 else argv[1]
+    with open(out, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    for name in conflicts:
+        print(f"Both sides changed {name!r}; kept ours")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
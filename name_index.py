@@ -0,0 +1,164 @@
+import re
+from array import array
+
+# Search index over contestant names for the editor's filter box. A query
+# matches a name when it is a prefix of any word in it, ignoring case, so
+# "per" finds "Nimal Perera" and "nimal p" finds it too.
+#
+# Every word start in every name is one entry in a sorted array of 64-bit
+# codes (name slot << 8 | offset of the word), ordered by the lower-cased
+# name from that word on. A lookup is a binary search plus a walk over the
+# matches, well under a millisecond at a million names; an add or delete is
+# a binary search and an array insert/remove per word. No strings are kept
+# beyond the names themselves (keys are case-folded on the fly), about
+# 100 bytes per name in all.
+
+WORD_LIMIT = 255   # words starting further into a name than this aren't indexed
+DEFAULT_LIMIT = 200
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def word_starts(lowered):
+    return [m.start() for m in WORD_RE.finditer(lowered, 0, WORD_LIMIT + 1)] or [0]
+
+
+def build_entries(names):
+    """
+    The index data for names, for NameIndex.load(). Pure, so it can run on a
+    worker thread (it takes a few seconds at a million names).
+    """
+    slots = {}
+    names_by_slot = []
+    lower = []
+    codes = []
+    finditer = WORD_RE.finditer
+    for name in names:
+        if name in slots:
+            continue
+        slot = slots[name] = len(names_by_slot)
+        lowered = name.casefold()
+        names_by_slot.append(name)
+        lower.append(lowered)
+        base = slot << 8
+        starts = [base | m.start() for m in finditer(lowered, 0, WORD_LIMIT + 1)]
+        codes += starts or (base,)
+    keys = [lower[code >> 8][code & 0xFF:] for code in codes]
+    order = sorted(range(len(codes)), key=keys.__getitem__)
+    del keys, lower
+    return names_by_slot, slots, array('q', map(codes.__getitem__, order))
+
+
+class NameIndex:
+    """
+    Word-prefix index over a changing set of names. Until load() or build()
+    add/remove calls are only logged; load() replays them.
+    """
+
+    def __init__(self):
+        self.built = False
+        self._names = []       # slot -> name (None when free)
+        self._free = []
+        self._slots = {}       # name -> slot
+        self._entries = array('q')
+        self._log = []         # (added, name) while not built
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _key(self, code):
+        return self._names[code >> 8].casefold()[code & 0xFF:]
+
+    def _lower_bound(self, text):
+        entries = self._entries
+        lo, hi = 0, len(entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(entries[mid]) < text:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _new_slot(self, name):
+        if self._free:
+            slot = self._free.pop()
+            self._names[slot] = name
+        else:
+            slot = len(self._names)
+            self._names.append(name)
+        self._slots[name] = slot
+        return slot
+
+    def load(self, entries):
+        """
+        Install what build_entries() returned, then apply the adds and
+        removes made since. Each of those sets a name's presence outright,
+        so replaying ones older than the names snapshot is harmless.
+        """
+        self._names, self._slots, self._entries = entries
+        self._free = []
+        self.built = True
+        log, self._log = self._log, []
+        for added, name in log:
+            if added:
+                self.add(name)
+            else:
+                self.remove(name)
+
+    def build(self, names):
+        self.load(build_entries(names))
+
+    def add(self, name):
+        if not self.built:
+            self._log.append((True, name))
+            return
+        if name in self._slots:
+            return
+        slot = self._new_slot(name)
+        for start in word_starts(name.casefold()):
+            code = slot << 8 | start
+            self._entries.insert(self._lower_bound(self._key(code)), code)
+
+    def remove(self, name):
+        if not self.built:
+            self._log.append((False, name))
+            return
+        slot = self._slots.pop(name, None)
+        if slot is None:
+            return
+        entries = self._entries
+        for start in word_starts(name.casefold()):
+            code = slot << 8 | start
+            i = self._lower_bound(self._key(code))
+            while entries[i] != code:
+                i += 1
+            del entries[i]
+        self._names[slot] = None
+        self._free.append(slot)
+
+    def rename(self, old, new):
+        if old != new:
+            self.remove(old)
+            self.add(new)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Names with a word starting with query (case-insensitive), at most
+        limit of them. Returns (names, complete) where complete is False if
+        there were more.
+        """
+        query = query.strip().casefold()
+        entries = self._entries
+        found = {}
+        i = self._lower_bound(query)
+        while i < len(entries):
+            code = entries[i]
+            if not self._key(code).startswith(query):
+                return list(found), True
+            name = self._names[code >> 8]
+            if name not in found:
+                if len(found) == limit:
+                    return list(found), False
+                found[name] = None
+            i += 1
+        return list(found), True
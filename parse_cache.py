@@ -0,0 +1,104 @@
+import hashlib
+import marshal
+import os
+import struct
+import sys
+
+from app_paths import app_cache_dir
+
+# On-disk cache of parsed data files, so a launch doesn't re-parse a
+# leaderboard-data.ts nobody touched since the last session.
+#
+# One cache file per source path. It starts with a small header (format
+# version, Python version, and the source's fingerprint: absolute path,
+# mtime_ns, size and a BLAKE2 hash of its bytes) followed by opaque byte
+# sections the caller marshals itself. A cache entry is only used when every
+# part of the fingerprint matches, so a git pull, checkout or hand edit of the
+# file simply misses and the caller re-parses.
+#
+# marshal is used rather than pickle: it only handles plain data and loads
+# several times faster. Its format can change between Python versions, which
+# is why the interpreter version is part of the header.
+
+MAGIC = b'LBPCACHE'
+FORMAT_VERSION = 2
+_LENGTH = struct.Struct('<I')
+
+
+def default_cache_dir():
+    return app_cache_dir('parse_cache')
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def _cache_path(self, path):
+        name = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, name + '.bin')
+
+    def fingerprint(self, path, stat, data):
+        """stat is the (mtime_ns, size) pair, data the file's bytes."""
+        mtime_ns, size = stat if stat else (None, None)
+        return (os.path.abspath(path), mtime_ns, size, content_hash(data))
+
+    def _header(self, fingerprint, lengths):
+        return marshal.dumps((FORMAT_VERSION, tuple(sys.version_info[:2]), fingerprint, lengths))
+
+    def load(self, path, fingerprint):
+        """Return the list of byte sections saved for fingerprint, or None on a miss."""
+        try:
+            with open(self._cache_path(path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC):
+            return None
+        try:
+            pos = len(MAGIC)
+            (header_len,) = _LENGTH.unpack_from(data, pos)
+            pos += _LENGTH.size
+            version, python, saved, lengths = marshal.loads(data[pos:pos + header_len])
+        except (struct.error, ValueError, EOFError, TypeError):
+            return None
+        if version != FORMAT_VERSION or python != tuple(sys.version_info[:2]) or saved != fingerprint:
+            return None
+        pos += header_len
+        if pos + sum(lengths) != len(data):
+            return None  # truncated
+        view = memoryview(data)
+        sections = []
+        for length in lengths:
+            sections.append(view[pos:pos + length])
+            pos += length
+        return sections
+
+    def save(self, path, fingerprint, sections):
+        """Store byte sections under fingerprint. Best effort: I/O errors are ignored."""
+        header = self._header(fingerprint, [len(s) for s in sections])
+        target = self._cache_path(path)
+        tmp = target + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(MAGIC)
+                f.write(_LENGTH.pack(len(header)))
+                f.write(header)
+                for section in sections:
+                    f.write(section)
+            os.replace(tmp, target)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def invalidate(self, path):
+        try:
+            os.remove(self._cache_path(path))
+        except OSError:
+            pass
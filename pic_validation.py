@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app_paths import app_cache_dir
+from http_pool import HTTPPool, HTTPError
+
+# Pre-submit checks for contestant profile pictures.
+#
+# URL pictures are probed with HEAD (falling back to a one-byte ranged GET
+# for servers that refuse HEAD) on a thread pool that shares keep-alive
+# connections and caps requests per host. Results are cached per URL, on
+# disk as well, so resubmitting an unchanged board costs no requests: a
+# working URL for ttl seconds, a failing one only for failure_ttl, so one
+# timeout or 503 doesn't flag a good picture for hours. Asking for a
+# re-check bypasses the cache. Import pictures must be bound by one of the file's import lines
+# and, for relative imports, point at a file that exists.
+
+DEFAULT_TTL = 6 * 60 * 60
+FAILURE_TTL = 2 * 60
+IMPORT_RE = re.compile(r"""^\s*import\s+(?P<what>.+?)\s+from\s+(?P<q>['"])(?P<src>[^'"]+)(?P=q)""")
+ASSET_EXTENSIONS = ('', '.png', '.jpg', '.jpeg', '.webp', '.gif', '.svg', '.avif')
+
+
+def default_cache_file():
+    return app_cache_dir('url_checks.json')
+
+
+def imported_names(import_lines):
+    """Map each name bound by the import lines to its module specifier."""
+    names = {}
+    for line in import_lines:
+        m = IMPORT_RE.match(line)
+        if not m:
+            continue
+        what, src = m.group('what'), m.group('src')
+        braces = re.search(r"\{(.*)\}", what)
+        if braces:
+            for part in braces.group(1).split(','):
+                part = part.strip()
+                if part:
+                    names[part.split(' as ')[-1].strip()] = src
+            what = what[:braces.start()]
+        for part in what.split(','):
+            part = part.strip()
+            if part.startswith('* as '):
+                part = part[5:].strip()
+            if part:
+                names[part] = src
+    return names
+
+
+def resolve_import(src, base_dir):
+    """File an import specifier points at, or None if it isn't a relative path."""
+    if not src.startswith('.'):
+        return None
+    path = os.path.normpath(os.path.join(base_dir, src))
+    for ext in ASSET_EXTENSIONS:
+        if os.path.isfile(path + ext):
+            return path + ext
+    return ''
+
+
+def check_imports(contestants, import_lines, base_dir=None):
+    """Return {identifier: problem} for import-type pics that don't resolve."""
+    names = imported_names(import_lines)
+    problems = {}
+    for c in contestants:
+        if c.get('picType') != 'import' or not c.get('profilePic'):
+            continue
+        ident = c['profilePic']
+        if ident in problems:
+            continue
+        src = names.get(ident)
+        if src is None:
+            problems[ident] = "not imported in leaderboard-data.ts"
+        elif base_dir is not None and resolve_import(src, base_dir) == '':
+            problems[ident] = f"imported file {src} not found"
+    return problems
+
+
+class UrlChecker:
+    def __init__(self, pool=None, workers=16, ttl=DEFAULT_TTL, cache_file=None, failure_ttl=FAILURE_TTL):
+        self.pool = pool or HTTPPool(max_per_host=4, timeout=8)
+        self.workers = workers
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._cache = {}   # url -> [ok, detail, checked_at]
+        if cache_file:
+            try:
+                with open(cache_file, 'r') as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = self.cache_file + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self._cache, f)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+
+    def check_url(self, url):
+        """Return (ok, detail) for one URL, without the cache."""
+        try:
+            status, _headers, _body, _final = self.pool.request('HEAD', url)
+            if status in (403, 405, 501) or status >= 500:
+                # Some hosts refuse HEAD; ask for a single byte instead
+                status, _headers, _body, _final = self.pool.request('GET', url, {'Range': 'bytes=0-0'})
+        except HTTPError as e:
+            return False, str(e)
+        if 200 <= status < 300:
+            return True, f"HTTP {status}"
+        return False, f"HTTP {status}"
+
+    def check(self, urls, recheck=()):
+        """
+        Check many URLs concurrently. Returns {url: (ok, detail)}; results
+        younger than ttl (failure_ttl for failures) are answered from the
+        cache, except for URLs in recheck.
+        """
+        now = time.time()
+        recheck = set(recheck)
+        results = {}
+        todo = []
+        with self._lock:
+            for url in set(urls):
+                hit = self._cache.get(url)
+                if (hit is not None and url not in recheck
+                        and now - hit[2] < (self.ttl if hit[0] else self.failure_ttl)):
+                    results[url] = (hit[0], hit[1])
+                else:
+                    todo.append(url)
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo))) as ex:
+                for url, result in zip(todo, ex.map(self.check_url, todo)):
+                    results[url] = result
+            checked_at = time.time()
+            with self._lock:
+                for url in todo:
+                    ok, detail = results[url]
+                    self._cache[url] = [ok, detail, checked_at]
+                self._save()
+        return results
+
+
+def validate_pics(contestants, import_lines, checker, base_dir=None, recheck=()):
+    """
+    Check every profile picture on the board. Returns a list of
+    (contestant name, profilePic, problem) for the ones that look broken.
+    URLs in recheck are requested again even if cached.
+    """
+    urls = [c['profilePic'] for c in contestants
+            if c.get('picType') == 'url' and c.get('profilePic')]
+    url_results = checker.check(urls, recheck)
+    import_problems = check_imports(contestants, import_lines, base_dir)
+    problems = []
+    for c in contestants:
+        pic = c.get('profilePic')
+        if not pic:
+            continue
+        if c.get('picType') == 'url':
+            ok, detail = url_results[pic]
+            if not ok:
+                problems.append((c['name'], pic, detail))
+        elif pic in import_problems:
+            problems.append((c['name'], pic, import_problems[pic]))
+    return problems
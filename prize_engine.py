@@ -0,0 +1,80 @@
+from bisect import bisect_left
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # the column path falls back to plain Python
+    np = None
+
+# Table-driven prize calculation. The tiers come from PRIZE_TIERS in
+# config_form.json: a list of {"hours": n, "rate": r} entries applied in
+# order, where the last entry has no "hours" and covers everything above.
+DEFAULT_TIERS = [
+    {"hours": 150, "rate": 20},
+    {"hours": 150, "rate": 40},
+    {"rate": 60},
+]
+
+
+class PrizeEngine:
+    def __init__(self, tiers=DEFAULT_TIERS):
+        if not tiers:
+            raise ValueError("PRIZE_TIERS must have at least one tier")
+        # bounds[i] is the cumulative hour count where tier i ends, starts[i]
+        # where it begins and base[i] the prize already earned at starts[i].
+        self.bounds = []
+        self.starts = []
+        self.rates = []
+        self.base = []
+        start = 0
+        earned = 0
+        for i, tier in enumerate(tiers):
+            rate = tier['rate']
+            self.starts.append(start)
+            self.rates.append(rate)
+            self.base.append(earned)
+            if 'hours' not in tier or tier['hours'] is None:
+                if i != len(tiers) - 1:
+                    raise ValueError("Only the last prize tier may be open-ended")
+                break
+            span = tier['hours']
+            if span <= 0:
+                raise ValueError("Prize tier hours must be positive")
+            start += span
+            earned += span * rate
+            self.bounds.append(start)
+        else:
+            # No open-ended tier given: the last rate keeps applying
+            self.bounds.pop()
+
+        self.prize = lru_cache(maxsize=65536)(self._prize)
+
+    def tier(self, hours):
+        """Index of the tier the last of these hours falls in."""
+        return bisect_left(self.bounds, hours)
+
+    def _prize(self, hours):
+        i = bisect_left(self.bounds, hours)
+        return self.base[i] + (hours - self.starts[i]) * self.rates[i]
+
+    def prize_column(self, hours):
+        """Prizes for a whole sequence of hours at once, as a list."""
+        if np is None:
+            prize = self.prize
+            return [prize(h) for h in hours]
+        h = np.asarray(hours)
+        i = np.searchsorted(np.asarray(self.bounds), h, side='left')
+        money = np.asarray(self.base)[i] + (h - np.asarray(self.starts)[i]) * np.asarray(self.rates)[i]
+        return money.tolist()
+
+
+def load_tiers(config):
+    """The tier table from a parsed config_form.json, or the defaults."""
+    return config.get('PRIZE_TIERS') or DEFAULT_TIERS
+
+
+def recompute_money(contestants, engine):
+    """Set money on every contestant from its hours, e.g. after a tier change."""
+    money = engine.prize_column([c['hours'] for c in contestants])
+    for c, m in zip(contestants, money):
+        c['money'] = m
@@ -1,34 +1,194 @@
+import json
 import os
 import shutil
 import stat
-import subprocess
+import statistics
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 
+import tracing
+from git_sync import run_git, GitSyncError, POLL_MS
+
 FOLDER_PATH = r"D:\Leaderboard\page\leader_board"
 REPO_URL = "https://github.com/Bovindu/leader_board.git"
+# Bare mirror kept next to the working copy so re-clones don't hit GitHub for
+# every object; it sits on the same drive as the repo.
+MIRROR_PATH = os.path.join(os.path.dirname(FOLDER_PATH), ".leader_board_mirror.git")
+TIMINGS_FILE = os.path.join(os.path.dirname(FOLDER_PATH), ".leader_board_restore_timings.json")
+
+# Restore modes, in the order tried until there are timings:
+#   reset   - fetch + reset --hard + clean inside the existing working copy
+#   mirror  - refresh the local bare mirror, clone with --reference --dissociate
+#             (only when the mirror already exists; building one is not a
+#             recovery step)
+#   partial - blobless clone straight from GitHub (blobs fetched on demand)
+#   full    - plain clone, the old behaviour
+MODES = ('reset', 'mirror', 'partial', 'full')
 
 # Handle permission error
 def handle_remove_readonly(func, path, _):
     os.chmod(path, stat.S_IWRITE)
     func(path)
 
-def delete_and_clone():
+def _normalize_url(url):
+    url = url.strip().rstrip('/')
+    if url.endswith('.git'):
+        url = url[:-4]
+    return url.lower()
+
+def can_reset_in_place(folder, url):
+    """True if folder is a working copy whose origin is url."""
+    if not os.path.isdir(os.path.join(folder, '.git')):
+        return False
+    try:
+        origin = run_git(folder, ['remote', 'get-url', 'origin'])
+    except (GitSyncError, OSError):
+        return False
+    return _normalize_url(origin) == _normalize_url(url)
+
+def _default_branch(folder):
     try:
-        if os.path.exists(FOLDER_PATH):
-            shutil.rmtree(FOLDER_PATH, onerror=handle_remove_readonly)
-            print("Deleted existing folder.")
+        ref = run_git(folder, ['symbolic-ref', '--short', 'refs/remotes/origin/HEAD']).strip()
+    except GitSyncError:
+        run_git(folder, ['remote', 'set-head', 'origin', '--auto'])
+        ref = run_git(folder, ['symbolic-ref', '--short', 'refs/remotes/origin/HEAD']).strip()
+    return ref.split('/', 1)[1]
+
+def reset_in_place(folder, url):
+    git_dir = os.path.join(folder, '.git')
+    # Get out of any half-finished rebase or merge first
+    if os.path.isdir(os.path.join(git_dir, 'rebase-merge')) or os.path.isdir(os.path.join(git_dir, 'rebase-apply')):
+        run_git(folder, ['rebase', '--abort'])
+    if os.path.exists(os.path.join(git_dir, 'MERGE_HEAD')):
+        run_git(folder, ['merge', '--abort'])
+    run_git(folder, ['fetch', '--prune', 'origin'])
+    branch = _default_branch(folder)
+    run_git(folder, ['checkout', '--force', '-B', branch, f'origin/{branch}'])
+    run_git(folder, ['reset', '--hard', f'origin/{branch}'])
+    # Untracked files go, ignored ones (node_modules, build output) stay
+    run_git(folder, ['clean', '-ffd'])
+
+def update_mirror(mirror, url):
+    if os.path.isdir(mirror):
+        run_git(mirror, ['remote', 'update', '--prune'])
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(mirror)), exist_ok=True)
+        run_git(os.path.dirname(os.path.abspath(mirror)), ['clone', '--mirror', url, mirror])
+
+def clone_into(folder, url, extra_args):
+    """Clone next to folder, then swap it in, so a failed clone leaves the old copy alone."""
+    parent = os.path.dirname(os.path.abspath(folder))
+    os.makedirs(parent, exist_ok=True)
+    tmp = os.path.abspath(folder) + ".restore-tmp"
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp, onerror=handle_remove_readonly)
+    run_git(parent, ['clone', *extra_args, url, tmp])
+    if os.path.exists(folder):
+        shutil.rmtree(folder, onerror=handle_remove_readonly)
+    os.replace(tmp, folder)
+
+def run_mode(mode, folder, url, mirror):
+    if mode == 'reset':
+        reset_in_place(folder, url)
+    elif mode == 'mirror':
+        update_mirror(mirror, url)
+        clone_into(folder, url, ['--reference', mirror, '--dissociate'])
+    elif mode == 'partial':
+        clone_into(folder, url, ['--filter=blob:none'])
+    else:
+        clone_into(folder, url, [])
+
+def load_timings(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_timings(path, timings):
+    try:
+        with open(path, 'w') as f:
+            json.dump(timings, f, indent=2)
+    except OSError:
+        pass
+
+def plan_modes(folder, url, timings, mirror=MIRROR_PATH):
+    """
+    Safe modes for this folder, in the order to try them. Resetting in place
+    always wins when possible. Clone modes that have past timings come next,
+    by median time; the rest follow in MODES order, so a recovery never runs
+    a slow mode first just to measure it.
+    """
+    modes = ['reset'] if can_reset_in_place(folder, url) else []
+    clones = [m for m in MODES if m != 'reset' and (m != 'mirror' or os.path.isdir(mirror))]
+    timed = sorted((m for m in clones if timings.get(m)), key=lambda m: statistics.median(timings[m]))
+    return modes + timed + [m for m in clones if not timings.get(m)]
+
+def restore(folder=FOLDER_PATH, url=REPO_URL, mirror=MIRROR_PATH, timings_file=TIMINGS_FILE):
+    """
+    Bring folder back to a clean copy of origin's default branch using the
+    fastest safe mode, falling back to the next one on failure.
+    Returns (mode, seconds).
+    """
+    timings = load_timings(timings_file)
+    errors = []
+    for mode in plan_modes(folder, url, timings, mirror):
+        start = time.perf_counter()
+        try:
+            with tracing.span(f"restore {mode}"):
+                run_mode(mode, folder, url, mirror)
+        except (GitSyncError, OSError) as e:
+            errors.append(f"{mode}: {e}")
+            continue
+        seconds = time.perf_counter() - start
+        # Keep the last few runs per mode to pick from next time
+        timings[mode] = (timings.get(mode, []) + [seconds])[-5:]
+        save_timings(timings_file, timings)
+        return mode, seconds
+    raise GitSyncError("All restore modes failed:\n" + "\n".join(errors))
+
+def delete_and_clone(master, button):
+    # A clone can take minutes and every tool shares this Tk thread: run it
+    # on a worker and poll for the result with after()
+    button.config(state='disabled', text="Restoring...")
+    result = {}
+
+    def work():
+        try:
+            with tracing.span("delete_and_clone") as fields:
+                result['value'] = restore()
+                fields['mode'] = result['value'][0]
+        except Exception as e:
+            result['error'] = e
+
+    worker = threading.Thread(target=work, name="restore", daemon=True)
+    worker.start()
+
+    def wait():
+        if worker.is_alive():
+            master.after(POLL_MS, wait)
+            return
+        button.config(state='normal', text="Reset Leaderboard Repo")
+        if 'error' in result:
+            messagebox.showerror("Error", f"An error occurred:\n{result['error']}")
+            return
+        mode, seconds = result['value']
+        print(f"Restored with '{mode}' in {seconds:.1f}s.")
+        messagebox.showinfo("Success", f"Repository restored successfully ({mode}, {seconds:.1f}s).")
 
-        subprocess.check_call(["git", "clone", REPO_URL, FOLDER_PATH])
-        messagebox.showinfo("Success", "Repository cloned successfully.")
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred:\n{e}")
+    master.after(POLL_MS, wait)
 
-# GUI
-root = tk.Tk()
-root.title("Reset Repository")
+def open_window(master):
+    # GUI
+    master.title("Reset Repository")
 
-btn = tk.Button(root, text="Reset Leaderboard Repo", command=delete_and_clone, width=40)
-btn.pack(padx=20, pady=20)
+    btn = tk.Button(master, text="Reset Leaderboard Repo", width=40)
+    btn.config(command=lambda: delete_and_clone(master, btn))
+    btn.pack(padx=20, pady=20)
 
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    open_window(root)
+    root.mainloop()
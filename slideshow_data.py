@@ -0,0 +1,171 @@
+import os
+import re
+
+from leaderboard_data import (RECORD_RE, PAIR_RE, unquote, quote, strip_comments, atomic_write, splice_records,
+                              reparse_changed)
+
+# Headless reader/writer for the slideshowImages array in ImageSlideshow.tsx.
+# Same approach as leaderboard_data: one forward pass that records where each
+# slide literal sits, and saves that splice only the slides that changed into
+# the original text. Fields may come in any order and strings may contain
+# escaped quotes.
+
+ARRAY_START_RE = re.compile(r"const\s+slideshowImages\b[^=\n]*=\s*\[")
+SLIDE_FIELDS = ('id', 'url', 'title', 'description')
+
+
+def parse_slide(body):
+    """Turn the text between `{` and `}` into a slide dict."""
+    slide = {}
+    for key, raw in PAIR_RE.findall(strip_comments(body)):
+        if key[0] in '"\'':
+            key = unquote(key)
+        if raw[0] in '"\'':
+            slide[key] = unquote(raw)
+        elif key == 'id':
+            slide[key] = int(raw)
+        else:
+            slide[key] = raw
+    return slide
+
+
+def find_array(text):
+    """Offset just past the `[` of slideshowImages, or -1."""
+    m = ARRAY_START_RE.search(text)
+    return m.end() if m else -1
+
+
+def iter_slides(text, pos):
+    """
+    Yield (start, end, slide) for each slide literal from pos up to the
+    closing `]`, whose offset is the generator's return value.
+    """
+    match = RECORD_RE.match
+    while True:
+        r = match(text, pos)
+        if r is None:
+            raise ValueError(f"Unexpected text in slideshowImages at offset {pos}")
+        if r.group('end'):
+            return r.start('end')
+        yield r.start('open'), r.end('body') + 1, parse_slide(r.group('body'))
+        pos = r.end()
+
+
+def scan(text):
+    """
+    Return (array_open, records, array_close) where records is a list of
+    (start, end, slide). array_open is -1 when there is no slideshowImages.
+    """
+    array_open = find_array(text)
+    if array_open < 0:
+        return -1, [], -1
+    records = []
+    slides = iter_slides(text, array_open)
+    while True:
+        try:
+            records.append(next(slides))
+        except StopIteration as done:
+            return array_open, records, done.value
+
+
+def _slide_key(slide):
+    return tuple(slide.get(k) for k in SLIDE_FIELDS)
+
+
+def format_slide(slide, newline='\n'):
+    return (f"{{{newline}"
+            f"    id: {slide['id']},{newline}"
+            f"    url: {quote(slide['url'])},{newline}"
+            f"    title: {quote(slide['title'])},{newline}"
+            f"    description: {quote(slide['description'])}{newline}"
+            f"  }}")
+
+
+class SlideshowFile:
+    """ImageSlideshow.tsx plus the slide offsets from the last parse."""
+
+    def __init__(self, path):
+        self.path = path
+        self.text = None
+        self.array_open = -1
+        self.spans = []
+        self.keys = []
+        self.stat = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self):
+        """Parse the file and return the list of slide dicts."""
+        stat = self._stat()
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        array_open, records, _close = scan(text)
+        if array_open < 0:
+            raise ValueError("slideshowImages array not found")
+        self.text = text
+        self.stat = stat
+        self.array_open = array_open
+        self.spans = [(start, end) for start, end, _s in records]
+        self.keys = [_slide_key(s) for _start, _end, s in records]
+        return [s for _start, _end, s in records]
+
+    def changed_on_disk(self):
+        return self.text is not None and self._stat() != self.stat
+
+    def reload(self):
+        """
+        Pick up an outside change, parsing only the slides in the changed
+        region. Returns None if the file is as we last saw it, otherwise
+        (first, stop, slides): positions first..stop-1 of the old list are
+        replaced by slides.
+        """
+        stat = self._stat()
+        if self.text is None or stat == self.stat:
+            return None
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        new_open = find_array(text)
+        if new_open < 0:
+            raise ValueError("slideshowImages array not found")
+        first, stop, records, delta = reparse_changed(
+            self.text, text, self.spans, self.array_open, new_open, iter_slides)
+        self.spans = (self.spans[:first] + [(s, e) for s, e, _slide in records]
+                      + [(s + delta, e + delta) for s, e in self.spans[stop:]])
+        self.keys = self.keys[:first] + [_slide_key(slide) for _s, _e, slide in records] + self.keys[stop:]
+        self.text = text
+        self.stat = stat
+        self.array_open = new_open
+        return first, stop, [slide for _s, _e, slide in records]
+
+    def render(self, slides):
+        newline = '\r\n' if '\r\n' in self.text else '\n'
+        if self.spans and slides:
+            return splice_records(self.text, self.spans, self.keys, slides, _slide_key,
+                                  lambda s: format_slide(s, newline), f",{newline}  ")
+        # Empty before or after: rewrite just the array body
+        _open, _records, close = scan(self.text)
+        body = "".join(f"  {format_slide(s, newline)},{newline}" for s in slides)
+        text = self.text[:self.array_open] + newline + body + self.text[close:]
+        return text, [(start, end) for start, end, _s in scan(text)[1]]
+
+    def write(self, slides):
+        """
+        Save slides, splicing only changed slide literals into the file, via
+        an atomic rename. Returns False when nothing changed.
+        """
+        if self.text is None or self._stat() != self.stat:
+            self.read()
+        text, spans = self.render(slides)
+        if text == self.text:
+            return False
+        atomic_write(self.path, text)
+        self.text = text
+        self.stat = self._stat()
+        self.spans = spans
+        self.keys = [_slide_key(s) for s in slides]
+        return True
@@ -0,0 +1,71 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+# A bare origin and working clones of it in a temp folder, for the tests
+# that drive GitSession against real git.
+
+HAVE_GIT = shutil.which('git') is not None
+
+
+class GitRepos:
+    def __init__(self):
+        self.dir = tempfile.mkdtemp()
+        self.origin = os.path.join(self.dir, 'origin.git')
+        self.git(self.dir, 'init', '-q', '--bare', '-b', 'main', self.origin)
+        seed = self.clone('seed')
+        self.commit(seed, 'README', "seed\n")
+        self.git(seed, 'push', '-q', 'origin', 'main')
+
+    def cleanup(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    @staticmethod
+    def git(cwd, *args):
+        return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+    def clone(self, name):
+        path = os.path.join(self.dir, name)
+        self.git(self.dir, 'clone', '-q', self.origin, path)
+        self.git(path, 'config', 'user.name', name)
+        self.git(path, 'config', 'user.email', f'{name}@example.com')
+        return path
+
+    def write(self, clone, rel, text):
+        path = os.path.join(clone, rel)
+        with open(path, 'w', newline='') as f:
+            f.write(text)
+        return path
+
+    def read(self, clone, rel):
+        with open(os.path.join(clone, rel), newline='') as f:
+            return f.read()
+
+    def commit(self, clone, rel, text, message="edit"):
+        path = self.write(clone, rel, text)
+        self.git(clone, 'add', rel)
+        self.git(clone, 'commit', '-q', '-m', message)
+        return path
+
+    def push_from(self, name, files, message="edit"):
+        """Another admin's clone commits files (rel -> text) and pushes them."""
+        other = os.path.join(self.dir, name)
+        if not os.path.exists(other):
+            other = self.clone(name)
+        self.git(other, 'pull', '-q', '--rebase')
+        for rel, text in files.items():
+            self.write(other, rel, text)
+            self.git(other, 'add', rel)
+        self.git(other, 'commit', '-q', '-m', message)
+        self.git(other, 'push', '-q')
+
+    def log(self):
+        """Commit subjects on origin, newest first."""
+        return self.git(self.origin, 'log', '--format=%s', 'main').splitlines()
+
+    def stashes(self, clone):
+        return self.git(clone, 'stash', 'list').splitlines()
+
+    def unmerged(self, clone):
+        return self.git(clone, 'diff', '--name-only', '--diff-filter=U').splitlines()
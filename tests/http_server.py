@@ -0,0 +1,80 @@
+import socket
+import struct
+import threading
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A local stand-in for the picture hosts: serves fixed bodies by path and
+# counts the requests it gets.
+
+
+def png(width, height, rgb):
+    """A solid-colour RGB PNG, built without Pillow."""
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+    raw = b''.join(b'\0' + bytes(rgb) * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+def refused_url():
+    """An http URL on a local port nothing listens on."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/pic.png"
+
+
+class PictureServer:
+    """
+    files maps a path to its body. Paths in no_head answer HEAD with 405;
+    any other path is a 404.
+    """
+
+    def __init__(self, files, no_head=()):
+        self.files = files
+        self.no_head = set(no_head)
+        self.requests = Counter()   # (method, path) -> count
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def answer(self, send_body):
+                server.requests[self.command, self.path] += 1
+                body = server.files.get(self.path)
+                if body is None:
+                    status, body = 404, b"not found"
+                elif self.command == 'HEAD' and self.path in server.no_head:
+                    status, body = 405, b""
+                elif self.headers.get('Range') == 'bytes=0-0':
+                    status, body = 206, body[:1]
+                else:
+                    status = 200
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.answer(False)
+
+            def do_GET(self):
+                self.answer(True)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
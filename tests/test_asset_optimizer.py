@@ -0,0 +1,19 @@
+import unittest
+from unittest import mock
+
+import asset_optimizer
+
+
+class WithoutPillowTest(unittest.TestCase):
+    def test_skip_is_not_an_error(self):
+        with mock.patch.object(asset_optimizer, 'Image', None), \
+                mock.patch.object(asset_optimizer, '_skip_noted', False), \
+                mock.patch('tracing.record') as record:
+            for _ in range(2):
+                report = asset_optimizer.optimize_assets(['import a from "./a.png";'], ".")
+                self.assertEqual((report['errors'], report['optimized'], report['files']), ([], [], 0))
+        record.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
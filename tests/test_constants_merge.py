@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+
+import contestant_manage
+import git_sync
+from board_totals import parse_price_config
+from generated_files import GeneratedFiles
+from prize_engine import PrizeEngine
+
+from tests.git_repos import HAVE_GIT, GitRepos
+
+
+def board(*rows):
+    lines = "".join(f'  {{ rank: {i}, name: "{name}", hours: {hours}, money: 0 }},\n'
+                    for i, (name, hours) in enumerate(rows, start=1))
+    return f"export const leaderboardData = [\n{lines}];\n"
+
+
+def constants(pool, hours):
+    return contestant_manage.render_price_config({'POOL_PRICE': pool, 'PRICE_PER_HOUR': 0, 'TOTAL_HOURS': hours})
+
+
+class MergePriceConfigTest(unittest.TestCase):
+    def test_pool_comes_from_the_side_that_changed_it(self):
+        base, ours = constants(1000, 25), constants(1000, 27)
+        text, conflicts = contestant_manage.merge_price_config(base, ours, constants(2000, 28))
+        self.assertEqual(parse_price_config(text)['POOL_PRICE'], 2000)
+        self.assertEqual(conflicts, [])
+        text, _conflicts = contestant_manage.merge_price_config(base, constants(1500, 27), constants(2000, 28))
+        self.assertEqual(parse_price_config(text)['POOL_PRICE'], 1500)
+
+
+@unittest.skipUnless(HAVE_GIT, "git is not installed")
+class ConstantsAfterPullTest(unittest.TestCase):
+    def setUp(self):
+        self.repos = GitRepos()
+        self.repos.push_from('seed', {
+            'leaderboard-data.ts': board(("A", 10), ("B", 10), ("C", 5)),
+            'constants.ts': constants(1000, 25),
+            'date_up.ts': "LATEST_UPDATE: '2026/01/01'\n",
+        })
+        self.clone = self.repos.clone('ours')
+
+    def tearDown(self):
+        self.repos.cleanup()
+
+    def test_both_sides_submit(self):
+        repos, clone = self.repos, self.clone
+        repos.push_from('theirs', {
+            'leaderboard-data.ts': board(("A", 10), ("B", 10), ("C", 8)),
+            'constants.ts': constants(2000, 28),
+            'date_up.ts': "LATEST_UPDATE: '2026/01/02'\n",
+        })
+        # Our Submit, not yet pushed
+        paths = [repos.write(clone, 'leaderboard-data.ts', board(("A", 12), ("B", 10), ("C", 5))),
+                 repos.write(clone, 'constants.ts', constants(1000, 27)),
+                 repos.write(clone, 'date_up.ts', "LATEST_UPDATE: '2026/01/03'\n")]
+        session = git_sync.GitSession(clone)
+        session.mark_changed(*paths)
+        with mock.patch.multiple(contestant_manage, create=True, git_session=session, chunk_writer=None,
+                                 LEADERBOARD_FILE=paths[0], CONSTANTS_FILE=paths[1], DATE_CONFIG=paths[2],
+                                 prize_engine=PrizeEngine(), generated=GeneratedFiles()):
+            contestant_manage.register_merges()
+            session.sync("Update leaderboard data")
+
+        self.assertEqual(repos.unmerged(clone), [])
+        self.assertEqual(repos.stashes(clone), [])
+        self.assertEqual(repos.git(clone, 'status', '--porcelain'), "")
+        text = repos.read(clone, 'constants.ts')
+        self.assertNotIn("<<<<<<<", text)
+        config = parse_price_config(text)
+        self.assertEqual((config['POOL_PRICE'], config['TOTAL_HOURS']), (2000, 30))
+        repos.git(clone, 'fetch', '-q')
+        self.assertEqual(repos.git(clone, 'show', 'origin/main:constants.ts'), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
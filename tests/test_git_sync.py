@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+import git_sync
+import leaderboard_merge
+from git_sync import GitSession, GitSyncCancelled, GitSyncError, GitSyncWorker
+
+from tests.git_repos import HAVE_GIT, GitRepos
+
+
+def board(*rows):
+    lines = "".join(f'  {{ rank: {i}, name: "{name}", hours: {hours}, money: 0 }},\n'
+                    for i, (name, hours) in enumerate(rows, start=1))
+    return f"export const leaderboardData = [\n{lines}];\n"
+
+
+def keep_ours(base, ours, theirs):
+    return ours, []
+
+
+@unittest.skipUnless(HAVE_GIT, "git is not installed")
+class GitSyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.repos = GitRepos()
+        self.repos.push_from('seed', {
+            'leaderboard-data.ts': board(("A", 10), ("B", 10)),
+            'date_up.ts': "LATEST_UPDATE: '2026/01/01'\n",
+            'notes.txt': "one\n",
+        })
+        self.clone = self.repos.clone('ours')
+        self.session = GitSession(self.clone)
+        self.session.register_merge(self.path('leaderboard-data.ts'), leaderboard_merge.merge_texts)
+        self.session.register_merge(self.path('date_up.ts'), keep_ours)
+
+    def tearDown(self):
+        self.repos.cleanup()
+
+    def path(self, rel):
+        return os.path.join(self.clone, rel)
+
+    def edit(self, rel, text):
+        self.session.mark_changed(self.repos.write(self.clone, rel, text))
+
+    def assertClean(self):
+        self.assertEqual(self.repos.git(self.clone, 'status', '--porcelain'), "")
+        self.assertEqual(self.repos.stashes(self.clone), [])
+        self.assertEqual(self.repos.unmerged(self.clone), [])
+
+
+class MergeTest(GitSyncTestCase):
+    def test_board_and_generated_file_merge(self):
+        self.repos.push_from('theirs', {'leaderboard-data.ts': board(("A", 10), ("B", 14)),
+                                        'date_up.ts': "LATEST_UPDATE: '2026/01/02'\n"})
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        self.edit('date_up.ts', "LATEST_UPDATE: '2026/01/03'\n")
+        self.session.sync("ours")
+
+        self.assertClean()
+        self.assertTrue(self.session.last_pushed and self.session.last_pulled)
+        self.assertEqual(self.repos.log()[:2], ["ours", "edit"])
+        text = self.repos.git(self.clone, 'show', 'origin/main:leaderboard-data.ts')
+        self.assertIn('name: "A", hours: 12', text)
+        self.assertIn('name: "B", hours: 14', text)
+        self.assertEqual(self.repos.read(self.clone, 'date_up.ts'), "LATEST_UPDATE: '2026/01/03'\n")
+
+    def test_committed_but_unpushed_edit_is_merged(self):
+        self.repos.push_from('theirs', {'leaderboard-data.ts': board(("A", 10), ("B", 14))})
+        self.repos.commit(self.clone, 'leaderboard-data.ts', board(("A", 12), ("B", 10)), "earlier")
+        self.edit('date_up.ts', "LATEST_UPDATE: '2026/01/03'\n")
+        self.session.sync("ours")
+
+        self.assertClean()
+        text = self.repos.git(self.clone, 'show', 'origin/main:leaderboard-data.ts')
+        self.assertIn('name: "A", hours: 12', text)
+        self.assertIn('name: "B", hours: 14', text)
+
+    def test_failed_stash_pop_blocks_the_next_push(self):
+        self.repos.push_from('theirs', {'notes.txt': "theirs\n"})
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        self.repos.write(self.clone, 'notes.txt', "ours\n")
+        with self.assertRaisesRegex(GitSyncError, "stash pop"):
+            self.session.sync("ours")
+        self.assertEqual(self.repos.unmerged(self.clone), ["notes.txt"])
+
+        self.session.mark_changed(self.path('notes.txt'))
+        with self.assertRaisesRegex(GitSyncError, "notes.txt"):
+            self.session.sync("ours again")
+        self.assertNotIn("ours again", self.repos.log())
+        self.assertNotIn("<<<<<<<", self.repos.git(self.clone, 'show', 'origin/main:notes.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class WorkerTest(GitSyncTestCase):
+    def hang_origin(self):
+        # A remote whose fetch never answers
+        self.repos.git(self.clone, 'config', 'protocol.ext.allow', 'always')
+        self.repos.git(self.clone, 'remote', 'set-url', 'origin', 'ext::sh -c exec% sleep% 60')
+
+    def test_repeated_requests_are_coalesced(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        real_sync = git_sync.sync_and_push
+
+        def slow_sync(*args, **kwargs):
+            calls.append(args[1])
+            started.set()
+            release.wait(10)
+            return real_sync(*args, **kwargs)
+
+        worker = GitSyncWorker(self.clone)
+        self.addCleanup(worker.close)
+        with mock.patch('git_sync.sync_and_push', slow_sync), \
+                mock.patch('git_sync.session_for', lambda path: self.session):
+            self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+            results = []
+            worker.request_push("first", on_done=lambda error, _timings: results.append(error))
+            self.assertTrue(started.wait(10))
+            self.edit('date_up.ts', "LATEST_UPDATE: '2026/01/03'\n")
+            queued = [worker.request_push(m, on_done=lambda error, _timings: results.append(error))
+                      for m in ("second", "third")]
+            release.set()
+            self.assertTrue(worker.wait(timeout=30))
+
+        self.assertEqual(queued, [True, False])
+        self.assertEqual(calls, ["first", "second"])
+        self.assertEqual(results, [None, None, None])
+        self.assertEqual(self.repos.log()[0], "first")
+        self.assertEqual(self.repos.log()[1], "edit")
+        self.assertClean()
+
+    def test_cancel_kills_git_and_leaves_no_stash(self):
+        self.hang_origin()
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        worker = GitSyncWorker(self.clone)
+        self.addCleanup(worker.close)
+        labels = []
+        errors = []
+
+        def progress(label):
+            labels.append(label)
+            if label == "Fetching from origin":
+                worker.cancel()
+
+        start = time.monotonic()
+        with mock.patch('git_sync.session_for', lambda path: self.session):
+            worker.request_push("cancelled", progress, lambda error, _timings: errors.append(error))
+            while worker.busy and time.monotonic() - start < 30:
+                worker.drain()
+                time.sleep(0.01)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertIsInstance(errors[0], GitSyncCancelled)
+        self.assertEqual(self.repos.stashes(self.clone), [])
+        self.assertIn('name: "A", hours: 12', self.repos.read(self.clone, 'leaderboard-data.ts'))
+        self.assertNotIn("cancelled", self.repos.log())
+
+    def test_timeout(self):
+        self.hang_origin()
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        start = time.monotonic()
+        with self.assertRaisesRegex(GitSyncError, "timed out"):
+            self.session.sync("late", timeout=0.5)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(self.repos.stashes(self.clone), [])
+
+
+class SessionTest(GitSyncTestCase):
+    def labels(self, timings):
+        return [label for label, _seconds in timings]
+
+    def test_all_changed_files_go_in_one_commit(self):
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        self.edit('date_up.ts', "LATEST_UPDATE: '2026/01/03'\n")
+        self.edit('ImageSlideshow.tsx', "export const slides = [];\n")
+        self.repos.write(self.clone, 'notes.txt', "not generated\n")
+        self.session.sync("batch")
+
+        self.assertEqual(self.repos.log()[:2], ["batch", "edit"])
+        files = self.repos.git(self.repos.origin, 'show', '--name-only', '--format=', 'main').split()
+        self.assertEqual(sorted(files), ['ImageSlideshow.tsx', 'date_up.ts', 'leaderboard-data.ts'])
+        self.assertEqual(self.session.changed_files, [])
+
+    def test_fetch_only_when_origin_has_not_moved(self):
+        self.edit('leaderboard-data.ts', board(("A", 12), ("B", 10)))
+        labels = self.labels(self.session.sync("ours"))
+        self.assertIn("Fetching from origin", labels)
+        self.assertNotIn("Rebasing onto origin", labels)
+        self.assertNotIn("Stashing local changes", labels)
+        self.assertFalse(self.session.last_pulled)
+        self.assertTrue(self.session.last_pushed)
+
+    def test_no_commit_when_nothing_is_staged(self):
+        # Rewritten with the same content: nothing for git to commit
+        self.edit('leaderboard-data.ts', self.repos.read(self.clone, 'leaderboard-data.ts'))
+        before = self.repos.log()
+        labels = self.labels(self.session.sync("empty"))
+        self.assertNotIn("Committing", labels)
+        self.assertNotIn("Pushing", labels)
+        self.assertFalse(self.session.last_pushed)
+        self.assertEqual(self.repos.log(), before)
+        self.assertEqual(self.session.changed_files, [])
@@ -0,0 +1,101 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from history_store import HistoryStore
+
+BOARD_TS = '''export const leaderboardData = [
+{rows}
+];
+'''
+
+
+def board_ts(rows):
+    return BOARD_TS.format(rows="\n".join(
+        f'  {{ rank: {r}, name: "{n}", hours: {h}, money: {m} }},' for n, h, m, r in rows))
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'history.lbh')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_append_stores_only_changes(self):
+        store = HistoryStore(self.path)
+        self.assertEqual(store.append([("A", 10, 100, 1), ("B", 5, 50, 2)], timestamp=1), 2)
+        self.assertEqual(store.append([("A", 10, 100, 1), ("B", 5, 50, 2)], timestamp=2), 0)
+        self.assertEqual(store.append([("A", 12, 120, 1)], timestamp=3), 2)
+        self.assertEqual(len(store), 2)
+
+    def test_series_and_top_after_reload(self):
+        store = HistoryStore(self.path)
+        store.append([("A", 10, 100, 1), ("B", 5, 50, 2)], timestamp=1)
+        store.append([("B", 11, 110, 1), ("A", 10, 100, 2)], timestamp=2)
+        store.append([("A", 10, 100, 1)], timestamp=3)
+        for s in (store, HistoryStore(self.path)):
+            self.assertEqual(s.series("A"), [(1, 10, 100, 1), (2, 10, 100, 2), (3, 10, 100, 1)])
+            self.assertEqual(s.series("B"), [(1, 5, 50, 2), (2, 11, 110, 1), (3, 0, 0, 0)])
+            self.assertEqual(s.top(1), [(1, [("A", 10)]), (2, [("B", 11)]), (3, [("A", 10)])])
+            self.assertEqual([dict((r[0], r[1:]) for r in rows) for _ts, rows in s.boards()][-1],
+                             {"A": (10, 100, 1)})
+
+    def test_torn_tail_is_dropped_and_overwritten(self):
+        store = HistoryStore(self.path)
+        store.append([("A", 10, 100, 1)], timestamp=1)
+        size = os.path.getsize(self.path)
+        store.append([("A", 11, 100, 1)], timestamp=2)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        reopened = HistoryStore(self.path)
+        self.assertEqual(reopened.series("A"), [(1, 10, 100, 1)])
+        reopened.append([("A", 12, 100, 1)], timestamp=3)
+        self.assertGreater(os.path.getsize(self.path), size)
+        self.assertEqual(HistoryStore(self.path).series("A"), [(1, 10, 100, 1), (3, 12, 100, 1)])
+
+    def test_appends_from_two_instances_are_both_kept(self):
+        first, second = HistoryStore(self.path), HistoryStore(self.path)
+        first.append([("A", 10, 100, 1)], timestamp=1)
+        second.append([("A", 10, 100, 1), ("B", 3, 30, 2)], timestamp=2)
+        first.append([("A", 11, 100, 1), ("B", 3, 30, 2)], timestamp=3)
+        self.assertEqual(HistoryStore(self.path).series("B"), [(2, 3, 30, 2)])
+        self.assertEqual([ts for ts, _rows in HistoryStore(self.path).top()], [1, 2, 3])
+        self.assertEqual(first.series("A"), [(1, 10, 100, 1), (3, 11, 100, 1)])
+
+    @unittest.skipUnless(shutil.which('git'), "git is not installed")
+    def test_backfill_puts_git_boards_before_the_history(self):
+        repo = os.path.join(self.dir, 'repo')
+        os.makedirs(repo)
+        env = dict(os.environ, GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@t", GIT_COMMITTER_NAME="t",
+                   GIT_COMMITTER_EMAIL="t@t")
+
+        def git(*args, when=None):
+            if when is not None:
+                env['GIT_AUTHOR_DATE'] = env['GIT_COMMITTER_DATE'] = f"@{when} +0000"
+            subprocess.run(['git', *args], cwd=repo, env=env, check=True, capture_output=True)
+
+        git('init', '-q')
+        data = os.path.join(repo, 'leaderboard-data.ts')
+        for when, rows in ((1000000000, [("A", 1, 10, 1)]), (2000000000, [("A", 2, 20, 1), ("B", 1, 5, 2)])):
+            with open(data, 'w') as f:
+                f.write(board_ts(rows))
+            git('add', 'leaderboard-data.ts')
+            git('commit', '-q', '-m', 'update', when=when)
+
+        store = HistoryStore(self.path)
+        store.append([("A", 3, 30, 1), ("B", 1, 5, 2)], timestamp=3000000000)
+        store.series("A")   # builds the sidecar index, which the backfill must drop
+        self.assertEqual(store.backfill(repo, data, workers=1), 2)
+        self.assertEqual(store.series("A"), [(1000000000, 1, 10, 1), (2000000000, 2, 20, 1), (3000000000, 3, 30, 1)])
+        self.assertEqual(HistoryStore(self.path).series("B"), [(2000000000, 1, 5, 2)])
+        self.assertEqual(store.backfill(repo, data, workers=1), 0)
+        self.assertFalse([n for n in os.listdir(self.dir) if n.endswith('.tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import leaderboard_data
+
+NESTED = '''import pic from "./pic.png";
+
+export const leaderboardData = [
+  { rank: 1, name: "A", hours: 10, money: 200, profilePic: "https://x/a.png" },
+  { rank: 2, name: "B", hours: 9, socials: { x: "h}", tags: ["a", { b: 1 }] }, money: 180, profilePic: pic },
+  { rank: 3, name: "C", hours: 1, money: 20, profilePic: "https://x/c.png", meta: {} },
+];
+'''
+
+
+class NestedRecordTest(unittest.TestCase):
+    def test_nested_values_are_kept_opaque(self):
+        _imports, rows = leaderboard_data.parse_leaderboard(NESTED)
+        self.assertEqual([c.name for c in rows], ["A", "B", "C"])
+        self.assertEqual((rows[1].hours, rows[1].money, rows[1].profilePic), (9, 180, "pic"))
+        self.assertEqual(rows[1].extra, {'socials': '{ x: "h}", tags: ["a", { b: 1 }] }'})
+        self.assertEqual(rows[2].extra, {'meta': '{}'})
+
+    def test_unchanged_nested_rows_keep_their_text(self):
+        board = leaderboard_data.LeaderboardFile(None)
+        imports, rows = board.load(NESTED)
+        rows[0].hours = 11
+        text, _spans = board.render(imports, rows)
+        self.assertEqual(text, NESTED.replace("hours: 10,", "hours: 11,"))
+
+
+BOARD = (
+    'import pic from "./pic.png";\r\n'
+    '\r\n'
+    'export const leaderboardData = [\r\n'
+    '  { rank: 1, name: "A", hours: 10, money: 200, profilePic: "https://x/a.png" },\r\n'
+    '  {rank:2,name:"B",hours:9,money:180,profilePic:pic}, // hand edited\r\n'
+    '  { rank: 3, name: "C", hours: 1, money: 20, profilePic: "https://x/c.png" },\r\n'
+    '];\r\n'
+)
+
+
+class WriteTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'leaderboard-data.ts')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def load(self, text):
+        with open(self.path, 'w', newline='') as f:
+            f.write(text)
+        board = leaderboard_data.LeaderboardFile(self.path)
+        return (board, *board.read())
+
+    def on_disk(self):
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def test_unchanged_board_writes_nothing(self):
+        board, imports, rows = self.load(BOARD)
+        before = os.stat(self.path).st_mtime_ns
+        self.assertFalse(board.write(imports, rows))
+        self.assertEqual(self.on_disk(), BOARD)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, before)
+
+    def test_edit_changes_only_that_row(self):
+        board, imports, rows = self.load(BOARD)
+        rows[2].hours = 2
+        self.assertTrue(board.write(imports, rows))
+        self.assertEqual(self.on_disk(), BOARD.replace("hours: 1,", "hours: 2,"))
+
+    def test_rerendered_row_keeps_extra_fields(self):
+        text = NESTED.replace('profilePic: "https://x/c.png", meta: {}',
+                              """meta: {}, "x-id": 'c\\'s', flag: true""")
+        board, imports, rows = self.load(text)
+        self.assertIsNone(rows[2].profilePic)
+        for c in rows:
+            c.rank += 1
+        self.assertTrue(board.write(imports, rows))
+        _imports, again = leaderboard_data.read_leaderboard(self.path)
+        self.assertEqual([dict(c) for c in again], [dict(c) for c in rows])
+        written = self.on_disk()
+        self.assertIn("""{ rank: 4, name: "C", hours: 1, money: 20, meta: {}, "x-id": 'c\\'s', flag: true }""",
+                      written)
+        self.assertIn('socials: { x: "h}", tags: ["a", { b: 1 }] }', written)
+        self.assertNotIn("None", written)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from http_pool import HTTPPool
+from pic_validation import UrlChecker
+
+from tests.http_server import PictureServer, png, refused_url
+
+
+class UrlCheckerTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.server = PictureServer({'/ok.png': png(4, 4, (1, 2, 3)), '/no-head.png': png(4, 4, (4, 5, 6))},
+                                    no_head={'/no-head.png'})
+        self.pool = HTTPPool(timeout=5)
+        self.cache_file = os.path.join(self.dir, 'url_checks.json')
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.close()
+        shutil.rmtree(self.dir)
+
+    def checker(self, **kwargs):
+        return UrlChecker(pool=self.pool, cache_file=self.cache_file, **kwargs)
+
+    def test_statuses(self):
+        ok, missing, no_head, refused = (self.server.url('/ok.png'), self.server.url('/missing.png'),
+                                         self.server.url('/no-head.png'), refused_url())
+        results = self.checker().check([ok, missing, no_head, refused])
+        self.assertEqual(results[ok], (True, "HTTP 200"))
+        self.assertEqual(results[missing], (False, "HTTP 404"))
+        # HEAD refused: a one-byte ranged GET decides
+        self.assertEqual(results[no_head], (True, "HTTP 206"))
+        self.assertEqual(self.server.requests['GET', '/no-head.png'], 1)
+        self.assertFalse(results[refused][0])
+        self.assertIn("127.0.0.1", results[refused][1])
+
+    def test_cache_within_ttl(self):
+        ok, missing = self.server.url('/ok.png'), self.server.url('/missing.png')
+        self.checker(failure_ttl=0).check([ok, missing])
+        # A new checker reads the results back from the cache file
+        checker = self.checker(failure_ttl=0)
+        self.assertEqual(checker.check([ok, missing]), {ok: (True, "HTTP 200"), missing: (False, "HTTP 404")})
+        self.assertEqual(self.server.requests['HEAD', '/ok.png'], 1)
+        # Failures expire after failure_ttl, and recheck skips the cache
+        self.assertEqual(self.server.requests['HEAD', '/missing.png'], 2)
+        checker.check([ok], recheck=[ok])
+        self.assertEqual(self.server.requests['HEAD', '/ok.png'], 2)
+
+    def test_expired_success_is_checked_again(self):
+        ok = self.server.url('/ok.png')
+        checker = self.checker(ttl=0)
+        checker.check([ok])
+        checker.check([ok])
+        self.assertEqual(self.server.requests['HEAD', '/ok.png'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+from unittest import mock
+
+import prize_engine
+from prize_engine import PrizeEngine
+
+# The engine has to agree with the three-tier calculate_prize it replaced.
+BOUNDARIES = [0, 149, 150, 151, 299, 300, 301]
+
+
+def old_calculate_prize(hours):
+    if hours <= 150:
+        prize = hours * 20
+    elif hours <= 300:
+        prize = 150 * 20 + (hours - 150) * 40
+    else:
+        prize = 150 * 20 + 150 * 40 + (hours - 300) * 60
+    return prize
+
+
+def sweep():
+    rng = random.Random(6)
+    return BOUNDARIES + [rng.randint(0, 5000) for _ in range(2000)]
+
+
+class PrizeEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = PrizeEngine()
+
+    def test_prize_matches_old_calculate_prize(self):
+        for hours in sweep():
+            with self.subTest(hours=hours):
+                prize = self.engine.prize(hours)
+                self.assertEqual(prize, old_calculate_prize(hours))
+                self.assertIs(type(prize), int)
+
+    def test_prize_column_fallback_matches(self):
+        hours = sweep()
+        with mock.patch.object(prize_engine, 'np', None):
+            column = self.engine.prize_column(hours)
+        self.assertEqual(column, [old_calculate_prize(h) for h in hours])
+
+    @unittest.skipIf(prize_engine.np is None, "NumPy not installed")
+    def test_prize_column_numpy_matches(self):
+        hours = sweep()
+        column = self.engine.prize_column(hours)
+        self.assertEqual(column, [old_calculate_prize(h) for h in hours])
+        self.assertTrue(all(type(m) is int for m in column))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from repository_restore import plan_modes
+
+URL = "https://github.com/example/leader_board.git"
+
+
+class PlanModesTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.folder = os.path.join(self.dir, 'leader_board')   # not a working copy: no reset
+        self.mirror = os.path.join(self.dir, 'mirror.git')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_untimed_modes_keep_the_fixed_order(self):
+        self.assertEqual(plan_modes(self.folder, URL, {}, self.mirror), ['partial', 'full'])
+        os.makedirs(self.mirror)
+        self.assertEqual(plan_modes(self.folder, URL, {}, self.mirror), ['mirror', 'partial', 'full'])
+
+    def test_timed_modes_go_first_by_median(self):
+        os.makedirs(self.mirror)
+        timings = {'full': [30.0, 31.0, 90.0], 'mirror': [40.0, 41.0]}
+        self.assertEqual(plan_modes(self.folder, URL, timings, self.mirror), ['full', 'mirror', 'partial'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from http_pool import HTTPError, HTTPPool
+from thumbnails import ThumbnailStore
+
+from tests.http_server import PictureServer, png
+
+
+class ThumbnailStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        red = png(64, 36, (255, 0, 0))
+        self.server = PictureServer({
+            '/a.png': red,
+            '/copy-of-a.png': red,
+            '/b.png': png(64, 36, (0, 255, 0)),
+            '/c.png': png(64, 36, (0, 0, 255)),
+        })
+        self.pool = HTTPPool()
+        self.store = ThumbnailStore(self.dir, pool=self.pool)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.close()
+        shutil.rmtree(self.dir)
+
+    def thumbs(self):
+        return sorted(name for name in os.listdir(self.dir) if name.endswith('.thumb'))
+
+    def path_of(self, url):
+        return os.path.join(self.dir, self.store._index[url] + '.thumb')
+
+    def test_same_picture_is_stored_once(self):
+        a, copy = self.server.url('/a.png'), self.server.url('/copy-of-a.png')
+        data = self.store.get(a)
+        self.assertEqual(self.store.get(copy), data)
+        self.assertEqual(len(self.thumbs()), 1)
+        self.assertEqual(self.store.get(a), data)
+        self.assertEqual(self.server.requests['GET', '/a.png'], 1)
+        # The index survives a restart
+        self.assertEqual(ThumbnailStore(self.dir, pool=self.pool).cached(copy), data)
+
+    def test_least_recently_used_is_evicted_past_max_bytes(self):
+        a, b, c = (self.server.url(p) for p in ('/a.png', '/b.png', '/c.png'))
+        self.store.get(a)
+        self.store.get(b)
+        os.utime(self.path_of(a), (1000, 1000))
+        os.utime(self.path_of(b), (2000, 2000))
+        self.store.cached(a)    # a is now the most recently used
+        self.store.max_bytes = os.path.getsize(self.path_of(a)) * 5 // 2
+        self.store.get(c)
+
+        self.assertIsNotNone(self.store.cached(a))
+        self.assertIsNotNone(self.store.cached(c))
+        self.assertIsNone(self.store.cached(b))
+        self.assertEqual(len(self.thumbs()), 2)
+
+    def test_missing_picture_raises(self):
+        with self.assertRaises(HTTPError):
+            self.store.get(self.server.url('/gone.png'))
+        self.assertEqual(self.thumbs(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app_paths import app_cache_dir
+from http_pool import HTTPPool, HTTPError
+
+try:
+    from PIL import Image
+except ImportError:  # without Pillow only PNG/GIF previews, shrunk by Tk
+    Image = None
+
+# Slide thumbnail previews for the slideshow editor.
+#
+# ThumbnailStore is the headless part: download through a shared connection
+# pool, downscale, and keep the result in a disk cache keyed by a hash of the
+# image content, trimmed oldest-first once it grows past max_bytes.
+# ThumbnailLoader runs the store on a thread pool and hands finished images
+# back to the Tk thread through after(), keeping the last few PhotoImages in
+# an in-memory LRU.
+
+THUMB_SIZE = (240, 135)
+POLL_MS = 50
+
+
+def default_cache_dir():
+    return app_cache_dir('thumbnails')
+
+
+def downscale(data, size=THUMB_SIZE):
+    """Shrink image bytes to fit size and return PNG bytes (raw bytes without Pillow)."""
+    if Image is None:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail(size)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        out = io.BytesIO()
+        img.save(out, format='PNG', optimize=True)
+        return out.getvalue()
+
+
+class ThumbnailStore:
+    def __init__(self, cache_dir=None, size=THUMB_SIZE, max_bytes=50 * 1024 * 1024, pool=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.size = size
+        self.max_bytes = max_bytes
+        self.pool = pool or HTTPPool(max_per_host=4)
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(self.cache_dir, 'index.json')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(self._index_path, 'r') as f:
+                self._index = json.load(f)   # url -> content hash
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest + '.thumb')
+
+    def _save_index(self):
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def cached(self, url):
+        """Thumbnail bytes from disk, or None."""
+        with self._lock:
+            digest = self._index.get(url)
+        if digest is None:
+            return None
+        path = self._path(digest)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return data
+
+    def get(self, url):
+        """Thumbnail bytes for url: disk cache first, then download."""
+        data = self.cached(url)
+        if data is not None:
+            return data
+        status, _headers, body, _final = self.pool.get(url)
+        if status != 200:
+            raise HTTPError(f"{url}: HTTP {status}")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            # Same picture already cached under another URL
+            with open(path, 'rb') as f:
+                data = f.read()
+        else:
+            data = downscale(body, self.size)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._index[url] = digest
+            self._save_index()
+        self.evict()
+        return data
+
+    def evict(self):
+        """Delete least recently used thumbnails until under max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.thumb'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        removed = set()
+        for _mtime, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total -= size
+            removed.add(name[:-len('.thumb')])
+        with self._lock:
+            self._index = {u: d for u, d in self._index.items() if d not in removed}
+            self._save_index()
+
+
+class ThumbnailLoader:
+    """Loads thumbnails off the Tk thread; callbacks get a PhotoImage or None."""
+
+    def __init__(self, root, store=None, workers=4, memory_items=128):
+        self.root = root
+        self.store = store or ThumbnailStore()
+        self.memory_items = memory_items
+        self._images = OrderedDict()    # url -> PhotoImage, most recent last
+        self._waiting = {}              # url -> [callback, ...]
+        self._done = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self._polling = False
+
+    def request(self, url, callback):
+        image = self._images.get(url)
+        if image is not None:
+            self._images.move_to_end(url)
+            callback(image)
+            return
+        if url in self._waiting:
+            self._waiting[url].append(callback)
+            return
+        self._waiting[url] = [callback]
+        self._executor.submit(self._fetch, url)
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _fetch(self, url):
+        try:
+            data = self.store.get(url)
+        except Exception:
+            data = None
+        self._done.put((url, data))
+
+    def _poll(self):
+        while True:
+            try:
+                url, data = self._done.get_nowait()
+            except queue.Empty:
+                break
+            image = self._to_image(data) if data is not None else None
+            if image is not None:
+                self._images[url] = image
+                while len(self._images) > self.memory_items:
+                    self._images.popitem(last=False)
+            for callback in self._waiting.pop(url, []):
+                callback(image)
+        if self._waiting:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _to_image(self, data):
+        import tkinter as tk
+        try:
+            image = tk.PhotoImage(master=self.root, data=base64.b64encode(data))
+        except tk.TclError:
+            return None  # format Tk can't read (e.g. JPEG without Pillow)
+        if Image is None:
+            # Not downscaled on the worker: shrink by a whole factor here
+            factor = max(1, -(-image.width() // self.store.size[0]), -(-image.height() // self.store.size[1]))
+            if factor > 1:
+                image = image.subsample(factor)
+        return image
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,209 @@
+import atexit
+import cProfile
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from app_paths import app_cache_dir
+
+# Timing spans for the editors' slow paths.
+#
+# Every span (operation, start time, duration, plus whatever counts the caller
+# adds: rows, bytes, ...) is appended as one JSON line to a trace file that
+# rotates at TRACE_MAX_BYTES, so "Submit took forever" can be looked up later.
+# LEADERBOARD_TRACE=0 turns it off. LEADERBOARD_PROFILE=1 (or --profile on the
+# launcher) also runs cProfile for the whole session and dumps a .prof file
+# on exit. summarize() and the Timings window show p50/p95 per operation.
+
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUPS = 3
+
+
+def default_trace_file():
+    return app_cache_dir('trace.jsonl')
+
+
+def default_profile_dir():
+    return app_cache_dir('profiles')
+
+
+class Tracer:
+    def __init__(self, path=None, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS, enabled=True):
+        self.path = path or default_trace_file()
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def record(self, operation, seconds, **fields):
+        """Append one span. Tracing must never break the caller, so I/O errors are dropped."""
+        if not self.enabled:
+            return
+        entry = {'op': operation, 'at': round(time.time(), 3), 'seconds': round(seconds, 6),
+                 'pid': os.getpid(), 'thread': threading.current_thread().name}
+        entry.update(fields)
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                try:
+                    if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                        self._rotate()
+                except FileNotFoundError:
+                    pass
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    @contextmanager
+    def span(self, operation, **fields):
+        """
+        Time the with-block. Yields the fields dict so the block can add
+        counts it only knows at the end; an exception is recorded as 'error'.
+        """
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as e:
+            fields['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(operation, time.perf_counter() - start, **fields)
+
+    def read(self):
+        """All spans still on disk, oldest first."""
+        spans = []
+        paths = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)] + [self.path]
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            spans.append(json.loads(line))
+                        except ValueError:
+                            continue  # torn line from a crash
+            except OSError:
+                continue
+        return spans
+
+
+tracer = Tracer(enabled=os.environ.get('LEADERBOARD_TRACE', '1') != '0')
+
+
+def span(operation, **fields):
+    """Time a block in the process-wide trace file; see Tracer.span."""
+    return tracer.span(operation, **fields)
+
+
+def record(operation, seconds, **fields):
+    tracer.record(operation, seconds, **fields)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(spans):
+    """Return [(operation, count, p50, p95, max, errors)] sorted by total time spent."""
+    by_op = {}
+    errors = {}
+    for s in spans:
+        by_op.setdefault(s['op'], []).append(s['seconds'])
+        if 'error' in s:
+            errors[s['op']] = errors.get(s['op'], 0) + 1
+    rows = []
+    for op, values in by_op.items():
+        values.sort()
+        rows.append((op, len(values), percentile(values, 50), percentile(values, 95), values[-1],
+                     errors.get(op, 0), sum(values)))
+    rows.sort(key=lambda r: r[-1], reverse=True)
+    return [r[:-1] for r in rows]
+
+
+def format_summary(rows):
+    lines = [f"{'operation':<32} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'errors':>6}"]
+    for op, count, p50, p95, worst, errs in rows:
+        lines.append(f"{op:<32} {count:>6} {p50 * 1000:>10.1f} {p95 * 1000:>10.1f} {worst * 1000:>10.1f} {errs:>6}")
+    return "\n".join(lines)
+
+
+_profiler = None
+
+
+def start_profiling(profile_dir=None):
+    """Profile the rest of this session; the .prof file is written at exit. Returns its path."""
+    global _profiler
+    if _profiler is not None:
+        return None
+    profile_dir = profile_dir or default_profile_dir()
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f"session-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.prof")
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+    def dump():
+        _profiler.disable()
+        try:
+            _profiler.dump_stats(path)
+        except OSError:
+            pass
+
+    atexit.register(dump)
+    return path
+
+
+def profiling_requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return '--profile' in argv or os.environ.get('LEADERBOARD_PROFILE') == '1'
+
+
+def open_window(master):
+    """p50/p95 per operation from the trace file, in master (a Tk or Toplevel)."""
+    import tkinter as tk
+    from tkinter import ttk
+
+    master.title("Timings")
+    master.geometry("640x320")
+    columns = ('count', 'p50', 'p95', 'max', 'errors')
+    tree = ttk.Treeview(master, columns=columns)
+    tree.heading('#0', text="Operation")
+    tree.column('#0', width=220)
+    for col, title in zip(columns, ("Count", "p50 (ms)", "p95 (ms)", "Max (ms)", "Errors")):
+        tree.heading(col, text=title)
+        tree.column(col, width=80, anchor=tk.E)
+    tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    label = tk.Label(master, text="", fg="gray")
+    label.pack()
+
+    def refresh():
+        tree.delete(*tree.get_children())
+        spans = tracer.read()
+        for op, count, p50, p95, worst, errs in summarize(spans):
+            tree.insert('', tk.END, text=op, values=(count, f"{p50 * 1000:.1f}", f"{p95 * 1000:.1f}",
+                                                     f"{worst * 1000:.1f}", errs))
+        label.config(text=f"{len(spans)} spans from {tracer.path}")
+
+    tk.Button(master, text="Refresh", command=refresh).pack(pady=5)
+    refresh()
+    return tree
+
+
+if __name__ == "__main__":
+    print(format_summary(summarize(tracer.read())))
@@ -0,0 +1,146 @@
+import tkinter as tk
+from tkinter import font as tkfont
+
+# A Listbox stand-in that only holds the rows currently on screen. The rows
+# come from a row_count() / row_text(i) pair instead of being inserted, so a
+# board with a million contestants costs the same to show as one with ten.
+#
+# It mimics the bits of tk.Listbox the editor uses: curselection(),
+# selection_clear() and a <<ListboxSelect>> event carrying the absolute row
+# index, so existing on_select handlers keep working unchanged.
+
+
+class VirtualListbox(tk.Frame):
+    def __init__(self, master, row_count, row_text, **listbox_options):
+        super().__init__(master)
+        self.row_count = row_count
+        self.row_text = row_text
+        self.top = 0            # absolute index of the first visible row
+        self.selected = None    # absolute index of the selected row
+        self._visible = 1
+        self._redraw_pending = False
+
+        listbox_options.setdefault('exportselection', False)
+        self.inner = tk.Listbox(self, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.inner.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._line_height = tkfont.Font(font=self.inner.cget('font')).metrics('linespace') + 1
+
+        self.inner.bind('<<ListboxSelect>>', self._on_inner_select)
+        self.inner.bind('<Configure>', self._on_resize)
+        self.inner.bind('<MouseWheel>', self._on_wheel)
+        self.inner.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.inner.bind('<Button-5>', lambda e: self.scroll(3))
+        self.inner.bind('<Up>', lambda e: self._move_selection(-1))
+        self.inner.bind('<Down>', lambda e: self._move_selection(1))
+        self.inner.bind('<Prior>', lambda e: self._move_selection(-self._visible))
+        self.inner.bind('<Next>', lambda e: self._move_selection(self._visible))
+
+    # --- Listbox-compatible API ---
+
+    def curselection(self):
+        if self.selected is None:
+            return ()
+        return (self.selected,)
+
+    def selection_clear(self, first=0, last=None):
+        self.selected = None
+        self.inner.selection_clear(0, tk.END)
+
+    def selection_set(self, index):
+        self.selected = index
+        self.see(index)
+
+    def see(self, index):
+        """Scroll so that the absolute row index is visible."""
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self._visible:
+            self.top = index - self._visible + 1
+        self._clamp()
+        self.refresh()
+
+    # --- Redrawing ---
+
+    def refresh(self):
+        """Schedule a redraw of the visible rows (coalesced per idle cycle)."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def refresh_rows(self, start, stop):
+        """Rows start..stop-1 changed; redraw only if any of them are on screen."""
+        if self.selected is not None and self.selected >= self.row_count():
+            self.selected = None
+        if start < self.top + self._visible and stop > self.top:
+            self.refresh()
+        else:
+            # Row count may still have changed, keep the scrollbar honest
+            self._update_scrollbar()
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self._clamp()
+        stop = min(self.top + self._visible, self.row_count())
+        self.inner.delete(0, tk.END)
+        if stop > self.top:
+            self.inner.insert(tk.END, *(self.row_text(i) for i in range(self.top, stop)))
+        if self.selected is not None and self.top <= self.selected < stop:
+            self.inner.selection_set(self.selected - self.top)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        count = self.row_count()
+        if count <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.top / count, min(1.0, (self.top + self._visible) / count))
+
+    def _clamp(self):
+        self.top = max(0, min(self.top, self.row_count() - self._visible))
+
+    # --- Scrolling ---
+
+    def scroll(self, rows):
+        self.top += rows
+        self._clamp()
+        self.refresh()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.top = int(float(amount) * self.row_count())
+        elif unit == tk.PAGES:
+            self.top += int(amount) * self._visible
+        else:
+            self.top += int(amount)
+        self._clamp()
+        self.refresh()
+
+    def _on_wheel(self, event):
+        # Windows/macOS report multiples of 120 per notch
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        self._visible = max(1, event.height // self._line_height)
+        self.refresh()
+
+    # --- Selection ---
+
+    def _on_inner_select(self, event):
+        sel = self.inner.curselection()
+        if not sel:
+            return
+        self.selected = self.top + sel[0]
+        self.event_generate('<<ListboxSelect>>')
+
+    def _move_selection(self, step):
+        count = self.row_count()
+        if not count:
+            return "break"
+        current = self.selected if self.selected is not None else self.top - (1 if step > 0 else 0)
+        self.selected = max(0, min(count - 1, current + step))
+        self.see(self.selected)
+        self.event_generate('<<ListboxSelect>>')
+        return "break"